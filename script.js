@@ -38,7 +38,7 @@ function sanitizeUrl(url) {
     return trimmed;
   }
   // Allow simple filenames and paths (no protocol)
-  if (/^[a-zA-Z0-9_\-./]+$/.test(trimmed) && !trimmed.includes(':')) {
+  if (/^[a-zA-Z0-9_\-./%]+$/.test(trimmed) && !trimmed.includes(':')) {
     return trimmed;
   }
   return '#';
@@ -65,6 +65,23 @@ function escapeAttr(value) {
 
 // Global state
 let recipes = [];
+let recipeDetails = new Map(); // Full recipes by id (all of them when loaded from data/recipes.json)
+let detailShards = [];         // Detail shard files from the build summary
+const shardRequests = new Map(); // Shard URL -> pending fetch, so each shard loads once
+const BUILD_DIR = 'data/build/'; // Output of scripts/build_site_data.py
+let buildManifest = null;      // Pending/loaded manifest fetch
+let searchIndex = null;        // Inverted index from the build (null: scan recipes instead)
+const relatedTipsByRecipe = new Map(); // Recipe id -> related tips, from the detail shards
+let spellDictionary = null;    // Symmetric-delete spelling dictionary for tip search
+let facets = null;             // Prebuilt filter counts and variant groups
+let staticPages = new Set();   // Recipe ids with a pre-rendered page under recipes/
+let sprites = null;            // Grid thumbnail sprite sheets (scripts/build_sprites.py)
+let imageManifest = null;      // Pending/loaded data/images/manifest.json fetch (scripts/build_images.py)
+const SCAN_THUMB_WIDTH = 200;  // Box the original scan thumbnails are fitted into
+const SCAN_THUMB_HEIGHT = 150;
+const BLURHASH_CHARS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~';
+const PLACEHOLDER_PIXELS = 32;  // Size a BlurHash is decoded at (stretched over the image box)
+const placeholderUrls = new Map(); // BlurHash -> decoded data: URL
 let tips = [];
 let categories = new Set();
 let allTags = new Set();
@@ -76,10 +93,70 @@ let showMetric = false; // Toggle for metric conversions
 document.addEventListener('DOMContentLoaded', init);
 
 async function init() {
+  registerServiceWorker();
+
+  // Pre-rendered recipe pages (scripts/render_pages.py) only need their buttons wired up
+  const staticRecipe = document.querySelector('#recipe-content[data-recipe-id]');
+  if (staticRecipe) {
+    hydrateStaticRecipe(staticRecipe.dataset.recipeId);
+    return;
+  }
+
   // Load content directly - auth gate is handled by inline script in HTML
   await loadContent();
 }
 
+/**
+ * Register sw.js for offline use. Once it is active, ask it to download
+ * the recipe data and grid thumbnails listed in precache.json (built by
+ * scripts/build_assets.py), unless the reader has data saving on.
+ */
+function registerServiceWorker() {
+  if (!('serviceWorker' in navigator) || location.protocol === 'file:') return;
+  navigator.serviceWorker.register('sw.js')
+    .then(() => navigator.serviceWorker.ready)
+    .then(registration => {
+      if (!navigator.connection?.saveData) {
+        registration.active?.postMessage({ type: 'precache' });
+      }
+    })
+    .catch(error => console.warn('Offline support unavailable:', error));
+}
+
+/**
+ * Attach handlers to a pre-rendered recipe page. Data is only fetched if
+ * the reader switches to metric, which re-renders the page client-side.
+ */
+function hydrateStaticRecipe(recipeId) {
+  paintPlaceholders(document);
+
+  const printBtn = document.getElementById('print-btn');
+  if (printBtn) {
+    printBtn.addEventListener('click', () => window.print());
+  }
+
+  const metricToggle = document.getElementById('metric-toggle');
+  if (metricToggle) {
+    metricToggle.addEventListener('click', async () => {
+      metricToggle.disabled = true;
+      await Promise.all([loadRecipes(), loadTips()]);
+      showMetric = true;
+      renderRecipeDetail(recipeId);
+    });
+  }
+
+  const variantSelect = document.getElementById('variant-select');
+  if (variantSelect) {
+    variantSelect.addEventListener('change', async (e) => {
+      const variantId = e.target.value;
+      if (!variantId) return;
+      // Not every variant has a pre-rendered page; recipeUrl falls back to recipe.html
+      if (staticPages.size === 0) staticPages = await loadStaticPages();
+      window.location.href = recipeUrl(variantId);
+    });
+  }
+}
+
 /**
  * Load all content
  */
@@ -90,19 +167,34 @@ async function loadContent() {
 }
 
 /**
- * Load recipes from JSON file
+ * Load recipes: the prebuilt summary index if there is one, otherwise the full JSON file
  */
 async function loadRecipes() {
   try {
-    const response = await fetch('data/recipes.json');
-    const data = await response.json();
-    recipes = data.recipes || [];
+    const spritesRequest = document.getElementById('recipe-grid') ? loadSprites() : null;
+    const summary = await loadRecipeSummary();
+    if (summary) {
+      recipes = summary.recipes || [];
+      detailShards = summary.shards || [];
+      [searchIndex, facets, staticPages] = await Promise.all([loadSearchIndex(), loadFacets(), loadStaticPages()]);
+    } else {
+      const response = await fetch('data/recipes.json');
+      const data = await response.json();
+      recipes = data.recipes || [];
+      recipes.forEach(recipe => recipeDetails.set(recipe.id, recipe));
+    }
+    if (spritesRequest) sprites = await spritesRequest;
 
     // Extract categories and tags
-    recipes.forEach(recipe => {
-      if (recipe.category) categories.add(recipe.category);
-      if (recipe.tags) recipe.tags.forEach(tag => allTags.add(tag));
-    });
+    if (facets) {
+      categories = new Set(Object.keys(facets.categories));
+      allTags = new Set(Object.keys(facets.tags));
+    } else {
+      recipes.forEach(recipe => {
+        if (recipe.category) categories.add(recipe.category);
+        if (recipe.tags) recipe.tags.forEach(tag => allTags.add(tag));
+      });
+    }
 
     console.log(`Loaded ${recipes.length} recipes`);
   } catch (error) {
@@ -111,11 +203,160 @@ async function loadRecipes() {
   }
 }
 
+/**
+ * Load data/build/manifest.json once (null if the site data has not been built)
+ */
+function loadBuildManifest() {
+  if (!buildManifest) {
+    buildManifest = fetch(`${BUILD_DIR}manifest.json`, { cache: 'no-cache' })
+      .then(response => (response.ok ? response.json() : null))
+      .catch(() => null);
+  }
+  return buildManifest;
+}
+
+/**
+ * Load the image manifest once: scan dimensions and resized copies (null if not built)
+ */
+function loadImageManifest() {
+  if (!imageManifest) {
+    imageManifest = fetch('data/images/manifest.json', { cache: 'no-cache' })
+      .then(response => (response.ok ? response.json() : null))
+      .catch(() => null);
+  }
+  return imageManifest;
+}
+
+/**
+ * Load the recipe grid's sprite sheet index (null if the sheets have not been built)
+ */
+async function loadSprites() {
+  try {
+    const response = await fetch('data/images/sprites/index.json', { cache: 'no-cache' });
+    return response.ok ? await response.json() : null;
+  } catch (error) {
+    return null;
+  }
+}
+
+/**
+ * Load a build file by its logical manifest name (null if missing)
+ */
+async function loadBuildFile(name) {
+  try {
+    const manifest = await loadBuildManifest();
+    const file = manifest?.files?.[name];
+    if (!file) return null;
+
+    const response = await fetch(BUILD_DIR + file);
+    if (!response.ok) return null;
+    return await response.json();
+  } catch (error) {
+    return null;
+  }
+}
+
+/**
+ * Load the compact summary index from the build (null if not built)
+ */
+function loadRecipeSummary() {
+  return loadBuildFile('summary');
+}
+
+/**
+ * Load the prebuilt search index; ignored if it does not match the loaded summary
+ */
+async function loadSearchIndex() {
+  const index = await loadBuildFile('search');
+  if (!index || index.count !== recipes.length) return null;
+
+  // Rank of each recipe in title order, for sorting search hits
+  index.titleRank = new Array(index.count);
+  index.title_order.forEach((ordinal, rank) => { index.titleRank[ordinal] = rank; });
+  return index;
+}
+
+/**
+ * Load prebuilt facet counts and variant groups; ignored if they do not match the loaded summary
+ */
+async function loadFacets() {
+  const data = await loadBuildFile('facets');
+  return data && data.count === recipes.length ? data : null;
+}
+
+/**
+ * Ids of recipes with a pre-rendered page (empty if the pages have not been rendered)
+ */
+async function loadStaticPages() {
+  try {
+    const response = await fetch('recipes/pages.json', { cache: 'no-cache' });
+    if (!response.ok) return new Set();
+    const data = await response.json();
+    return new Set(data.pages || []);
+  } catch (error) {
+    return new Set();
+  }
+}
+
+/**
+ * File name of a recipe's pre-rendered page; must match page_name() in scripts/recipe_html.py
+ */
+function pageName(recipeId) {
+  return String(recipeId).replace(/[^A-Za-z0-9_-]/g, '-') || 'recipe';
+}
+
+/**
+ * Link to a recipe: its pre-rendered page if there is one, otherwise recipe.html
+ */
+function recipeUrl(recipeId) {
+  return staticPages.has(recipeId) ? `recipes/${pageName(recipeId)}.html` : `recipe.html#${recipeId}`;
+}
+
+/**
+ * Get a full recipe, fetching the detail shard that holds it on first use
+ */
+async function loadRecipeDetail(recipeId) {
+  if (recipeDetails.has(recipeId)) return recipeDetails.get(recipeId);
+
+  const summary = recipes.find(r => r.id === recipeId);
+  if (!summary || summary.shard === undefined || !detailShards[summary.shard]) return null;
+
+  const url = BUILD_DIR + detailShards[summary.shard];
+  if (!shardRequests.has(url)) {
+    const request = fetch(url)
+      .then(response => {
+        if (!response.ok) throw new Error(`HTTP ${response.status} for ${url}`);
+        return response.json();
+      })
+      .then(shard => {
+        (shard.recipes || []).forEach(recipe => recipeDetails.set(recipe.id, recipe));
+        if (shard.related_tips) {
+          const shardTips = shard.tips || {};
+          Object.entries(shard.related_tips).forEach(([id, tipIds]) => {
+            relatedTipsByRecipe.set(id, tipIds.map(tipId => shardTips[tipId]).filter(Boolean));
+          });
+        }
+      })
+      .catch(error => {
+        shardRequests.delete(url); // Allow a retry
+        throw error;
+      });
+    shardRequests.set(url, request);
+  }
+
+  await shardRequests.get(url);
+  return recipeDetails.get(recipeId) || null;
+}
+
 /**
  * Load tips from JSON file
  */
 async function loadTips() {
   try {
+    // Recipe pages get their tips with the detail shard when the build linked them
+    const manifest = await loadBuildManifest();
+    if (manifest?.tips_linked && document.getElementById('recipe-content')) return;
+
     const response = await fetch('data/tips_master.json');
     const data = await response.json();
     tips = data.tips || [];
@@ -126,6 +367,11 @@ async function loadTips() {
     });
 
     console.log(`Loaded ${tips.length} tips`);
+
+    // The spelling dictionary is only needed where tips can be searched
+    if (document.getElementById('tips-search-input')) {
+      spellDictionary = await loadBuildFile('spelling');
+    }
   } catch (error) {
     console.error('Failed to load tips:', error);
     // Tips are optional - don't show error to user
@@ -136,84 +382,142 @@ async function loadTips() {
 // Fuzzy Search Implementation
 // =============================================================================
 
+const TYPO_TOLERANCE = 0.3; // Allowed typos as a fraction of word length
+const tipSearchCache = new WeakMap(); // Tip -> { text, words }, built on first search
+
 /**
- * Calculate Levenshtein distance between two strings
- * Used for fuzzy matching
+ * Levenshtein distance between two strings, or limit + 1 once it must exceed limit.
+ * Uses two rows instead of a full matrix.
  */
-function levenshteinDistance(str1, str2) {
-  const m = str1.length;
-  const n = str2.length;
-  const dp = Array(m + 1).fill(null).map(() => Array(n + 1).fill(0));
+function editDistance(str1, str2, limit) {
+  if (Math.abs(str1.length - str2.length) > limit) return limit + 1;
+
+  let previous = Array.from({ length: str2.length + 1 }, (_, j) => j);
+  let current = new Array(str2.length + 1);
+  for (let i = 1; i <= str1.length; i++) {
+    current[0] = i;
+    let rowMin = i;
+    for (let j = 1; j <= str2.length; j++) {
+      const cost = str1[i - 1] === str2[j - 1] ? 0 : 1;
+      current[j] = Math.min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost);
+      rowMin = Math.min(rowMin, current[j]);
+    }
+    if (rowMin > limit) return limit + 1;
+    [previous, current] = [current, previous];
+  }
+  return previous[str2.length];
+}
 
-  for (let i = 0; i <= m; i++) dp[i][0] = i;
-  for (let j = 0; j <= n; j++) dp[0][j] = j;
+/**
+ * Typos allowed between two words
+ */
+function allowedDistance(word1, word2) {
+  const maxDistance = spellDictionary ? spellDictionary.max_distance : Infinity;
+  return Math.min(maxDistance, Math.floor(Math.max(word1.length, word2.length) * TYPO_TOLERANCE));
+}
 
-  for (let i = 1; i <= m; i++) {
-    for (let j = 1; j <= n; j++) {
-      if (str1[i - 1] === str2[j - 1]) {
-        dp[i][j] = dp[i - 1][j - 1];
-      } else {
-        dp[i][j] = 1 + Math.min(dp[i - 1][j], dp[i][j - 1], dp[i - 1][j - 1]);
+/**
+ * A word's prefix plus every string made by deleting up to max_distance characters from it.
+ * Must match deletes() in scripts/spell_dictionary.py.
+ */
+function deleteKeys(word) {
+  const key = word.slice(0, spellDictionary.prefix_length);
+  const found = new Set([key]);
+  let frontier = [key];
+  for (let d = 0; d < spellDictionary.max_distance; d++) {
+    const next = [];
+    frontier.forEach(w => {
+      if (w.length <= 1) return;
+      for (let i = 0; i < w.length; i++) {
+        const shorter = w.slice(0, i) + w.slice(i + 1);
+        if (!found.has(shorter)) {
+          found.add(shorter);
+          next.push(shorter);
+        }
       }
-    }
+    });
+    frontier = next;
   }
-  return dp[m][n];
+  return found;
 }
 
 /**
- * Calculate fuzzy match score (0 to 1, higher is better)
+ * Dictionary words within typo distance of a word, best (closest, most common) first.
+ * Returns null when there is no spelling dictionary.
  */
-function fuzzyScore(query, text) {
-  query = query.toLowerCase();
-  text = text.toLowerCase();
-
-  // Exact match
-  if (text.includes(query)) return 1;
-
-  // Word-level matching
-  const queryWords = query.split(/\s+/);
-  const textWords = text.split(/\s+/);
-
-  let matchedWords = 0;
-  for (const qWord of queryWords) {
-    for (const tWord of textWords) {
-      // Check for prefix match or close match
-      if (tWord.startsWith(qWord) || qWord.startsWith(tWord)) {
-        matchedWords++;
-        break;
-      }
-      // Fuzzy match with tolerance
-      const maxDist = Math.floor(Math.max(qWord.length, tWord.length) * 0.3);
-      if (levenshteinDistance(qWord, tWord) <= maxDist) {
-        matchedWords++;
-        break;
-      }
-    }
+function spellingSuggestions(word) {
+  if (!spellDictionary) return null;
+  if (word.length < spellDictionary.min_length) return [];
+
+  const { terms, counts, deletes } = spellDictionary;
+  const candidates = new Set();
+  deleteKeys(word).forEach(key => (deletes[key] || []).forEach(n => candidates.add(n)));
+
+  const results = [];
+  candidates.forEach(n => {
+    const limit = allowedDistance(word, terms[n]);
+    const distance = editDistance(word, terms[n], limit);
+    if (distance <= limit) results.push({ term: terms[n], distance, count: counts[n] });
+  });
+  results.sort((a, b) => a.distance - b.distance || b.count - a.count);
+  return results.map(r => r.term);
+}
+
+/**
+ * Searchable text and word set of a tip, computed once per tip
+ */
+function tipSearchText(tip) {
+  if (!tipSearchCache.has(tip)) {
+    const text = [
+      tip.title,
+      tip.content,
+      ...(tip.search_terms || []),
+      ...(tip.related_tags || [])
+    ].join(' ').toLowerCase();
+    tipSearchCache.set(tip, { text, words: [...new Set(searchTokens(text))] });
   }
+  return tipSearchCache.get(tip);
+}
 
-  return matchedWords / queryWords.length;
+/**
+ * Whether a query word matches one of a tip's words: by prefix, or within typo distance
+ */
+function wordMatches(queryWord, suggestions, words) {
+  return words.some(word => {
+    if (word.startsWith(queryWord) || queryWord.startsWith(word)) return true;
+    if (suggestions) return suggestions.has(word);
+    const limit = allowedDistance(queryWord, word);
+    return limit > 0 && editDistance(queryWord, word, limit) <= limit;
+  });
 }
 
 /**
  * Search tips with fuzzy matching
  * @param {string} query - Search query
- * @param {number} minScore - Minimum fuzzy score (0-1)
- * @returns {Array} - Matched tips with scores
+ * @param {number} minScore - Minimum fraction of query words matched (0-1)
+ * @returns {Array} - Matched tips, best first
  */
 function searchTips(query, minScore = 0.5) {
   if (!query || query.length < 2) return [];
 
+  query = query.toLowerCase();
+  const queryWords = searchTokens(query);
+  if (queryWords.length === 0) return [];
+
+  // Spelling suggestions once per query word, not once per tip word
+  const suggestions = queryWords.map(word => {
+    const terms = spellingSuggestions(word);
+    return terms ? new Set(terms) : null;
+  });
+
   const results = [];
   for (const tip of tips) {
-    // Build searchable text from tip
-    const searchText = [
-      tip.title,
-      tip.content,
-      ...(tip.search_terms || []),
-      ...(tip.related_tags || [])
-    ].join(' ');
-
-    const score = fuzzyScore(query, searchText);
+    const { text, words } = tipSearchText(tip);
+    let score = 1;
+    if (!text.includes(query)) {
+      const matched = queryWords.filter((word, i) => wordMatches(word, suggestions[i], words)).length;
+      score = matched / queryWords.length;
+    }
     if (score >= minScore) {
       results.push({ tip, score });
     }
@@ -230,6 +534,7 @@ function searchTips(query, minScore = 0.5) {
  * @returns {Array} - Related tips
  */
 function findTipsForRecipe(recipe) {
+  if (recipe && relatedTipsByRecipe.has(recipe.id)) return relatedTipsByRecipe.get(recipe.id);
   if (!recipe || !recipe.ingredients || tips.length === 0) return [];
 
   // Extract ingredient names from recipe
@@ -298,12 +603,18 @@ function updateCollectionCounts() {
     'granny': 0
   };
 
-  recipes.forEach(recipe => {
-    const collection = recipe.collection || '';
-    if (counts.hasOwnProperty(collection)) {
-      counts[collection]++;
-    }
-  });
+  if (facets) {
+    Object.keys(counts).forEach(collection => {
+      if (collection) counts[collection] = facets.collections[collection] || 0;
+    });
+  } else {
+    recipes.forEach(recipe => {
+      const collection = recipe.collection || '';
+      if (counts.hasOwnProperty(collection)) {
+        counts[collection]++;
+      }
+    });
+  }
 
   // Update button labels
   const labels = {
@@ -407,7 +718,8 @@ function renderCategoryFilter() {
   let html = '<option value="">All Categories</option>';
 
   sortedCategories.forEach(cat => {
-    html += `<option value="${escapeAttr(cat)}">${escapeHtml(capitalizeFirst(cat))}</option>`;
+    const count = facets ? ` (${facets.categories[cat]})` : '';
+    html += `<option value="${escapeAttr(cat)}">${escapeHtml(capitalizeFirst(cat))}${count}</option>`;
   });
 
   select.innerHTML = html;
@@ -424,7 +736,8 @@ function renderTagFilters() {
   let html = '';
 
   sortedTags.forEach(tag => {
-    html += `<span class="filter-tag" data-tag="${escapeAttr(tag)}">${escapeHtml(tag)}</span>`;
+    const count = facets ? ` title="${facets.tags[tag]} recipes"` : '';
+    html += `<span class="filter-tag" data-tag="${escapeAttr(tag)}"${count}>${escapeHtml(tag)}</span>`;
   });
 
   container.innerHTML = html;
@@ -446,6 +759,52 @@ function renderTagFilters() {
   });
 }
 
+/**
+ * Split text into search tokens: lowercase ASCII words with accents folded.
+ * Must match search_tokens() in scripts/build_site_data.py.
+ */
+function searchTokens(text) {
+  return String(text || '')
+    .normalize('NFKD')
+    .replace(/\p{M}/gu, '')
+    .toLowerCase()
+    .match(/[a-z0-9]+/g) || [];
+}
+
+/**
+ * Ordinals of recipes with a term containing the text, so 'cake' finds
+ * 'cupcakes' as the unindexed search does
+ */
+function searchSubstring(text) {
+  const { terms, postings } = searchIndex;
+  const matches = new Set();
+  for (let i = 0; i < terms.length; i++) {
+    if (!terms[i].includes(text)) continue;
+    let ordinal = 0;
+    postings[i].forEach(delta => {
+      ordinal += delta;
+      matches.add(ordinal);
+    });
+  }
+  return matches;
+}
+
+/**
+ * Ordinals of recipes matching every query token (anywhere in a word), or null for no query
+ */
+function searchRecipeOrdinals(query) {
+  const tokens = [...new Set(searchTokens(query))];
+  if (tokens.length === 0) return null;
+
+  let result = null;
+  for (const token of tokens) {
+    const matches = searchSubstring(token);
+    result = result === null ? matches : new Set([...result].filter(ordinal => matches.has(ordinal)));
+    if (result.size === 0) break;
+  }
+  return result;
+}
+
 /**
  * Render recipe grid with current filters
  */
@@ -453,25 +812,12 @@ function renderRecipeGrid() {
   const container = document.getElementById('recipe-grid');
   if (!container) return;
 
-  // Filter recipes
-  let filtered = recipes.filter(recipe => {
+  const matchesFilters = recipe => {
     // Exclude variants from main grid (show canonical only)
     if (recipe.variant_of && recipe.variant_of !== recipe.id) {
       return false;
     }
 
-    // Search filter
-    if (currentFilter.search) {
-      const searchText = [
-        recipe.title,
-        recipe.description,
-        recipe.attribution,
-        ...recipe.tags || []
-      ].join(' ').toLowerCase();
-
-      if (!searchText.includes(currentFilter.search)) return false;
-    }
-
     // Category filter
     if (currentFilter.category && recipe.category !== currentFilter.category) {
       return false;
@@ -483,10 +829,38 @@ function renderRecipeGrid() {
     }
 
     return true;
-  });
+  };
+
+  let filtered;
+  if (searchIndex) {
+    // Intersect postings; the index already has every recipe in title order
+    const hits = searchRecipeOrdinals(currentFilter.search);
+    const ordinals = hits === null
+      ? searchIndex.title_order
+      : [...hits].sort((a, b) => searchIndex.titleRank[a] - searchIndex.titleRank[b]);
+    filtered = ordinals.map(ordinal => recipes[ordinal]).filter(matchesFilters);
+  } else {
+    filtered = recipes.filter(recipe => {
+      if (!matchesFilters(recipe)) return false;
+
+      // Search filter
+      if (currentFilter.search) {
+        const searchText = [
+          recipe.title,
+          recipe.description,
+          recipe.attribution,
+          ...recipe.tags || []
+        ].join(' ').toLowerCase();
+
+        if (!searchText.includes(currentFilter.search)) return false;
+      }
+
+      return true;
+    });
 
-  // Sort by title
-  filtered.sort((a, b) => a.title.localeCompare(b.title));
+    // Sort by title
+    filtered.sort((a, b) => a.title.localeCompare(b.title));
+  }
 
   // Render
   if (filtered.length === 0) {
@@ -512,16 +886,16 @@ function renderRecipeGrid() {
  */
 function renderRecipeCard(recipe) {
   const categoryIcon = getCategoryIcon(recipe.category);
-  const timeInfo = recipe.total_time || recipe.cook_time || '';
+  const timeInfo = recipe.time || recipe.total_time || recipe.cook_time || '';
 
   return `
     <article class="recipe-card category-${escapeAttr(recipe.category)}">
       <div class="recipe-card-image">
-        ${categoryIcon}
+        ${renderCardThumbnail(recipe) || categoryIcon}
       </div>
       <div class="recipe-card-content">
         <span class="category">${escapeHtml(recipe.category) || 'Uncategorized'}</span>
-        <h3><a href="recipe.html#${escapeAttr(recipe.id)}">${escapeHtml(recipe.title)}</a></h3>
+        <h3><a href="${escapeAttr(recipeUrl(recipe.id))}">${escapeHtml(recipe.title)}</a></h3>
         <p class="description">${escapeHtml(recipe.description)}</p>
         <div class="meta">
           ${recipe.servings_yield ? `<span>${escapeHtml(recipe.servings_yield)}</span>` : ''}
@@ -532,12 +906,33 @@ function renderRecipeCard(recipe) {
   `;
 }
 
+/**
+ * A card's scan thumbnail, cut from its category's sprite sheet ('' if it has none).
+ * Styled inline: the pages load the hub stylesheet, not styles.css.
+ */
+function renderCardThumbnail(recipe) {
+  const place = sprites?.recipes?.[recipe.id];
+  if (!place) return '';
+  const [sheet, x, y, width, height] = place;
+  const url = sanitizeUrl(encodePath(sprites.sheets[sheet]));
+  const [sheetWidth, sheetHeight] = sprites.sizes[sheet];
+  return `<span class="recipe-card-thumb" role="img" aria-label="Original scan"
+    style="display: block; width: ${width}px; height: ${height}px; border-radius: 4px; box-shadow: 0 2px 8px rgba(0,0,0,0.25);
+    background: url('${escapeAttr(url)}') -${x}px -${y}px / ${sheetWidth}px ${sheetHeight}px no-repeat;"></span>`;
+}
+
 /**
  * Render full recipe detail page
  */
-function renderRecipeDetail(recipeId) {
-  const recipe = recipes.find(r => r.id === recipeId);
+async function renderRecipeDetail(recipeId) {
   const container = document.getElementById('recipe-content');
+  const imagesRequest = loadImageManifest(); // Fetched alongside the recipe
+  let recipe = null;
+  try {
+    recipe = await loadRecipeDetail(recipeId);
+  } catch (error) {
+    console.error('Failed to load recipe details:', error);
+  }
 
   if (!recipe || !container) {
     if (container) {
@@ -554,6 +949,7 @@ function renderRecipeDetail(recipeId) {
 
   // Find variants of this recipe
   const variants = findVariants(recipe);
+  const images = await imagesRequest;
 
   // Update page title
   document.title = `${recipe.title} - Other Family Recipes`;
@@ -610,11 +1006,12 @@ function renderRecipeDetail(recipeId) {
       ${renderTags(recipe.tags)}
       ${renderRelatedTips(recipe)}
       ${renderConfidenceFlags(recipe.confidence?.flags)}
-      ${renderOriginalScan(recipe.image_refs, recipe.collection)}
+      ${renderOriginalScan(recipe.image_refs, recipe.collection, images)}
     </article>
   `;
 
   container.innerHTML = html;
+  paintPlaceholders(container);
 
   // Re-attach event listeners
   const printBtn = document.getElementById('print-btn');
@@ -646,6 +1043,12 @@ function renderRecipeDetail(recipeId) {
  * Find all variants of a recipe (or recipes this is a variant of)
  */
 function findVariants(recipe) {
+  const group = variantGroup(recipe);
+  if (group) {
+    return group.members.map(ordinal => recipes[ordinal]).filter(r => r && r.id !== recipe.id);
+  }
+  if (facets) return [];
+
   const variants = [];
   const canonicalId = recipe.canonical_id || recipe.id;
 
@@ -673,6 +1076,7 @@ function findVariants(recipe) {
  * Render variants dropdown
  */
 function renderVariantsDropdown(currentRecipe, variants) {
+  const times = variantTimeRanges(variantGroup(currentRecipe));
   return `
     <div class="variants-dropdown">
       <label for="variant-select">Variants:</label>
@@ -682,10 +1086,48 @@ function renderVariantsDropdown(currentRecipe, variants) {
           <option value="${escapeAttr(v.id)}">${escapeHtml(v.source_note || v.title)}${v.variant_notes ? ` - ${escapeHtml(v.variant_notes.substring(0, 50))}...` : ''}</option>
         `).join('')}
       </select>
+      ${times ? `<small class="text-muted">${escapeHtml(times)}</small>` : ''}
     </div>
   `;
 }
 
+/**
+ * Prebuilt variant group of a recipe (null without facets or if it has no variants)
+ */
+function variantGroup(recipe) {
+  if (!facets || !recipe) return null;
+  const canonicalId = facets.group_of[recipe.id];
+  return canonicalId ? facets.variant_groups[canonicalId] : null;
+}
+
+/**
+ * Minutes as "45 min" / "1 hr 10 min"
+ */
+function formatMinutes(minutes) {
+  const hours = Math.floor(minutes / 60);
+  const rest = Math.round(minutes % 60);
+  if (hours === 0) return `${rest} min`;
+  return rest ? `${hours} hr ${rest} min` : `${hours} hr`;
+}
+
+/**
+ * Time ranges across a variant group, e.g. "Prep 10-15 min · Cook 1 hr"
+ */
+function variantTimeRanges(group) {
+  if (!group) return '';
+  const labels = { prep_minutes: 'Prep', cook_minutes: 'Cook', total_minutes: 'Total' };
+  return Object.entries(labels)
+    .filter(([key]) => group[key])
+    .map(([key, label]) => {
+      const [low, high] = group[key];
+      let range = `${formatMinutes(low)}-${formatMinutes(high)}`;
+      if (low === high) range = formatMinutes(low);
+      else if (high < 60) range = `${Math.round(low)}-${Math.round(high)} min`;
+      return `${label} ${range}`;
+    })
+    .join(' · ');
+}
+
 /**
  * Render ingredients list (with metric toggle support)
  */
@@ -964,10 +1406,146 @@ function getCollectionImagePath(collection) {
   return 'data/';
 }
 
+/**
+ * Percent-encode each segment of a file path, so scan names with spaces
+ * and brackets pass sanitizeUrl and can go in a srcset.
+ * Must match encode_path() in scripts/recipe_html.py.
+ */
+function encodePath(path) {
+  return String(path).split('/')
+    .map(part => encodeURIComponent(part).replace(/[!'()*~]/g, c => '%' + c.charCodeAt(0).toString(16).toUpperCase()))
+    .join('/');
+}
+
+/**
+ * srcset value for image variants from the image manifest (smallest first)
+ */
+function srcsetFor(variants) {
+  return variants.map(variant => `${sanitizeUrl(encodePath(variant.url))} ${variant.width}w`).join(', ');
+}
+
+/**
+ * Responsive scan thumbnail: WebP and original-format srcsets, exact
+ * dimensions of the box it is shown in, and lazy loading
+ */
+function renderResponsiveScan(src, entry) {
+  const scale = Math.min(SCAN_THUMB_WIDTH / entry.width, SCAN_THUMB_HEIGHT / entry.height, 1);
+  const width = Math.max(1, Math.round(entry.width * scale));
+  const height = Math.max(1, Math.round(entry.height * scale));
+  const sizes = `${width}px`;
+  const webp = entry.format !== 'webp' ? entry.variants.webp : null;
+  const own = entry.variants[entry.format] || [];
+  const placeholder = entry.placeholder && /^#[0-9a-f]{6}$/.test(entry.placeholder.color) ? entry.placeholder : null;
+
+  return `
+          <picture>
+            ${webp ? `<source type="image/webp" srcset="${escapeAttr(srcsetFor(webp))}" sizes="${sizes}">` : ''}
+            <img src="${escapeAttr(src)}" srcset="${escapeAttr(srcsetFor(own))}" sizes="${sizes}"
+                 width="${width}" height="${height}" loading="lazy" decoding="async"
+                 alt="Original recipe scan" class="scan-thumbnail"
+                 ${placeholder ? `data-blurhash="${escapeAttr(placeholder.blurhash)}"` : ''}
+                 style="max-width: 200px; max-height: 150px; object-fit: cover;${placeholder ? ` background-color: ${placeholder.color}; background-size: 100% 100%;` : ''}">
+          </picture>`;
+}
+
+function decode83(text) {
+  let value = 0;
+  for (const char of text) value = value * 83 + BLURHASH_CHARS.indexOf(char);
+  return value;
+}
+
+function srgbToLinear(value) {
+  const v = value / 255;
+  return v <= 0.04045 ? v / 12.92 : Math.pow((v + 0.055) / 1.055, 2.4);
+}
+
+function linearToSrgb(value) {
+  const v = Math.max(0, Math.min(1, value));
+  return Math.trunc(v <= 0.0031308 ? v * 12.92 * 255 + 0.5 : (1.055 * Math.pow(v, 1 / 2.4) - 0.055) * 255 + 0.5);
+}
+
+/**
+ * Decode a BlurHash (scripts/blurhash.py) into width x height RGBA pixels (null if malformed)
+ */
+function blurhashPixels(hash, width, height) {
+  if (!hash || hash.length < 6) return null;
+  const sizeFlag = decode83(hash[0]);
+  const numX = (sizeFlag % 9) + 1;
+  const numY = Math.floor(sizeFlag / 9) + 1;
+  if (hash.length !== 4 + 2 * numX * numY) return null;
+
+  const maximum = (decode83(hash[1]) + 1) / 166;
+  const colors = [];
+  for (let n = 0; n < numX * numY; n++) {
+    if (n === 0) {
+      const value = decode83(hash.substring(2, 6));
+      colors.push([srgbToLinear(value >> 16), srgbToLinear((value >> 8) & 255), srgbToLinear(value & 255)]);
+    } else {
+      const value = decode83(hash.substring(4 + n * 2, 6 + n * 2));
+      colors.push([Math.floor(value / 361), Math.floor(value / 19) % 19, value % 19]
+        .map(q => Math.sign(q - 9) * Math.pow((q - 9) / 9, 2) * maximum));
+    }
+  }
+
+  const pixels = new Uint8ClampedArray(width * height * 4);
+  for (let y = 0; y < height; y++) {
+    for (let x = 0; x < width; x++) {
+      let r = 0, g = 0, b = 0;
+      for (let j = 0; j < numY; j++) {
+        for (let i = 0; i < numX; i++) {
+          const basis = Math.cos(Math.PI * x * i / width) * Math.cos(Math.PI * y * j / height);
+          const color = colors[i + j * numX];
+          r += color[0] * basis;
+          g += color[1] * basis;
+          b += color[2] * basis;
+        }
+      }
+      const p = 4 * (x + y * width);
+      pixels[p] = linearToSrgb(r);
+      pixels[p + 1] = linearToSrgb(g);
+      pixels[p + 2] = linearToSrgb(b);
+      pixels[p + 3] = 255;
+    }
+  }
+  return pixels;
+}
+
+/**
+ * data: URL of a decoded BlurHash, cached per hash
+ */
+function placeholderUrl(hash) {
+  if (!placeholderUrls.has(hash)) {
+    let url = null;
+    const pixels = blurhashPixels(hash, PLACEHOLDER_PIXELS, PLACEHOLDER_PIXELS);
+    const canvas = document.createElement('canvas');
+    const context = pixels && canvas.getContext ? canvas.getContext('2d') : null;
+    if (context) {
+      canvas.width = canvas.height = PLACEHOLDER_PIXELS;
+      context.putImageData(new ImageData(pixels, PLACEHOLDER_PIXELS, PLACEHOLDER_PIXELS), 0, 0);
+      url = canvas.toDataURL();
+    }
+    placeholderUrls.set(hash, url);
+  }
+  return placeholderUrls.get(hash);
+}
+
+/**
+ * Paint the blurred placeholder behind every scan under root that is still loading
+ */
+function paintPlaceholders(root) {
+  root.querySelectorAll('img[data-blurhash]').forEach(img => {
+    if (img.complete && img.naturalWidth) return;
+    const url = placeholderUrl(img.dataset.blurhash);
+    if (!url) return;
+    img.style.backgroundImage = `url("${url}")`;
+    img.addEventListener('load', () => { img.style.backgroundImage = ''; }, { once: true });
+  });
+}
+
 /**
  * Render original scan thumbnail
  */
-function renderOriginalScan(imageRefs, collection) {
+function renderOriginalScan(imageRefs, collection, images) {
   if (!imageRefs || imageRefs.length === 0) return '';
 
   const basePath = getCollectionImagePath(collection);
@@ -976,11 +1554,12 @@ function renderOriginalScan(imageRefs, collection) {
     <section class="original-scan">
       <h3>Original Scan</h3>
       ${imageRefs.map(ref => {
-        const safePath = sanitizeUrl(basePath + ref);
+        const safePath = sanitizeUrl(encodePath(basePath + ref));
+        const entry = images?.images?.[ref];
         return `
         <a href="${escapeAttr(safePath)}" target="_blank">
-          <img src="${escapeAttr(safePath)}" alt="Original recipe scan" class="scan-thumbnail"
-               style="max-width: 200px; max-height: 150px; object-fit: cover;">
+          ${entry ? renderResponsiveScan(safePath, entry) : `<img src="${escapeAttr(safePath)}" alt="Original recipe scan" class="scan-thumbnail"
+               style="max-width: 200px; max-height: 150px; object-fit: cover;">`}
         </a>
       `;}).join('')}
     </section>
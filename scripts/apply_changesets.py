@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Changeset Applier for Other Family Recipes
+
+Applies any number of changesets to all/recipes_master.json in one pass:
+the master is loaded once, every change is applied in memory, and the file
+is written once, atomically (temp file + rename), and only if some recipe
+actually changed. meta.last_updated is only bumped on a real write.
+
+A changeset is a JSON data file:
+
+    {
+      "version": 1,
+      "name": "recovered-tips",
+      "changes": [
+        {"id": "mint-patty-cakes", "add_notes": ["Chill before serving."]},
+        {"title": "Lemon Bars", "set_attribution": "Mrs. Smith",
+         "merge_nutrition": {"calories": 210, "fat_g": 9}}
+      ]
+    }
+
+Each change targets a recipe by "id" or, failing that, "title" (matched
+through the shared title index), and lists one or more operations:
+
+    add_notes        list of tips, deduped against existing notes
+    set_attribution  set attribution if the recipe has none
+    merge_nutrition  merge per-serving values and update nutrition status
+    set_fields       {field: value} pairs to set on the recipe
+
+Tip corpora (.jsonl, see tip_corpus.py) are accepted too and streamed.
+
+Usage:
+    python apply_changesets.py changes.json [more.json ...]
+    python apply_changesets.py changes.json --dry-run      # Show diff only
+    python apply_changesets.py changes.json --master path/to/recipes_master.json
+    python apply_changesets.py ../data/tips/img_tips.jsonl --batch "BATCH 4951-5063"
+"""
+
+import argparse
+import difflib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from note_merge import merge_notes
+from tip_corpus import CorpusError, corpus_changeset
+from title_index import TitleIndex, print_unmatched
+
+RECIPES_FILE = Path(__file__).parent.parent / "all" / "recipes_master.json"
+
+CHANGESET_VERSION = 1
+
+# Per-serving nutrition keys accepted by merge_nutrition
+NUTRITION_KEYS = [
+    'calories', 'fat_g', 'saturated_fat_g', 'mono_fat_g', 'poly_fat_g',
+    'carbs_g', 'protein_g', 'sodium_mg', 'fiber_g', 'sugar_g',
+    'cholesterol_mg', 'iron_mg', 'calcium_mg'
+]
+
+# Values needed for nutrition status 'complete'
+NUTRITION_REQUIRED = ['calories', 'fat_g', 'carbs_g', 'protein_g']
+
+
+class ChangesetError(ValueError):
+    """Raised for malformed changesets."""
+
+
+# =============================================================================
+# Operations
+# =============================================================================
+
+OPERATIONS: Dict[str, Callable[[Dict, object], bool]] = {}
+
+
+def operation(name: str):
+    """Register an operation. Functions take (recipe, value) and return True if they changed it."""
+    def register(func):
+        OPERATIONS[name] = func
+        return func
+    return register
+
+
+@operation('add_notes')
+def op_add_notes(recipe: Dict, tips) -> bool:
+    if isinstance(tips, str):
+        tips = [tips]
+    return merge_notes(recipe, tips) > 0
+
+
+@operation('set_attribution')
+def op_set_attribution(recipe: Dict, attribution) -> bool:
+    if recipe.get('attribution') or not attribution:
+        return False
+    recipe['attribution'] = attribution
+    return True
+
+
+@operation('merge_nutrition')
+def op_merge_nutrition(recipe: Dict, values: Dict) -> bool:
+    unknown = set(values) - set(NUTRITION_KEYS)
+    if unknown:
+        raise ChangesetError(f"Unknown nutrition key(s): {', '.join(sorted(unknown))}")
+
+    modified = False
+    if not isinstance(recipe.get('nutrition'), dict):
+        recipe['nutrition'] = {
+            "status": "partial",
+            "per_serving": {},
+            "missing_inputs": [],
+            "assumptions": ["Data extracted from magazine clipping"]
+        }
+        modified = True
+
+    nutrition = recipe['nutrition']
+    per_serving = nutrition.setdefault('per_serving', {})
+    for key in NUTRITION_KEYS:
+        if key in values and per_serving.get(key) != values[key]:
+            per_serving[key] = values[key]
+            modified = True
+
+    has_required = all(per_serving.get(f) is not None for f in NUTRITION_REQUIRED)
+    status = 'complete' if has_required else 'partial'
+    if nutrition.get('status') != status:
+        nutrition['status'] = status
+        modified = True
+
+    return modified
+
+
+@operation('set_fields')
+def op_set_fields(recipe: Dict, fields: Dict) -> bool:
+    modified = False
+    for field, value in fields.items():
+        if field == 'id':
+            raise ChangesetError("set_fields cannot change a recipe id")
+        if recipe.get(field, object()) != value:
+            recipe[field] = value
+            modified = True
+    return modified
+
+
+# =============================================================================
+# Loading and writing
+# =============================================================================
+
+def load_changeset(path: Path, batch: Optional[str] = None) -> Dict:
+    """Load and check a changeset file. .jsonl tip corpora are streamed."""
+    if Path(path).suffix == '.jsonl':
+        return corpus_changeset(path, batch)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        changeset = json.load(f)
+
+    if isinstance(changeset, list):
+        changeset = {"changes": changeset}
+    if not isinstance(changeset, dict) or not isinstance(changeset.get('changes'), list):
+        raise ChangesetError(f"{path}: expected an object with a 'changes' list")
+
+    version = changeset.get('version', CHANGESET_VERSION)
+    if version != CHANGESET_VERSION:
+        raise ChangesetError(f"{path}: unsupported changeset version {version}")
+
+    changeset.setdefault('name', Path(path).stem)
+    return changeset
+
+
+def write_json_atomic(path: Path, data) -> None:
+    """Write JSON to a temp file next to path, then rename it into place."""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file 0600; keep the master's own permissions
+        if path.exists():
+            shutil.copymode(path, tmp)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp, 0o666 & ~umask)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def recipe_text(recipe: Dict) -> str:
+    return json.dumps(recipe, indent=2, ensure_ascii=False)
+
+
+# =============================================================================
+# Applier
+# =============================================================================
+
+class ChangesetApplier:
+    """Applies changesets to a loaded recipes_master document."""
+
+    def __init__(self, data: Dict):
+        self.data = data
+        self.recipes = data.get('recipes', [])
+        self.by_id = {}
+        for recipe in self.recipes:
+            self.by_id.setdefault(recipe.get('id'), recipe)
+        self._title_index = None
+
+        self.originals = {}   # id(recipe) -> serialized recipe before first change
+        self.applied = []     # (changeset, recipe title, [operations that changed it])
+        self.unchanged = 0
+        self.not_found = []   # (changeset, TitleMatch or id)
+        self.partial = []     # (changeset, TitleMatch)
+
+    @property
+    def title_index(self) -> TitleIndex:
+        if self._title_index is None:
+            self._title_index = TitleIndex(self.recipes)
+        return self._title_index
+
+    def resolve(self, change: Dict, name: str) -> Optional[Dict]:
+        recipe_id = change.get('id')
+        if recipe_id:
+            recipe = self.by_id.get(recipe_id)
+            if recipe is None:
+                self.not_found.append((name, recipe_id))
+            return recipe
+
+        title = change.get('title')
+        if not title:
+            raise ChangesetError(f"{name}: change needs an 'id' or 'title'")
+
+        match = self.title_index.find(title)
+        if match.recipe is None:
+            self.not_found.append((name, match))
+        elif match.kind == 'partial':
+            self.partial.append((name, match))
+        return match.recipe
+
+    def apply_change(self, change: Dict, name: str) -> bool:
+        ops = [(key, value) for key, value in change.items() if key not in ('id', 'title')]
+        unknown = [key for key, _ in ops if key not in OPERATIONS]
+        if unknown:
+            raise ChangesetError(f"{name}: unknown operation(s): {', '.join(unknown)}")
+
+        recipe = self.resolve(change, name)
+        if recipe is None:
+            return False
+
+        before = recipe_text(recipe)
+        changed_ops = [key for key, value in ops if OPERATIONS[key](recipe, value)]
+
+        if changed_ops and recipe_text(recipe) != before:
+            self.originals.setdefault(id(recipe), before)
+            self.applied.append((name, recipe.get('title', recipe.get('id')), changed_ops))
+            return True
+
+        self.unchanged += 1
+        return False
+
+    def apply(self, changeset: Dict) -> Tuple[int, int]:
+        """
+        Apply one changeset. 'changes' may be any iterable, including a
+        stream from a tip corpus. Returns (changes that modified a recipe,
+        changes seen).
+        """
+        name = changeset.get('name', 'changeset')
+        modified = total = 0
+        for change in changeset['changes']:
+            total += 1
+            if self.apply_change(change, name):
+                modified += 1
+        return modified, total
+
+    def changed_recipes(self) -> List[Dict]:
+        changed = []
+        for recipe in self.recipes:
+            original = self.originals.get(id(recipe))
+            if original is not None and original != recipe_text(recipe):
+                changed.append(recipe)
+        return changed
+
+    def diff(self) -> str:
+        """Unified diff of every changed recipe."""
+        chunks = []
+        for recipe in self.changed_recipes():
+            label = f"recipes_master.json:{recipe.get('id')}"
+            chunks.extend(difflib.unified_diff(
+                self.originals[id(recipe)].splitlines(keepends=True),
+                recipe_text(recipe).splitlines(keepends=True),
+                fromfile=f"a/{label}", tofile=f"b/{label}"
+            ))
+            if chunks and not chunks[-1].endswith('\n'):
+                chunks.append('\n')
+        return ''.join(chunks)
+
+    def write(self, path: Path) -> bool:
+        """Write the master atomically if anything changed. Returns True if written."""
+        if not self.changed_recipes():
+            return False
+        self.data.setdefault('meta', {})['last_updated'] = datetime.now().strftime('%Y-%m-%d')
+        write_json_atomic(path, self.data)
+        return True
+
+    def print_summary(self):
+        print("\n" + "=" * 60)
+        print("CHANGESET SUMMARY")
+        print("=" * 60)
+
+        changed = len(self.changed_recipes())
+        print(f"Changes applied:    {len(self.applied)}")
+        print(f"Already up to date: {self.unchanged}")
+        print(f"Recipes modified:   {changed}")
+
+        for name, title, ops in self.applied:
+            print(f"  ✓ [{name}] {title}: {', '.join(ops)}")
+
+        if self.partial:
+            print(f"\n~ {len(self.partial)} title(s) matched partially:")
+            for name, match in self.partial:
+                print(f"  [{name}] '{match.query}' -> '{match.recipe['title']}' (score {match.score:.2f})")
+
+        missing_ids = [(name, t) for name, t in self.not_found if isinstance(t, str)]
+        if missing_ids:
+            print(f"\n⚠ Unknown recipe id(s):")
+            for name, recipe_id in missing_ids:
+                print(f"  - [{name}] {recipe_id}")
+        print_unmatched([t for _, t in self.not_found if not isinstance(t, str)],
+                        "Could not find {count} recipe(s) by title:")
+
+
+def apply_changesets(changesets: List[Dict], master: Path = RECIPES_FILE,
+                     dry_run: bool = False) -> ChangesetApplier:
+    """Load the master once, apply every changeset, and write at most once."""
+    print(f"Loading {master.name}...")
+    with open(master, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    print(f"Found {len(data.get('recipes', []))} recipes")
+
+    return apply_to_data(data, changesets, master, dry_run)
+
+
+def apply_to_data(data: Dict, changesets: List[Dict], master: Path,
+                  dry_run: bool = False) -> ChangesetApplier:
+    """Apply changesets to an already loaded master and write it at most once."""
+    applier = ChangesetApplier(data)
+
+    for changeset in changesets:
+        modified, total = applier.apply(changeset)
+        print(f"  {changeset.get('name')}: {modified} of {total} change(s) modified a recipe")
+
+    applier.print_summary()
+
+    if dry_run:
+        diff = applier.diff()
+        print("\n" + (diff if diff else "No changes."))
+        print("\nDry run: nothing written.")
+    elif applier.write(master):
+        print(f"\n✓ Wrote {master}")
+    else:
+        print(f"\nNo changes; {master.name} left untouched.")
+
+    return applier
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply recipe changesets to recipes_master.json')
+    parser.add_argument('changesets', nargs='+', type=Path,
+                        help='Changeset JSON files or .jsonl tip corpora')
+    parser.add_argument('--master', type=Path, default=RECIPES_FILE,
+                        help='Path to recipes_master.json')
+    parser.add_argument('--dry-run', '-n', action='store_true',
+                        help='Show a diff without writing')
+    parser.add_argument('--batch', '-b',
+                        help='Only apply one audit batch from .jsonl tip corpora')
+    args = parser.parse_args()
+
+    try:
+        changesets = [load_changeset(path, args.batch) for path in args.changesets]
+        apply_changesets(changesets, args.master, args.dry_run)
+    except (ChangesetError, CorpusError, json.JSONDecodeError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except FileNotFoundError as e:
+        print(f"Error: File not found: {e.filename}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
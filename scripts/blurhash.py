@@ -0,0 +1,110 @@
+"""
+BlurHash Encoding for Other Family Recipes
+
+A BlurHash is a ~30-character string holding a handful of cosine
+components of an image: enough for the browser to paint a soft, blurred
+preview of a scan while the real JPEG downloads. The decoder is
+blurhashPixels() in script.js; the format follows the reference
+implementation (https://blurha.sh), so any BlurHash decoder can read it.
+
+Encoding needs only the pixels of a small copy of the image (a 32px
+thumbnail gives the same hash, give or take rounding, as the full scan),
+so plain Python is fast enough.
+
+Usage (as a module):
+    from blurhash import encode, average_color
+    pixels = list(thumb.getdata())          # [(r, g, b), ...] row by row
+    hash = encode(pixels, thumb.width, thumb.height)
+    color = average_color(hash)             # '#a3957c'
+"""
+
+import math
+from typing import List, Sequence, Tuple
+
+BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+# Components along the long and the short side of the image
+LONG_COMPONENTS = 4
+SHORT_COMPONENTS = 3
+
+
+def encode83(value: int, length: int) -> str:
+    return ''.join(BASE83[(value // 83 ** (length - 1 - n)) % 83] for n in range(length))
+
+
+def decode83(text: str) -> int:
+    value = 0
+    for char in text:
+        value = value * 83 + BASE83.index(char)
+    return value
+
+
+def srgb_to_linear(value: int) -> float:
+    v = value / 255
+    return v / 12.92 if v <= 0.04045 else ((v + 0.055) / 1.055) ** 2.4
+
+
+def linear_to_srgb(value: float) -> int:
+    v = max(0.0, min(1.0, value))
+    if v <= 0.0031308:
+        return int(v * 12.92 * 255 + 0.5)
+    return int((1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(value: float, exponent: float) -> float:
+    return math.copysign(abs(value) ** exponent, value)
+
+
+def components_for(width: int, height: int) -> Tuple[int, int]:
+    """(x, y) component counts, more along the longer side."""
+    if width >= height:
+        return LONG_COMPONENTS, SHORT_COMPONENTS
+    return SHORT_COMPONENTS, LONG_COMPONENTS
+
+
+def encode(pixels: Sequence[Tuple[int, int, int]], width: int, height: int) -> str:
+    """BlurHash of an RGB image given as width * height pixels, row by row."""
+    if len(pixels) != width * height or not pixels:
+        raise ValueError("pixel count does not match width x height")
+    nx, ny = components_for(width, height)
+    linear = [(srgb_to_linear(r), srgb_to_linear(g), srgb_to_linear(b)) for r, g, b, *_ in pixels]
+    cos_x = [[math.cos(math.pi * i * x / width) for x in range(width)] for i in range(nx)]
+    cos_y = [[math.cos(math.pi * j * y / height) for y in range(height)] for j in range(ny)]
+
+    factors: List[Tuple[float, float, float]] = []
+    for j in range(ny):
+        for i in range(nx):
+            r = g = b = 0.0
+            for y in range(height):
+                row = y * width
+                cy = cos_y[j][y]
+                for x in range(width):
+                    basis = cos_x[i][x] * cy
+                    pr, pg, pb = linear[row + x]
+                    r += basis * pr
+                    g += basis * pg
+                    b += basis * pb
+            scale = (1 if i == 0 and j == 0 else 2) / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = encode83((nx - 1) + (ny - 1) * 9, 1)
+    if ac:
+        actual_max = max(abs(c) for factor in ac for c in factor)
+        quantised_max = int(max(0, min(82, math.floor(actual_max * 166 - 0.5))))
+        maximum = (quantised_max + 1) / 166
+        result += encode83(quantised_max, 1)
+    else:
+        maximum = 1
+        result += encode83(0, 1)
+
+    result += encode83((linear_to_srgb(dc[0]) << 16) + (linear_to_srgb(dc[1]) << 8) + linear_to_srgb(dc[2]), 4)
+    for factor in ac:
+        q = [int(max(0, min(18, math.floor(_sign_pow(c / maximum, 0.5) * 9 + 9.5)))) for c in factor]
+        result += encode83(q[0] * 19 * 19 + q[1] * 19 + q[2], 2)
+    return result
+
+
+def average_color(blurhash: str) -> str:
+    """The hash's DC component as a CSS hex color."""
+    return f"#{decode83(blurhash[2:6]):06x}"
@@ -0,0 +1,658 @@
+#!/usr/bin/env python3
+"""
+Publishable Asset Build for Other Family Recipes
+
+Assembles the site into dist/ so browsers can keep what has not changed
+instead of re-downloading everything on every visit:
+
+    assets/<name>.<hash>.js|css   script.js and styles.css, minified and
+                                  named by a hash of their content (each
+                                  only if some page links it)
+    *.html, recipes/*.html        minified pages, with src/href pointing at
+                                  the hashed assets; index.html, if it
+                                  links styles.css, carries its critical
+                                  CSS inline and loads the full stylesheet
+                                  without blocking rendering
+    data/...                      site data, scans and generated images
+                                  (data/build and data/images are already
+                                  content-hashed by their own builds)
+    precache.json                 the service worker's (sw.js) offline list
+    *.gz                          gzip siblings (level 9) of text files,
+                                  for servers that serve precompressed files
+    _headers, .htaccess           the repository's header files plus
+                                  generated cache rules (the _headers ones
+                                  need Cloudflare Pages, see below)
+
+Cache policy: pages keep the no-store policy of _headers/.htaccess, other
+unhashed files (scans, manifests) are revalidated, and directories whose
+files all carry a content hash are cached for a year as immutable. Cache
+rules are "private", so shared caches never keep family data, and the
+privacy headers (X-Robots-Tag, Referrer-Policy, ...) apply everywhere.
+The _headers rules lift the no-store default with "! Cache-Control",
+which only Cloudflare Pages understands; Netlify has no way to remove a
+header, so there the default still applies and the rules change nothing.
+
+precache.json lists [url, content hash, bytes] for the files sw.js keeps
+offline, in tiers fetched in order: the app shell (pages, script, styles,
+manifests), the recipe data (build shards, tips) and the grid thumbnails
+(sprite sheets). Scans and their copies are cached on demand only. It
+also records what changed since the previous build, so clients fetch
+only the entries that were added or changed.
+
+Minification (see minify.py) is conservative and cached by input hash
+in .asset-cache/, so only changed files are minified again.
+
+The build is a list of stages, like build_site_data.py. Unchanged files
+are not rewritten, scans are hard-linked where possible, and files that
+are no longer produced are removed from dist/.
+
+Usage:
+    python build_assets.py                  # Build dist/
+    python build_assets.py --output public
+    python build_assets.py --no-minify      # Keep scripts, styles and pages as written
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from collections import OrderedDict
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from build_utils import content_hash, dump_compact, write_atomic
+from image_utils import PROCESSED_FOLDER, find_sources
+from minify import critical_css, minify_css, minify_html, minify_js
+
+ROOT = Path(__file__).parent.parent
+DIST_DIR = ROOT / "dist"
+ASSETS_FOLDER = "assets"
+
+# Fingerprinted into assets/ when a page links them
+ASSETS = ["script.js", "styles.css"]
+PAGES = ["index.html", "recipe.html", "tips.html"]
+# Copied as-is when present
+STATIC_FILES = ["robots.txt", ".nojekyll", "sw.js", "recipes/pages.json",
+                "data/recipes.json", "data/tips_master.json", "data/collections.json"]
+# Copied whole when present (their files are content-hashed by their builds)
+STATIC_DIRS = ["data/build", "data/images"]
+
+PRECACHE_FILE = "precache.json"
+PRECACHE_VERSION = 1
+# Tiers in the order sw.js fetches them; a file is in the first tier it matches
+PRECACHE_TIERS = [
+    ("shell", ["index.html", "recipe.html", "tips.html", f"{ASSETS_FOLDER}/*", "recipes/pages.json",
+               "data/build/manifest.json", "data/images/manifest.json", "data/images/sprites/index.json"]),
+    ("data", ["data/build/*", "data/recipes.json", "data/tips_master.json"]),
+    ("thumbnails", ["data/images/sprites/*.jpg"]),
+]
+
+MINIFY_CACHE = ROOT / ".asset-cache"
+# Bump when minify.py output changes, to minify everything again
+MINIFY_VERSION = 1
+MINIFIERS = {".js": minify_js, ".css": minify_css, ".html": minify_html}
+
+# Pages that get the rules of CRITICAL_CSS_SOURCE matching their markup
+# inline, if they link it (the rules of a stylesheet a page does not load
+# would only style it wrongly)
+CRITICAL_CSS_PAGES = ["index.html"]
+CRITICAL_CSS_SOURCE = "styles.css"
+
+HEADERS_FILE = "_headers"
+HTACCESS_FILE = ".htaccess"
+
+GZIP_LEVEL = 9
+COMPRESS_SUFFIXES = {".html", ".js", ".css", ".json", ".dzi", ".txt", ".svg"}
+
+CACHE_IMMUTABLE = "private, max-age=31536000, immutable"
+CACHE_REVALIDATE = "private, no-cache"
+
+# A content hash in a file or directory name: summary.3f9a1c2b7d.json,
+# scan.97ec6d52-320.jpg, scan.97ec6d52_files/
+HASHED_NAME = re.compile(r'\.[0-9a-f]{8,}(?=[._-]|/|$)')
+
+# Unhashed files a directory may hold (index files) and still be cached as immutable
+MAX_EXCEPTIONS = 8
+
+
+class AssetContext:
+    """Source tree, output directory and what the stages produced."""
+
+    def __init__(self, root: Path, out_dir: Path, minify: bool = True, cache_dir: Path = MINIFY_CACHE):
+        self.root = root
+        self.out = out_dir
+        self.minify = minify
+        self.cache_dir = cache_dir
+        self.outputs: Dict[str, int] = {}     # path relative to out -> bytes
+        self.minified: Dict[str, bytes] = {}  # source path -> minified content
+        self.savings: Dict[str, Tuple[int, int]] = {}   # source path -> (bytes, minified bytes)
+        self.cache_hits = 0
+        self.critical: Dict[str, int] = {}    # page -> inlined critical CSS bytes
+        self.renamed: Dict[str, str] = {}     # asset -> fingerprinted path
+        self.unused: List[str] = []           # ASSETS no page links
+        self.pages = 0
+        self.references = 0                   # src/href attributes rewritten
+        self.gzipped: Dict[str, Tuple[int, int]] = {}   # path -> (bytes, gzip bytes)
+        self.precache: Dict[str, Tuple[int, int]] = {}  # tier -> (files, bytes)
+        self.precache_diff: Optional[Dict] = None
+        self.immutable: List[str] = []        # directories cached as immutable
+        self.exceptions: List[str] = []       # unhashed files inside them
+        self.written = 0
+        self.reused = 0
+        self.removed = 0
+        self.timings = OrderedDict()
+
+    def source(self, relative: str) -> bytes:
+        """A source file's content, minified if the minify stage did so."""
+        if relative in self.minified:
+            return self.minified[relative]
+        return (self.root / relative).read_bytes()
+
+    def put_bytes(self, relative: str, data: bytes):
+        """Write data to out/relative unless it already holds exactly that."""
+        path = self.out / relative
+        try:
+            same = path.stat().st_size == len(data) and path.read_bytes() == data
+        except OSError:
+            same = False
+        if same:
+            self.reused += 1
+        else:
+            write_atomic(path, data)
+            self.written += 1
+        self.outputs[relative] = len(data)
+
+    def put_file(self, relative: str, source: Path):
+        """Hard-link (or copy) source to out/relative unless it is already there."""
+        path = self.out / relative
+        stat = source.stat()
+        try:
+            current = path.stat()
+            same = (os.path.samefile(source, path) or
+                    (current.st_size == stat.st_size and current.st_mtime_ns == stat.st_mtime_ns))
+        except OSError:
+            same = False
+        if same:
+            self.reused += 1
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if path.exists():
+                path.unlink()
+            try:
+                os.link(source, path)
+            except OSError:
+                shutil.copy2(source, path)
+            self.written += 1
+        self.outputs[relative] = stat.st_size
+
+
+# =============================================================================
+# Stages
+# =============================================================================
+
+STAGES: "OrderedDict[str, Callable[[AssetContext], None]]" = OrderedDict()
+
+
+def stage(name: str):
+    """Register a build stage. Stages run in registration order."""
+    def register(func):
+        STAGES[name] = func
+        return func
+    return register
+
+
+def relative(path: Path, root: Path) -> str:
+    return path.relative_to(root).as_posix()
+
+
+@stage('copy')
+def copy_static(ctx: AssetContext):
+    for name in STATIC_FILES:
+        if (ctx.root / name).is_file():
+            ctx.put_file(name, ctx.root / name)
+    for name in STATIC_DIRS:
+        for path in sorted((ctx.root / name).rglob('*')):
+            # Skip temporary files of interrupted builds
+            if path.is_file() and not any(part.startswith('.') for part in path.relative_to(ctx.root).parts):
+                ctx.put_file(relative(path, ctx.root), path)
+    data_dir = ctx.root / "data"
+    for path in find_sources(data_dir) + find_sources(data_dir / PROCESSED_FOLDER):
+        ctx.put_file(relative(path, ctx.root), path)
+
+
+def page_sources(root: Path) -> List[Path]:
+    return [root / name for name in PAGES] + sorted((root / "recipes").glob('*.html'))
+
+
+def reference_pattern(names: List[str]) -> re.Pattern:
+    """src/href attributes naming one of names (group 2), relative to the site root."""
+    alternatives = '|'.join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+    return re.compile(r'(\b(?:src|href)\s*=\s*["\'])(?:\./)?(' + alternatives + r')(?=["\'?#])')
+
+
+def linked_assets(root: Path) -> List[str]:
+    """The ASSETS some page links; the others are left out of the build."""
+    pattern = reference_pattern(ASSETS)
+    linked = set()
+    for path in page_sources(root):
+        if path.is_file():
+            linked.update(match.group(2) for match in pattern.finditer(path.read_text(encoding='utf-8')))
+    return [name for name in ASSETS if name in linked]
+
+
+def cached_minify(ctx: AssetContext, name: str, data: bytes, used: set) -> bytes:
+    """Minified data, from the cache if these exact bytes were minified before."""
+    suffix = Path(name).suffix
+    key = content_hash(f"{MINIFY_VERSION}{suffix}:".encode('utf-8') + data, 16) + suffix
+    used.add(key)
+    cached = ctx.cache_dir / key
+    if cached.is_file():
+        ctx.cache_hits += 1
+        return cached.read_bytes()
+    small = MINIFIERS[suffix](data.decode('utf-8')).encode('utf-8')
+    write_atomic(cached, small)
+    return small
+
+
+@stage('minify')
+def minify_sources(ctx: AssetContext):
+    if not ctx.minify:
+        return
+    used = set()
+    for path in [ctx.root / name for name in linked_assets(ctx.root)] + page_sources(ctx.root):
+        if not path.is_file():
+            continue
+        name = relative(path, ctx.root)
+        data = path.read_bytes()
+        small = cached_minify(ctx, name, data, used)
+        if len(small) < len(data):
+            ctx.minified[name] = small
+        ctx.savings[name] = (len(data), min(len(small), len(data)))
+    for stale in ctx.cache_dir.glob('*'):
+        if stale.is_file() and stale.name not in used:
+            stale.unlink()
+
+
+@stage('fingerprint')
+def fingerprint_assets(ctx: AssetContext):
+    linked = linked_assets(ctx.root)
+    for name in ASSETS:
+        path = ctx.root / name
+        if not path.is_file():
+            continue
+        if name not in linked:
+            ctx.unused.append(name)
+            continue
+        data = ctx.source(name)
+        hashed = f"{ASSETS_FOLDER}/{path.stem}.{content_hash(data)}{path.suffix}"
+        ctx.put_bytes(hashed, data)
+        ctx.renamed[name] = hashed
+
+
+def rewrite_references(html: str, renamed: Dict[str, str]) -> Tuple[str, int]:
+    """Point src/href attributes naming an asset at its fingerprinted copy."""
+    if not renamed:
+        return html, 0
+    return reference_pattern(list(renamed)).subn(lambda m: m.group(1) + renamed[m.group(2)], html)
+
+
+_STYLESHEET_LINK = re.compile(r'<link\b[^>]*\brel\s*=\s*["\']stylesheet["\'][^>]*>', re.I)
+
+
+def inline_critical_css(html: str, css: str, href: str) -> Tuple[str, int]:
+    """
+    Put the rules of css that apply to the page's markup in a <style>
+    before the page's stylesheet link to href (css's URL), and turn that
+    link into a preload that applies the full stylesheet once it arrives
+    (<noscript> keeps the plain link). Other stylesheets are left alone;
+    a page that does not link href is returned unchanged. Returns the
+    page and the inlined CSS size.
+    """
+    linked = reference_pattern([href])
+    if not any(linked.search(match.group()) for match in _STYLESHEET_LINK.finditer(html)):
+        return html, 0
+    critical = critical_css(minify_css(css), html).replace('</', '<\\/')
+    if not critical:
+        return html, 0
+    style = [f"<style>{critical}</style>"]
+
+    def deferred(match):
+        link = match.group()
+        if not linked.search(link):
+            return link
+        preload = re.sub(r'\brel\s*=\s*["\']stylesheet["\']',
+                         'rel="preload" as="style" onload="this.onload=null;this.rel=\'stylesheet\'"', link)
+        prefix = style.pop() if style else ''
+        return f"{prefix}{preload}<noscript>{link}</noscript>"
+
+    return _STYLESHEET_LINK.sub(deferred, html), len(critical)
+
+
+@stage('pages')
+def rewrite_pages(ctx: AssetContext):
+    css_path = ctx.root / CRITICAL_CSS_SOURCE
+    css_href = ctx.renamed.get(CRITICAL_CSS_SOURCE)  # Only set when some page links it
+    for path in page_sources(ctx.root):
+        if not path.is_file():
+            continue
+        name = relative(path, ctx.root)
+        html, count = rewrite_references(ctx.source(name).decode('utf-8'), ctx.renamed)
+        if ctx.minify and name in CRITICAL_CSS_PAGES and css_href:
+            html, size = inline_critical_css(html, css_path.read_text(encoding='utf-8'), css_href)
+            if size:
+                ctx.critical[name] = size
+        ctx.put_bytes(name, html.encode('utf-8'))
+        ctx.pages += 1
+        ctx.references += count
+
+
+def precache_tier(name: str, files: Dict[str, int]) -> Optional[str]:
+    """Tier of a file, None if it is only cached on demand."""
+    # recipes.json is only the fallback for sites without data/build
+    if name == "data/recipes.json" and "data/build/manifest.json" in files:
+        return None
+    for tier, patterns in PRECACHE_TIERS:
+        if any(fnmatch(name, pattern) for pattern in patterns):
+            return tier
+    return None
+
+
+def precache_diff(previous: Dict, build: str, entries: Dict[str, str]) -> Optional[Dict]:
+    """What changed since the previous precache.json (None for a first build)."""
+    if previous.get("version") != PRECACHE_VERSION or not previous.get("build"):
+        return None
+    if previous["build"] == build:
+        return previous.get("diff")
+    old = {url: hash for tier in previous.get("tiers", []) for url, hash, _ in tier["entries"]}
+    return {
+        "from": previous["build"],
+        "added": sorted(url for url in entries if url not in old),
+        "changed": sorted(url for url in entries if url in old and old[url] != entries[url]),
+        "removed": sorted(url for url in old if url not in entries),
+    }
+
+
+@stage('precache')
+def write_precache(ctx: AssetContext):
+    tiers = OrderedDict((tier, []) for tier, _ in PRECACHE_TIERS)
+    for name in sorted(ctx.outputs):
+        tier = precache_tier(name, ctx.outputs)
+        if tier:
+            data = (ctx.out / name).read_bytes()
+            tiers[tier].append([name, content_hash(data), len(data)])
+    listed = [{"name": tier, "entries": entries} for tier, entries in tiers.items()]
+    build = content_hash(dump_compact(listed))
+
+    try:
+        previous = json.loads((ctx.out / PRECACHE_FILE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        previous = {}
+    hashes = {url: hash for entries in tiers.values() for url, hash, _ in entries}
+    ctx.precache_diff = precache_diff(previous, build, hashes)
+    ctx.precache = {tier: (len(entries), sum(size for _, _, size in entries)) for tier, entries in tiers.items()}
+
+    manifest = {"version": PRECACHE_VERSION, "build": build, "tiers": listed}
+    if ctx.precache_diff:
+        manifest["diff"] = ctx.precache_diff
+    ctx.put_bytes(PRECACHE_FILE, dump_compact(manifest))
+
+
+@stage('compress')
+def compress_text(ctx: AssetContext):
+    for name in [name for name in ctx.outputs if Path(name).suffix in COMPRESS_SUFFIXES]:
+        path = ctx.out / name
+        gz_name = name + '.gz'
+        gz_path = ctx.out / gz_name
+        # A .gz newer than its file is current (unchanged files keep their mtime)
+        if gz_path.exists() and gz_path.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+            ctx.reused += 1
+            ctx.outputs[gz_name] = gz_path.stat().st_size
+            ctx.gzipped[name] = (ctx.outputs[name], ctx.outputs[gz_name])
+            continue
+        data = path.read_bytes()
+        packed = gzip.compress(data, GZIP_LEVEL, mtime=0)
+        if len(packed) >= len(data):
+            continue
+        write_atomic(gz_path, packed)
+        ctx.written += 1
+        ctx.outputs[gz_name] = len(packed)
+        ctx.gzipped[name] = (len(data), len(packed))
+
+
+def is_hashed(name: str) -> bool:
+    return bool(HASHED_NAME.search(name))
+
+
+def immutable_dirs(files: List[str], prefix: str = '') -> Tuple[List[str], List[str]]:
+    """
+    The largest directories under prefix whose files are content-hashed,
+    but for at most MAX_EXCEPTIONS unhashed ones (manifests, indexes), and
+    those exceptions.
+    """
+    dirs, exceptions = [], []
+    subdirs = sorted({name[len(prefix):].split('/')[0] for name in files if '/' in name[len(prefix):]})
+    for sub in subdirs:
+        directory = f"{prefix}{sub}/"
+        inside = [name for name in files if name.startswith(directory)]
+        unhashed = [name for name in inside if not is_hashed(name)]
+        pages = any(name.endswith(('.html', '.html.gz')) for name in inside)
+        if not pages and len(unhashed) < len(inside) and len(unhashed) <= MAX_EXCEPTIONS:
+            dirs.append(directory)
+            exceptions.extend(unhashed)
+        else:
+            more_dirs, more_exceptions = immutable_dirs(inside, directory)
+            dirs.extend(more_dirs)
+            exceptions.extend(more_exceptions)
+    return dirs, exceptions
+
+
+def headers_rule(path: str, cache_control: str) -> str:
+    # "! Name" drops a header an earlier matching rule set (the no-store
+    # default); Cloudflare Pages syntax, Netlify cannot remove headers
+    return (f"/{quote(path, safe='/*')}\n  ! Cache-Control\n  ! Pragma\n  ! Expires\n"
+            f"  Cache-Control: {cache_control}\n")
+
+
+def headers_file(base: str, revalidate: List[str], immutable: List[str], exceptions: List[str]) -> str:
+    rules = [base.rstrip() + "\n", HEADERS_NOTE]
+    rules += [headers_rule(directory + '*', CACHE_REVALIDATE) for directory in revalidate]
+    rules += [headers_rule(directory + '*', CACHE_IMMUTABLE) for directory in immutable]
+    rules += [headers_rule(name, CACHE_REVALIDATE) for name in exceptions]
+    return "\n".join(rules)
+
+
+HEADERS_NOTE = """\
+# ---- Cache policy, generated by scripts/build_assets.py ----
+# Pages keep the no-store policy above. Other unhashed files are
+# revalidated; content-hashed files never change, so they are cached for
+# a year. Later rules override earlier ones.
+# Cloudflare Pages only: the "! Cache-Control" lines that lift the
+# no-store default are not understood by Netlify, where it stays in force.
+"""
+
+HTACCESS_CACHE_RULE = """\
+    <If "{condition}">
+        Header set Cache-Control "{cache_control}"
+        Header unset Pragma
+        Header unset Expires
+    </If>
+"""
+
+HTACCESS_TEMPLATE = """
+# ---- Generated by scripts/build_assets.py ----
+
+# Cache policy: pages keep the no-store policy above, other unhashed
+# files are revalidated, content-hashed files are cached for a year
+# (<If> needs Apache 2.4)
+<IfModule mod_headers.c>
+{cache_rules}</IfModule>
+
+# Serve the precompressed .gz sibling to clients that accept gzip
+<IfModule mod_rewrite.c>
+    RewriteEngine On
+    RewriteCond %{{HTTP:Accept-Encoding}} gzip
+    RewriteCond %{{REQUEST_FILENAME}}.gz -f
+    RewriteRule ^(.+\\.(html|js|css|json|dzi|txt|svg))$ $1.gz [L]
+    RewriteRule \\.html\\.gz$ - [T=text/html,E=no-gzip:1]
+    RewriteRule \\.js\\.gz$ - [T=text/javascript,E=no-gzip:1]
+    RewriteRule \\.css\\.gz$ - [T=text/css,E=no-gzip:1]
+    RewriteRule \\.json\\.gz$ - [T=application/json,E=no-gzip:1]
+    RewriteRule \\.dzi\\.gz$ - [T=application/xml,E=no-gzip:1]
+    RewriteRule \\.txt\\.gz$ - [T=text/plain,E=no-gzip:1]
+    RewriteRule \\.svg\\.gz$ - [T=image/svg+xml,E=no-gzip:1]
+</IfModule>
+<IfModule mod_headers.c>
+    <FilesMatch "\\.gz$">
+        Header set Content-Encoding gzip
+        Header append Vary Accept-Encoding
+    </FilesMatch>
+</IfModule>
+
+# Allow the JSON files the site fetches (the rule above denies JSON)
+<FilesMatch "^({json_names})\\.json(\\.gz)?$|\\.[0-9a-f]{{8,}}\\.json(\\.gz)?$">
+    <IfModule mod_authz_core.c>
+        Require all granted
+    </IfModule>
+    <IfModule !mod_authz_core.c>
+        Order Allow,Deny
+        Allow from all
+    </IfModule>
+</FilesMatch>
+"""
+
+
+def uri_pattern(names: List[str]) -> str:
+    """Regex alternatives matching the (decoded) request paths of names."""
+    return '|'.join(re.escape(name).replace('\\ ', '\\x20') for name in names)
+
+
+def htaccess_file(base: str, revalidate: List[str], immutable: List[str], exceptions: List[str],
+                  json_names: List[str]) -> str:
+    rules = []
+    if revalidate:
+        rules.append(HTACCESS_CACHE_RULE.format(
+            condition=f"%{{REQUEST_URI}} =~ m#/({uri_pattern(revalidate)})#", cache_control=CACHE_REVALIDATE))
+    if immutable:
+        condition = f"%{{REQUEST_URI}} =~ m#/({uri_pattern(immutable)})#"
+        if exceptions:
+            condition += f" && ! %{{REQUEST_URI}} =~ m#/({uri_pattern(exceptions)})(\\.gz)?$#"
+        rules.append(HTACCESS_CACHE_RULE.format(condition=condition, cache_control=CACHE_IMMUTABLE))
+    return base.rstrip() + "\n" + HTACCESS_TEMPLATE.format(
+        cache_rules=''.join(rules), json_names=uri_pattern(json_names) or 'manifest')
+
+
+@stage('headers')
+def write_headers(ctx: AssetContext):
+    files = sorted(ctx.outputs)
+    ctx.immutable, exceptions = immutable_dirs(files)
+    ctx.exceptions = [name for name in exceptions if not name.endswith('.gz')]
+    # Top-level directories without pages: revalidated unless immutable
+    tops = sorted({name.split('/')[0] + '/' for name in files if '/' in name})
+    revalidate = [top for top in tops if top not in ctx.immutable and
+                  not any(name.startswith(top) and name.endswith('.html') for name in files)]
+
+    base = ctx.root / HEADERS_FILE
+    if base.is_file():
+        ctx.put_bytes(HEADERS_FILE, headers_file(base.read_text(encoding='utf-8'), revalidate,
+                                                 ctx.immutable, ctx.exceptions).encode('utf-8'))
+    base = ctx.root / HTACCESS_FILE
+    if base.is_file():
+        json_names = sorted({Path(name).stem for name in files
+                             if name.endswith('.json') and not is_hashed(name)})
+        ctx.put_bytes(HTACCESS_FILE, htaccess_file(base.read_text(encoding='utf-8'), revalidate,
+                                                   ctx.immutable, ctx.exceptions,
+                                                   json_names).encode('utf-8'))
+
+
+def remove_stale(ctx: AssetContext):
+    """Remove files from earlier builds that this build did not produce."""
+    keep = {ctx.out / name for name in ctx.outputs}
+    for path in [p for p in ctx.out.rglob('*') if p.is_file() or p.is_symlink()]:
+        if path not in keep:
+            path.unlink()
+            ctx.removed += 1
+    for directory in sorted((d for d in ctx.out.rglob('*') if d.is_dir()), reverse=True):
+        if not any(directory.iterdir()):
+            directory.rmdir()
+
+
+def run_build(root: Path = ROOT, out_dir: Path = DIST_DIR, minify: bool = True,
+              cache_dir: Path = MINIFY_CACHE) -> AssetContext:
+    ctx = AssetContext(root, out_dir, minify, cache_dir)
+    for name, func in STAGES.items():
+        start = time.perf_counter()
+        func(ctx)
+        ctx.timings[name] = time.perf_counter() - start
+    remove_stale(ctx)
+    return ctx
+
+
+def print_summary(ctx: AssetContext):
+    print("\n" + "=" * 60)
+    print("ASSET BUILD")
+    print("=" * 60)
+    print(f"Output:     {ctx.out}")
+    print(f"Files:      {len(ctx.outputs)} ({ctx.written} written, {ctx.reused} unchanged)")
+    for name, hashed in ctx.renamed.items():
+        print(f"  {name:<14} -> {hashed}")
+    if ctx.unused:
+        print(f"Unused:     {', '.join(ctx.unused)} (no page links it; not published)")
+    print(f"Pages:      {ctx.pages} ({ctx.references} asset references rewritten)")
+    if ctx.savings:
+        print(f"Minified:   {len(ctx.savings)} files ({ctx.cache_hits} from cache)")
+        rows = [(name, *sizes) for name, sizes in ctx.savings.items() if not name.startswith('recipes/')]
+        recipe_pages = [sizes for name, sizes in ctx.savings.items() if name.startswith('recipes/')]
+        if recipe_pages:
+            rows.append((f"recipes/ ({len(recipe_pages)})", sum(b for b, _ in recipe_pages),
+                         sum(m for _, m in recipe_pages)))
+        for name, before, after in rows:
+            print(f"  {name:<20} {before / 1024:>8.1f} KB -> {after / 1024:>8.1f} KB "
+                  f"(-{100 * (before - after) / max(before, 1):.0f}%)")
+    for name, size in ctx.critical.items():
+        print(f"Critical:   {size / 1024:.1f} KB of {CRITICAL_CSS_SOURCE} inlined into {name}")
+    if ctx.gzipped:
+        plain = sum(size for size, _ in ctx.gzipped.values())
+        packed = sum(size for _, size in ctx.gzipped.values())
+        print(f"Gzip:       {len(ctx.gzipped)} files, {plain / 1024:.1f} KB -> {packed / 1024:.1f} KB "
+              f"({100 * packed / plain:.0f}%)")
+    if ctx.removed:
+        print(f"Removed:    {ctx.removed} stale files")
+    print("Precache:   " + ", ".join(f"{tier} {files} ({size / 1024:.1f} KB)"
+                                      for tier, (files, size) in ctx.precache.items()))
+    diff = ctx.precache_diff
+    if diff:
+        print(f"Changes:    {len(diff['added'])} added, {len(diff['changed'])} changed, "
+              f"{len(diff['removed'])} removed since build {diff['from']}")
+    print(f"Immutable:  {', '.join(ctx.immutable) or 'none'}")
+    if ctx.exceptions:
+        print(f"Revalidate: {', '.join(ctx.exceptions)}")
+
+    print("\nStage timings:")
+    for name, seconds in ctx.timings.items():
+        print(f"  {name:<14} {seconds * 1000:>8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the publishable site with hashed, precompressed assets')
+    parser.add_argument('--output', '-o', type=Path, default=DIST_DIR,
+                        help='Output directory (default: dist/)')
+    parser.add_argument('--no-minify', action='store_true',
+                        help='Publish scripts, styles and pages unminified')
+    args = parser.parse_args()
+
+    if args.output.resolve() == ROOT.resolve() or ROOT.resolve().is_relative_to(args.output.resolve()):
+        print(f"Error: Output must not contain the source tree: {args.output}")
+        sys.exit(1)
+
+    ctx = run_build(ROOT, args.output, minify=not args.no_minify)
+    print_summary(ctx)
+
+
+if __name__ == '__main__':
+    main()
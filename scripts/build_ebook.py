@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+E-Book Generator for Other Family Recipes
+
+Generates ebook/book.html (styled by ebook/print.css) from the recipe
+data: cover, table of contents, one chapter per category, an alphabetical
+index, an appendix of original scans and the back cover.
+
+The corpus is never held in memory as a whole:
+
+1. recipes.json is streamed one recipe at a time. A first pass keeps only
+   what the table of contents, index and appendix need, plus a hash of
+   each recipe.
+2. Each chapter's hash covers its recipes (and their variant links).
+   Chapters are cached as HTML fragments in ebook/.chapters/, so after
+   editing one recipe only its chapter is rendered again, in a second
+   streaming pass.
+3. The book is written to a temp file in chunks, with cached chapters
+   copied straight from disk, then renamed into place.
+
+Print to PDF from a browser, or with wkhtmltopdf (see README).
+
+Usage:
+    python build_ebook.py                          # Build ebook/book.html
+    python build_ebook.py --input all/recipes_master.json
+    python build_ebook.py --force                  # Re-render every chapter
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterator, List, TextIO
+
+from build_site_data import RECIPES_JSON, shard_key as chapter_key, title_sort_key, variant_groups
+from build_utils import dump_compact, match_mode
+from recipe_html import escape_attr, escape_html, js_str, page_name
+
+ROOT = Path(__file__).parent.parent
+BOOK_FILE = ROOT / "ebook" / "book.html"
+CACHE_DIR = ROOT / "ebook" / ".chapters"
+
+# Bump when the recipe markup below changes, to re-render every chapter
+RENDERER_VERSION = 1
+
+# Bytes read per chunk while streaming recipes.json
+READ_CHUNK = 1 << 16
+
+# Chapters in cookbook order; other categories follow alphabetically
+CHAPTER_ORDER = ['beverages', 'appetizers', 'breakfast', 'breads', 'soups', 'salads',
+                 'mains', 'sides', 'snacks', 'desserts']
+
+CHAPTER_TITLES = {'mains': 'Main Dishes', 'uncategorized': 'Other Recipes'}
+
+# Same icons as getCategoryIcon() in script.js
+CATEGORY_ICONS = {
+    'appetizers': '🥗', 'beverages': '🍹', 'breads': '🍞', 'breakfast': '🍳',
+    'desserts': '🍪', 'mains': '🍽️', 'salads': '🥬', 'sides': '🥕',
+    'soups': '🍲', 'snacks': '🍿',
+}
+
+BOOK_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <meta name="robots" content="noindex, nofollow, noarchive, nosnippet, noimageindex">
+  <meta name="googlebot" content="noindex, nofollow">
+  <title>Grandma's Kitchen - E-Book</title>
+  <link rel="stylesheet" href="print.css">
+</head>
+<body>
+  <!-- Generated by scripts/build_ebook.py - edit the recipe data, not this file -->
+
+  <!-- COVER PAGE -->
+  <div class="cover-page">
+    <h1>Grandma Baker's Kitchen</h1>
+    <p class="subtitle">A Treasured Collection of Family Recipes</p>
+    <p class="dedication">
+      From Michigan to Florida<br>
+      Preserved with Love for Generations to Come
+    </p>
+    <p class="soli-deo-gloria">Soli Deo Gloria</p>
+  </div>
+"""
+
+BOOK_TAIL = """
+  <!-- Back Cover -->
+  <div class="cover-page" style="padding-top: 4in;">
+    <p class="dedication" style="font-size: 14pt;">
+      "She looketh well to the ways of her household,<br>
+      and eateth not the bread of idleness."
+    </p>
+    <p style="font-style: italic; margin-top: 0.5em;">— Proverbs 31:27</p>
+    <p class="soli-deo-gloria" style="margin-top: 3em;">
+      In Loving Memory of Grandma
+    </p>
+  </div>
+
+</body>
+</html>
+"""
+
+NUTRITION_ROWS = [('calories', '', 'Calories'), ('fat_g', 'g', 'Fat'), ('carbs_g', 'g', 'Carbs'),
+                  ('protein_g', 'g', 'Protein'), ('sodium_mg', 'mg', 'Sodium'),
+                  ('fiber_g', 'g', 'Fiber'), ('sugar_g', 'g', 'Sugar')]
+
+
+# =============================================================================
+# Streaming JSON
+# =============================================================================
+
+class _JsonStream:
+    """Reads JSON values one at a time from a file, keeping only a small buffer."""
+
+    def __init__(self, f: TextIO):
+        self.f = f
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        chunk = self.f.read(READ_CHUNK)
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        self.eof = not chunk
+        return bool(chunk)
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {self.peek()!r}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+                if end < len(self.buf) or self.eof:  # a number may continue in the next chunk
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+    def array(self) -> Iterator:
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect(']')
+            return
+
+
+def iter_recipes(path: Path) -> Iterator[Dict]:
+    """Recipes from {"recipes": [...]} or a bare list, one at a time."""
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = _JsonStream(f)
+        if stream.peek() == '[':
+            yield from (r for r in stream.array() if isinstance(r, dict))
+            return
+        stream.expect('{')
+        while stream.peek() != '}':
+            key = stream.value()
+            stream.expect(':')
+            if key == 'recipes':
+                yield from (r for r in stream.array() if isinstance(r, dict))
+            else:
+                stream.value()
+            if stream.peek() == ',':
+                stream.pos += 1
+
+
+# =============================================================================
+# Chapters
+# =============================================================================
+
+def chapter_title(key: str) -> str:
+    return CHAPTER_TITLES.get(key, key.replace('-', ' ').title())
+
+
+def chapter_sort_key(key: str):
+    return (CHAPTER_ORDER.index(key) if key in CHAPTER_ORDER else len(CHAPTER_ORDER), key)
+
+
+def recipe_meta(recipe: Dict) -> Dict:
+    """What the table of contents, index, appendix and variant links need."""
+    meta = {field: recipe.get(field) for field in
+            ('id', 'title', 'source_note', 'variant_of', 'canonical_id')}
+    meta['chapter'] = chapter_key(recipe.get('category'))
+    meta['scans'] = [str(s) for s in (recipe.get('image_refs') or recipe.get('source_images') or [])]
+    meta['digest'] = hashlib.sha256(dump_compact(recipe)).hexdigest()
+    return meta
+
+
+class Book:
+    """First-pass metadata for the whole corpus, grouped into chapters."""
+
+    def __init__(self, metas: List[Dict]):
+        self.metas = metas
+        self.chapters: Dict[str, List[Dict]] = defaultdict(list)
+        for meta in metas:
+            self.chapters[meta['chapter']].append(meta)
+        for key in self.chapters:
+            self.chapters[key].sort(key=title_sort_key)
+        self.order = sorted(self.chapters, key=chapter_sort_key)
+
+        # Variants listed on each recipe, in the same groups as the site
+        self.variants: Dict[str, List[Dict]] = {}
+        for members in variant_groups(metas).values():
+            for n in members:
+                self.variants[metas[n]['id']] = [metas[m] for m in members if m != n]
+
+    def chapter_hash(self, key: str) -> str:
+        digest = hashlib.sha256(f"{RENDERER_VERSION}:{key}".encode('utf-8'))
+        for meta in self.chapters[key]:
+            digest.update(meta['digest'].encode('ascii'))
+            for variant in self.variants.get(meta['id'], []):
+                digest.update(dump_compact([variant['id'], variant['title'], variant['source_note']]))
+        return digest.hexdigest()[:16]
+
+
+# =============================================================================
+# Recipe markup (print.css classes)
+# =============================================================================
+
+def render_book_recipe(recipe: Dict, variants: List[Dict]) -> str:
+    out = [f'  <!-- {escape_html(recipe.get("title")).replace("--", "- -")} -->',
+           f'  <article class="recipe" id="recipe-{escape_attr(page_name(recipe.get("id")))}">',
+           '    <header class="recipe-header">',
+           f'      <h1 class="recipe-title">{escape_html(recipe.get("title"))}</h1>']
+    if recipe.get('attribution'):
+        out.append(f'      <p class="recipe-attribution">From: {escape_html(recipe["attribution"])}</p>')
+    if recipe.get('source_note'):
+        out.append(f'      <p class="recipe-source">{escape_html(recipe["source_note"])}</p>')
+    if recipe.get('description'):
+        out.append(f'      <p class="recipe-description">{escape_html(recipe["description"])}</p>')
+    out.append('    </header>')
+
+    facts = [(label, recipe.get(field)) for label, field in
+             (('Yield', 'servings_yield'), ('Prep', 'prep_time'), ('Cook', 'cook_time'),
+              ('Total', 'total_time'), ('Temp', 'temperature')) if recipe.get(field)]
+    if facts:
+        out += ['', '    <div class="quick-facts">', '      <div class="quick-facts-row">']
+        for label, value in facts:
+            out += ['        <div class="quick-fact">',
+                    f'          <span class="quick-fact-label">{label}</span>',
+                    f'          <span class="quick-fact-value">{escape_html(value)}</span>',
+                    '        </div>']
+        out += ['      </div>', '    </div>']
+
+    ingredients = [i for i in recipe.get('ingredients') or [] if isinstance(i, dict)]
+    if ingredients:
+        out += ['', '    <section class="ingredients">', '      <h3>Ingredients</h3>',
+                '      <ul class="ingredients-list">']
+        for ing in ingredients:
+            qty = ' '.join(escape_html(ing[k]) for k in ('quantity', 'unit') if ing.get(k))
+            qty_html = f'<span class="ingredient-qty">{qty}</span> ' if qty else ''
+            prep = f' <span class="ingredient-prep">, {escape_html(ing["prep_note"])}</span>' if ing.get('prep_note') else ''
+            out.append(f'        <li>{qty_html}{escape_html(ing.get("item"))}{prep}</li>')
+        out += ['      </ul>', '    </section>']
+
+    steps = recipe.get('instructions') or []
+    if steps:
+        out += ['', '    <section class="instructions">', '      <h3>Instructions</h3>',
+                '      <ol class="instructions-list">']
+        for step in steps:
+            text = js_str((step.get('text') or '') if isinstance(step, dict) else step)
+            css = ' class="inferred"' if '[INFERRED]' in text else ''
+            out.append(f'        <li{css}>{escape_html(text.replace("[INFERRED] ", "", 1))}</li>')
+        out += ['      </ol>', '    </section>']
+
+    if recipe.get('oven_directions'):
+        out += ['', '    <section class="sub-recipe">', '      <h4>Oven Directions (Alternative)</h4>',
+                '      <ol class="instructions-list">']
+        out += [f'        <li>{escape_html((d.get("text") or "") if isinstance(d, dict) else d)}</li>'
+                for d in recipe['oven_directions']]
+        out += ['      </ol>', '    </section>']
+
+    frosting = recipe.get('frosting')
+    if isinstance(frosting, dict):
+        items = ', '.join(' '.join(escape_html(i[k]) for k in ('quantity', 'unit', 'item') if i.get(k))
+                          for i in frosting.get('ingredients') or [] if isinstance(i, dict))
+        out += ['', '    <section class="sub-recipe">', f'      <h4>{escape_html(frosting.get("name"))}</h4>',
+                f'      <p><strong>Ingredients:</strong> {items}</p>',
+                f'      <p><strong>Instructions:</strong> {escape_html(frosting.get("instructions"))}</p>',
+                '    </section>']
+
+    nutrition = recipe.get('nutrition') or {}
+    per_serving = nutrition.get('per_serving') if nutrition.get('status') != 'insufficient_data' else None
+    if per_serving:
+        rows = [(label, per_serving[key], unit) for key, unit, label in NUTRITION_ROWS
+                if per_serving.get(key) is not None]
+        if rows:
+            out += ['', '    <section class="nutrition">', '      <h4>Nutrition (per serving)</h4>',
+                    '      <div class="nutrition-grid">']
+            out += [f'        <div class="nutrition-row"><span class="nutrition-label">{label}</span>'
+                    f'<span class="nutrition-value">{escape_html(value)}{unit}</span></div>'
+                    for label, value, unit in rows]
+            out += ['      </div>', '    </section>']
+
+    if variants:
+        out += ['', '    <section class="variants">', '      <h4>Variants</h4>']
+        for variant in variants:
+            note = f' — {escape_html(variant["source_note"])}' if variant.get('source_note') else ''
+            out.append(f'      <div class="variant-item">{escape_html(variant.get("title"))}{note}</div>')
+        out.append('    </section>')
+
+    if recipe.get('notes'):
+        out += ['', '    <section class="notes">', '      <h4>Notes</h4>', '      <ul>']
+        out += [f'        <li>{escape_html(note)}</li>' for note in recipe['notes']]
+        out += ['      </ul>', '    </section>']
+
+    if recipe.get('tags'):
+        out += ['', '    <div class="recipe-tags">']
+        out += [f'      <span class="recipe-tag">{escape_html(tag)}</span>' for tag in recipe['tags']]
+        out.append('    </div>')
+
+    out += ['  </article>', '']
+    return '\n'.join(out) + '\n'
+
+
+def render_chapter(book: Book, key: str, recipes: List[Dict]) -> str:
+    order = {meta['id']: n for n, meta in enumerate(book.chapters[key])}
+    recipes.sort(key=lambda r: order.get(r.get('id'), len(order)))
+    parts = [f'\n  <!-- SECTION: {escape_html(chapter_title(key)).upper()} -->\n',
+             '  <div class="section-divider">\n',
+             f'    <div class="section-icon">{CATEGORY_ICONS.get(key, "📖")}</div>\n',
+             f'    <h2>{escape_html(chapter_title(key))}</h2>\n',
+             '  </div>\n\n']
+    parts += [render_book_recipe(r, book.variants.get(r.get('id'), [])) for r in recipes]
+    return ''.join(parts)
+
+
+# =============================================================================
+# Front and back matter
+# =============================================================================
+
+def write_toc(out: TextIO, book: Book):
+    out.write('\n  <!-- TABLE OF CONTENTS -->\n  <div class="toc">\n    <h2>Table of Contents</h2>\n')
+    for key in book.order:
+        out.write(f'\n    <div class="toc-section">\n      <h3>{escape_html(chapter_title(key))}</h3>\n'
+                  '      <ul class="toc-list">\n')
+        out.writelines(f'        <li><span>{escape_html(m["title"])}</span></li>\n' for m in book.chapters[key])
+        out.write('      </ul>\n    </div>\n')
+    out.write('  </div>\n')
+
+
+def write_index(out: TextIO, book: Book):
+    by_letter = defaultdict(list)
+    for meta in sorted(book.metas, key=title_sort_key):
+        title = str(meta.get('title') or '')
+        letter = title[:1].upper() if title[:1].isalpha() else '#'
+        by_letter[letter].append(meta)
+
+    out.write('\n  <!-- INDEX -->\n  <div class="index">\n    <h2>Recipe Index</h2>\n    <div class="index-columns">\n')
+    for letter in sorted(by_letter):
+        out.write(f'      <div class="index-letter">{escape_html(letter)}</div>\n      <ul class="index-list">\n')
+        out.writelines(f'        <li>{escape_html(m["title"])} ({escape_html(chapter_title(m["chapter"]))})</li>\n'
+                       for m in by_letter[letter])
+        out.write('      </ul>\n\n')
+    out.write('    </div>\n  </div>\n')
+
+
+def write_appendix(out: TextIO, book: Book):
+    out.write('\n  <!-- APPENDIX: Original Scans -->\n  <div class="appendix">\n'
+              '    <h2>Appendix: Original Scans</h2>\n'
+              '    <p>The following scans are the original sources from which these recipes were transcribed.</p>\n')
+    for meta in sorted(book.metas, key=title_sort_key):
+        if not meta['scans']:
+            continue
+        note = f' ({escape_html(meta["source_note"])})' if meta.get('source_note') else ''
+        out.write(f'\n    <div class="scan-entry">\n      <p><strong>{escape_html(meta["title"])}</strong></p>\n'
+                  f'      <p class="scan-caption">Source: {escape_html(", ".join(meta["scans"]))}{note}</p>\n'
+                  '    </div>\n')
+    out.write('  </div>\n')
+
+
+# =============================================================================
+# Build
+# =============================================================================
+
+def build_ebook(source: Path, book_path: Path = BOOK_FILE, cache_dir: Path = CACHE_DIR,
+                force: bool = False) -> Dict:
+    # Pass 1: metadata and hashes only
+    book = Book([recipe_meta(r) for r in iter_recipes(source)])
+    hashes = {key: book.chapter_hash(key) for key in book.order}
+    fragments = {key: cache_dir / f"{key}.{hashes[key]}.html" for key in book.order}
+    stale = [key for key in book.order if force or not fragments[key].exists()]
+
+    # Pass 2: render only the chapters that changed
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    if stale:
+        wanted = set(stale)
+        pending: Dict[str, List[Dict]] = defaultdict(list)
+        for recipe in iter_recipes(source):
+            key = chapter_key(recipe.get('category'))
+            if key in wanted:
+                pending[key].append(recipe)
+        for key in stale:
+            tmp = fragments[key].with_suffix('.tmp')
+            tmp.write_text(render_chapter(book, key, pending.pop(key, [])), encoding='utf-8')
+            os.replace(tmp, fragments[key])
+
+    keep = set(fragments.values())
+    for old in cache_dir.glob('*.html'):
+        if old not in keep:
+            old.unlink()
+
+    # Assemble: stream everything into a temp file, then swap it in
+    book_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix='.book.', suffix='.tmp', dir=book_path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as out:
+            out.write(BOOK_HEAD)
+            write_toc(out, book)
+            for key in book.order:
+                with open(fragments[key], 'r', encoding='utf-8') as fragment:
+                    shutil.copyfileobj(fragment, out)
+            write_index(out, book)
+            write_appendix(out, book)
+            out.write(BOOK_TAIL)
+        match_mode(tmp, book_path)
+        os.replace(tmp, book_path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+    return {"recipes": len(book.metas), "chapters": len(book.order), "rendered": stale,
+            "size": book_path.stat().st_size}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate ebook/book.html from recipe data')
+    parser.add_argument('--input', '-i', type=Path, default=RECIPES_JSON,
+                        help='Recipes JSON file (default: data/recipes.json)')
+    parser.add_argument('--output', '-o', type=Path, default=BOOK_FILE,
+                        help='Book HTML file (default: ebook/book.html)')
+    parser.add_argument('--cache', type=Path, default=None,
+                        help='Chapter cache directory (default: .chapters/ next to the book)')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-render every chapter')
+    args = parser.parse_args()
+
+    cache_dir = args.cache or args.output.parent / ".chapters"
+    start = time.perf_counter()
+    try:
+        result = build_ebook(args.input, args.output, cache_dir, args.force)
+    except FileNotFoundError as e:
+        print(f"Error: File not found: {e.filename}")
+        sys.exit(1)
+    except (json.JSONDecodeError, ValueError) as e:
+        print(f"Error: Invalid JSON in {args.input}: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    print("\n" + "=" * 60)
+    print("E-BOOK")
+    print("=" * 60)
+    print(f"Recipes:    {result['recipes']}")
+    print(f"Chapters:   {result['chapters']} ({len(result['rendered'])} rendered, "
+          f"{result['chapters'] - len(result['rendered'])} from cache)")
+    for key in result['rendered']:
+        print(f"  ✓ {chapter_title(key)}")
+    print(f"Output:     {args.output} ({result['size'] / 1024:.1f} KB)")
+    print(f"Time:       {elapsed * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
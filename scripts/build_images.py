@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Responsive Image Build for Other Family Recipes
+
+Writes data/images/manifest.json, one entry per scan in data/ (the names
+used in recipe image_refs), with what the site needs to show a scan
+without layout shifts or oversized downloads:
+
+    width, height   intrinsic size as displayed (EXIF rotation applied)
+    bytes, format   of the original file
+    variants        format -> [{url, width, height, bytes}], smallest
+                    first: resized copies at WIDTHS, the processed copy
+                    from process_images.py if there is one, and the
+                    original itself
+
+    placeholder     {blurhash, color}: a BlurHash (see blurhash.py) and
+                    average color to paint while the scan loads
+
+script.js and the pre-rendered pages turn an entry into srcset/sizes
+(WebP first where available), exact width/height, lazy loading and a
+blurred placeholder background.
+
+Resized copies are written to data/images/ with the source hash in the
+name, so they can be cached forever. Copies and placeholders are only
+made again for sources whose hash changed since the last run, in
+parallel across processes. Without Pillow neither is made, but the
+manifest still gets dimensions and sizes read from the file headers.
+
+Usage:
+    python build_images.py                   # Update data/images/
+    python build_images.py --force           # Regenerate copies and placeholders
+    python build_images.py --workers 4
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import blurhash
+from build_site_data import RECIPES_JSON, load_recipes
+from build_utils import dump_compact, write_atomic
+from image_utils import (DATA_DIR, IMAGES_DIR, IMAGES_MANIFEST, PILLOW_AVAILABLE, PROCESSED_FOLDER,
+                         file_hash, find_sources, image_size, load_image_manifest, open_image, site_url, slug)
+
+if PILLOW_AVAILABLE:
+    from PIL import Image, features
+
+MANIFEST_VERSION = 1
+
+# Widths of the resized copies (only those smaller than the source are made)
+WIDTHS = [320, 640, 1280]
+JPEG_QUALITY = 82
+WEBP_QUALITY = 75
+
+# Longest side of the thumbnail the BlurHash is computed from
+PLACEHOLDER_SIZE = 32
+
+# Changing any of these regenerates every copy
+SETTINGS = {"widths": WIDTHS, "jpeg_quality": JPEG_QUALITY, "webp_quality": WEBP_QUALITY}
+
+FORMAT_SUFFIX = {"jpeg": ".jpg", "webp": ".webp"}
+
+
+def output_formats() -> List[str]:
+    if not PILLOW_AVAILABLE:
+        return []
+    return ["jpeg", "webp"] if features.check('webp') else ["jpeg"]
+
+
+def make_placeholder(img) -> Dict[str, str]:
+    """BlurHash and average color, from a PLACEHOLDER_SIZE thumbnail."""
+    thumb = img.copy()
+    thumb.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.Resampling.BOX)
+    hash = blurhash.encode(list(thumb.getdata()), thumb.width, thumb.height)
+    return {"blurhash": hash, "color": blurhash.average_color(hash)}
+
+
+def process_source(source: str, out_dir: str, stem: str, formats: List[str],
+                   placeholder: bool) -> Optional[Dict]:
+    """
+    Resized copies in the given formats and, if asked, the placeholder of
+    one source (runs in a worker process). None if it cannot be decoded.
+    """
+    try:
+        img = open_image(Path(source))
+    except OSError:
+        return None
+    result = {"placeholder": make_placeholder(img) if placeholder else None}
+    if not formats:
+        return result
+
+    copies = {fmt: [] for fmt in formats}
+    for width in WIDTHS:
+        if width >= img.width:
+            break
+        height = max(1, round(img.height * width / img.width))
+        resized = img.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt in formats:
+            path = Path(out_dir) / f"{stem}-{width}{FORMAT_SUFFIX[fmt]}"
+            if fmt == "jpeg":
+                resized.save(path, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+            else:
+                resized.save(path, 'WEBP', quality=WEBP_QUALITY, method=6)
+            copies[fmt].append({"file": path.name, "width": width, "height": height,
+                                "bytes": path.stat().st_size})
+    result["copies"] = copies
+    return result
+
+
+def describe(path: Path, digest: str) -> Dict:
+    """Manifest entry for a source, listing the original and its processed copy."""
+    width, height, fmt = image_size(path)
+    size = path.stat().st_size
+    entry = {"source": digest, "width": width, "height": height, "bytes": size, "format": fmt,
+             "variants": {fmt: [{"url": site_url(path), "width": width, "height": height, "bytes": size}]}}
+
+    processed = path.parent / PROCESSED_FOLDER / path.name
+    if processed.is_file():
+        try:
+            p_width, p_height, p_fmt = image_size(processed)
+        except ValueError:
+            return entry
+        if p_width < width:
+            entry["variants"].setdefault(p_fmt, []).append(
+                {"url": site_url(processed), "width": p_width, "height": p_height,
+                 "bytes": processed.stat().st_size})
+    return entry
+
+
+def add_copies(entry: Dict, copies: Dict[str, List[Dict]], out_dir: Path):
+    for fmt, items in copies.items():
+        listed = entry["variants"].setdefault(fmt, [])
+        listed.extend({"url": site_url(out_dir / item["file"]), "width": item["width"],
+                       "height": item["height"], "bytes": item["bytes"]} for item in items)
+    for items in entry["variants"].values():
+        items.sort(key=lambda item: item["width"])
+    entry["copies"] = copies
+
+
+def cached_copies(previous: Optional[Dict], out_dir: Path) -> Optional[Dict[str, List[Dict]]]:
+    """The previous run's copies of an unchanged source, if they are all still there."""
+    if not previous or "copies" not in previous:
+        return None
+    copies = previous["copies"]
+    if all((out_dir / item["file"]).exists() for items in copies.values() for item in items):
+        return copies
+    return None
+
+
+def build_images(data_dir: Path = DATA_DIR, out_dir: Path = IMAGES_DIR, workers: Optional[int] = None,
+                 force: bool = False) -> Dict:
+    manifest_path = out_dir / IMAGES_MANIFEST
+    previous = {} if force else load_image_manifest(manifest_path)
+    same_settings = previous.get("settings") == SETTINGS
+    old_images = previous.get("images", {})
+    formats = output_formats()
+
+    images, errors, jobs = {}, [], []
+    for path in find_sources(data_dir):
+        digest = file_hash(path)
+        try:
+            entry = describe(path, digest)
+        except (OSError, ValueError) as e:
+            errors.append((path.name, str(e)))
+            continue
+        images[path.name] = entry
+
+        # Everything derived from an unchanged source is reused
+        old = old_images.get(path.name)
+        old = old if old and old.get("source") == digest else None
+        copies = cached_copies(old, out_dir) if same_settings else None
+        if copies is not None or not formats:
+            add_copies(entry, copies or {}, out_dir)
+        if old and old.get("placeholder"):
+            entry["placeholder"] = old["placeholder"]
+
+        need_copies = formats if "copies" not in entry else []
+        need_placeholder = PILLOW_AVAILABLE and "placeholder" not in entry
+        if need_copies or need_placeholder:
+            jobs.append((path, f"{slug(path.name)}.{digest[:8]}", need_copies, need_placeholder))
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if jobs:
+        paths, stems, job_formats, placeholders = zip(*jobs)
+        args = ([str(path) for path in paths], [str(out_dir)] * len(jobs), stems, job_formats, placeholders)
+        if len(jobs) > 1 and workers != 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(process_source, *args))
+        else:
+            results = list(map(process_source, *args))
+        for path, result in zip(paths, results):
+            if result is None:
+                errors.append((path.name, "Pillow could not decode it; no resized copies or placeholder"))
+                continue
+            if "copies" in result:
+                add_copies(images[path.name], result["copies"], out_dir)
+            if result["placeholder"]:
+                images[path.name]["placeholder"] = result["placeholder"]
+
+    keep = {item["file"] for entry in images.values() for items in entry.get("copies", {}).values()
+            for item in items}
+    removed = 0
+    for stale in out_dir.iterdir():
+        if stale.is_file() and stale.suffix in FORMAT_SUFFIX.values() and stale.name not in keep:
+            stale.unlink()
+            removed += 1
+
+    write_atomic(manifest_path, dump_compact({"version": MANIFEST_VERSION, "settings": SETTINGS,
+                                              "images": images}))
+    return {"images": images, "processed": len(jobs), "removed": removed,
+            "errors": errors, "formats": formats}
+
+
+def missing_refs(recipes_path: Path, images: Dict) -> List[str]:
+    """image_refs that name no scan in the manifest (empty if there is no recipes file)."""
+    try:
+        recipes = load_recipes(recipes_path)
+    except (FileNotFoundError, ValueError):
+        return []
+    refs = {ref for recipe in recipes if isinstance(recipe, dict)
+            for ref in recipe.get('image_refs') or [] if isinstance(ref, str)}
+    return sorted(refs - set(images))
+
+
+def print_summary(result: Dict, missing: List[str], out_dir: Path, elapsed: float):
+    images = result["images"]
+    original = sum(entry["bytes"] for entry in images.values())
+    smallest = sum(min(item["bytes"] for items in entry["variants"].values() for item in items)
+                   for entry in images.values())
+
+    print("\n" + "=" * 60)
+    print("RESPONSIVE IMAGES")
+    print("=" * 60)
+    print(f"Images:     {len(images)}")
+    if result["formats"]:
+        print(f"Formats:    {', '.join(result['formats'])} at {', '.join(map(str, WIDTHS))} px")
+        print(f"Processed:  {result['processed']} ({len(images) - result['processed']} unchanged)")
+    else:
+        print("Formats:    originals only (Pillow not installed: pip install Pillow)")
+    with_placeholder = sum(1 for entry in images.values() if entry.get("placeholder"))
+    print(f"Previews:   {with_placeholder} of {len(images)} (BlurHash placeholders)")
+    if result["removed"]:
+        print(f"Removed:    {result['removed']} stale copies")
+    if original:
+        print(f"Originals:  {original / 1024 / 1024:.1f} MB; smallest copies {smallest / 1024 / 1024:.1f} MB "
+              f"({100 * smallest / original:.0f}%)")
+    for name, error in result["errors"]:
+        print(f"  Unreadable: {name}: {error}")
+    if missing:
+        print(f"Missing:    {len(missing)} image_refs with no image: {', '.join(missing[:5])}")
+    print(f"Output:     {out_dir / IMAGES_MANIFEST}")
+    print(f"Time:       {elapsed * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build resized scan copies, placeholders and the image manifest')
+    parser.add_argument('--data', type=Path, default=DATA_DIR,
+                        help='Directory of source scans (default: data/)')
+    parser.add_argument('--output', '-o', type=Path, default=IMAGES_DIR,
+                        help='Output directory (default: data/images/)')
+    parser.add_argument('--input', '-i', type=Path, default=RECIPES_JSON,
+                        help='Recipes JSON, to report image_refs with no image (default: data/recipes.json)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f'Worker processes (default: {os.cpu_count()})')
+    parser.add_argument('--force', action='store_true',
+                        help='Regenerate every copy and placeholder')
+    args = parser.parse_args()
+
+    if not args.data.is_dir():
+        print(f"Error: Not a directory: {args.data}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    result = build_images(args.data, args.output, args.workers, args.force)
+    elapsed = time.perf_counter() - start
+    print_summary(result, missing_refs(args.input, result["images"]), args.output, elapsed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Site Data Build for Other Family Recipes
+
+Splits data/recipes.json into what the static site actually needs up
+front and what it can fetch on demand, all under data/build/:
+
+    manifest.json                 logical name -> current hashed file (no-cache)
+    summary.<hash>.json           one compact record per recipe for the grid
+    detail/<shard>.<hash>.json    full recipes, grouped by category in
+                                  shards of at most --shard-size recipes,
+                                  with the kitchen tips related to them
+    search.<hash>.json            inverted index over the summary records
+    spelling.<hash>.json          typo-tolerant dictionary for tip search
+    facets.<hash>.json            category/tag/collection counts and variant groups
+
+The home page loads the manifest, the summary and the search index;
+renderRecipeDetail fetches the one shard holding the recipe. Tip links
+are worked out here (see tip_links.py), so the recipe page does not need
+data/tips_master.json. Every file but the manifest has
+a content-hashed name, so unchanged shards keep their URL (and browser
+cache) across builds.
+
+The build is a list of stages; each writes its files through BuildOutput
+and may add entries to the manifest.
+
+Usage:
+    python build_site_data.py                      # Build into data/build/
+    python build_site_data.py --input all/recipes_master.json
+    python build_site_data.py --tips path/to/tips_master.json
+    python build_site_data.py --shard-size 25 --keep-stale
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from collections import Counter, OrderedDict, defaultdict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from build_utils import BUILD_DIR, BuildOutput, search_tokens
+from quantities import parse_minutes
+from spell_dictionary import SpellDictionary
+from tip_links import TipLinker
+
+RECIPES_JSON = Path(__file__).parent.parent / "data" / "recipes.json"
+TIPS_JSON = Path(__file__).parent.parent / "data" / "tips_master.json"
+
+# Recipes per detail shard
+SHARD_SIZE = 40
+
+# Summary fields copied as-is when present
+SUMMARY_FIELDS = ['id', 'title', 'category', 'tags', 'description', 'attribution',
+                  'servings_yield', 'collection', 'variant_of', 'canonical_id']
+
+# Extra fields kept for recipes in a variant group (used by the variants dropdown)
+VARIANT_FIELDS = ['source_note', 'variant_notes']
+
+
+class BuildContext:
+    """Recipes plus the output all stages write into."""
+
+    def __init__(self, recipes: List[Dict], output: BuildOutput, shard_size: int = SHARD_SIZE,
+                 tips: Optional[List[Dict]] = None):
+        self.recipes = recipes
+        self.output = output
+        self.shard_size = shard_size
+        self.tips = tips        # None when there is no tips file
+        self.manifest = {}      # extra manifest entries
+        self.shard_of = {}      # recipe id -> logical shard name
+        self.tip_links = {}     # recipe id -> related tip ids
+        self.timings = OrderedDict()
+
+
+# =============================================================================
+# Stages
+# =============================================================================
+
+STAGES: "OrderedDict[str, Callable[[BuildContext], None]]" = OrderedDict()
+
+
+def stage(name: str):
+    """Register a build stage. Stages run in registration order."""
+    def register(func):
+        STAGES[name] = func
+        return func
+    return register
+
+
+def shard_key(category: str) -> str:
+    return re.sub(r'[^a-z0-9-]+', '-', (category or 'uncategorized').lower()).strip('-') or 'uncategorized'
+
+
+@stage('tips')
+def link_tips(ctx: BuildContext):
+    """Related tips per recipe; shipped inside the detail shards."""
+    if ctx.tips is None:
+        return
+    ctx.tip_links = TipLinker(ctx.tips).link_all(ctx.recipes)
+    ctx.manifest['tips_linked'] = True
+
+
+@stage('detail')
+def build_detail_shards(ctx: BuildContext):
+    """
+    Full recipes grouped by category, chunked into shards. With tips, each
+    shard also carries related_tips (recipe id -> tip ids) and the bodies
+    of just those tips.
+    """
+    tips_by_id = {tip.get('id'): tip for tip in ctx.tips or [] if isinstance(tip, dict)}
+    by_category = defaultdict(list)
+    for recipe in ctx.recipes:
+        by_category[shard_key(recipe.get('category'))].append(recipe)
+
+    for category in sorted(by_category):
+        group = sorted(by_category[category], key=lambda r: str(r.get('id', '')))
+        for n in range(0, len(group), ctx.shard_size):
+            chunk = group[n:n + ctx.shard_size]
+            name = f"detail/{category}-{n // ctx.shard_size}"
+            shard = {"recipes": chunk}
+            if ctx.tips is not None:
+                related = {r.get('id'): ctx.tip_links.get(r.get('id'), []) for r in chunk}
+                shard["related_tips"] = related
+                shard["tips"] = {tip_id: tips_by_id[tip_id]
+                                 for tip_ids in related.values() for tip_id in tip_ids}
+            ctx.output.write_json(name, shard)
+            for recipe in chunk:
+                ctx.shard_of[recipe.get('id')] = name
+
+
+def thumbnail(recipe: Dict):
+    refs = recipe.get('image_refs')
+    if isinstance(refs, list) and refs and isinstance(refs[0], str):
+        return refs[0]
+    return None
+
+
+@stage('summary')
+def build_summary(ctx: BuildContext):
+    """Compact grid records with the shard each recipe's details live in."""
+    in_group = set()
+    for recipe in ctx.recipes:
+        for field in ('variant_of', 'canonical_id'):
+            if recipe.get(field):
+                in_group.add(recipe.get('id'))
+                in_group.add(recipe.get(field))
+
+    shards = sorted(set(ctx.shard_of.values()))
+    shard_index = {name: i for i, name in enumerate(shards)}
+
+    records = []
+    for recipe in ctx.recipes:
+        record = {field: recipe[field] for field in SUMMARY_FIELDS if recipe.get(field)}
+        if recipe.get('id') in in_group:
+            record.update({field: recipe[field] for field in VARIANT_FIELDS if recipe.get(field)})
+        time_info = recipe.get('total_time') or recipe.get('cook_time')
+        if time_info:
+            record['time'] = time_info
+        thumb = thumbnail(recipe)
+        if thumb:
+            record['thumbnail'] = thumb
+        if recipe.get('id') in ctx.shard_of:
+            record['shard'] = shard_index[ctx.shard_of[recipe.get('id')]]
+        records.append(record)
+
+    ctx.output.write_json('summary', {
+        "version": 1,
+        "count": len(records),
+        "shards": [ctx.output.files[name] for name in shards],
+        "recipes": records,
+    })
+
+
+def searchable_text(recipe: Dict) -> Iterable[str]:
+    for field in ('title', 'description', 'attribution'):
+        if recipe.get(field):
+            yield str(recipe[field])
+    for tag in recipe.get('tags') or []:
+        yield str(tag)
+    for ingredient in recipe.get('ingredients') or []:
+        if isinstance(ingredient, dict) and ingredient.get('item'):
+            yield str(ingredient['item'])
+
+
+def delta_encode(ordinals: List[int]) -> List[int]:
+    """[3, 7, 8, 20] -> [3, 4, 1, 12]; keeps long postings lists short in JSON."""
+    return [b - a for a, b in zip([0] + ordinals, ordinals)]
+
+
+def title_sort_key(recipe: Dict):
+    title = str(recipe.get('title') or '')
+    return search_tokens(title), title.casefold(), str(recipe.get('id', ''))
+
+
+@stage('search')
+def build_search_index(ctx: BuildContext):
+    """
+    Token -> recipe ordinals (positions in summary.recipes), with sorted
+    terms the client scans for every term containing a query word, plus
+    all ordinals pre-sorted by title.
+    """
+    postings = defaultdict(set)
+    for ordinal, recipe in enumerate(ctx.recipes):
+        for text in searchable_text(recipe):
+            for token in search_tokens(text):
+                postings[token].add(ordinal)
+
+    terms = sorted(postings)
+    title_order = sorted(range(len(ctx.recipes)), key=lambda i: title_sort_key(ctx.recipes[i]))
+
+    ctx.output.write_json('search', {
+        "version": 1,
+        "count": len(ctx.recipes),
+        "terms": terms,
+        "postings": [delta_encode(sorted(postings[term])) for term in terms],
+        "title_order": title_order,
+    })
+
+
+TIME_FIELDS = {'prep_minutes': 'prep_time', 'cook_minutes': 'cook_time', 'total_minutes': 'total_time'}
+
+
+def variant_groups(recipes: List[Dict]) -> Dict[str, List[int]]:
+    """
+    Canonical ID -> ordinals of the recipes linked to it through variant_of
+    or canonical_id (directly or via a sibling), canonical recipe first.
+    """
+    ordinal = {r.get('id'): n for n, r in enumerate(recipes) if r.get('id')}
+    parent = list(range(len(recipes)))
+
+    def root(n):
+        while parent[n] != n:
+            parent[n] = parent[parent[n]]
+            n = parent[n]
+        return n
+
+    targets = set()
+    for n, recipe in enumerate(recipes):
+        for field in ('variant_of', 'canonical_id'):
+            target = recipe.get(field)
+            if target and target in ordinal and target != recipe.get('id'):
+                targets.add(target)
+                parent[root(n)] = root(ordinal[target])
+
+    members = defaultdict(list)
+    for n in range(len(recipes)):
+        members[root(n)].append(n)
+
+    groups = {}
+    for group in members.values():
+        if len(group) < 2:
+            continue
+        ids = [recipes[n].get('id') for n in group]
+        canonical = next((i for i in ids if i in targets and not recipes[ordinal[i]].get('variant_of')),
+                         next(i for i in ids if i in targets))
+        groups[canonical] = sorted(group, key=lambda n: (recipes[n].get('id') != canonical, str(recipes[n].get('id'))))
+    return groups
+
+
+def group_time_ranges(recipes: List[Dict], members: List[int]) -> Dict[str, List[float]]:
+    """prep/cook/total minutes as [shortest, longest] across a variant group."""
+    times = {}
+    for key, field in TIME_FIELDS.items():
+        ranges = [r for r in (parse_minutes(recipes[n].get(field)) for n in members) if r]
+        if ranges:
+            times[key] = [min(r[0] for r in ranges), max(r[1] for r in ranges)]
+    return times
+
+
+@stage('facets')
+def build_facets(ctx: BuildContext):
+    """Filter counts and variant groups, so the site never loops over all recipes for them."""
+    categories, tags, collections = Counter(), Counter(), Counter()
+    for recipe in ctx.recipes:
+        if recipe.get('category'):
+            categories[recipe['category']] += 1
+        for tag in set(recipe.get('tags') or []):
+            tags[tag] += 1
+        collections[recipe.get('collection') or ''] += 1
+
+    groups = {}
+    group_of = {}
+    for canonical, members in sorted(variant_groups(ctx.recipes).items()):
+        groups[canonical] = {"members": members, **group_time_ranges(ctx.recipes, members)}
+        for n in members:
+            group_of[ctx.recipes[n].get('id')] = canonical
+
+    ctx.output.write_json('facets', {
+        "version": 1,
+        "count": len(ctx.recipes),
+        "categories": dict(sorted(categories.items())),
+        "tags": dict(sorted(tags.items())),
+        "collections": dict(sorted(collections.items())),
+        "variant_groups": groups,
+        "group_of": group_of,
+    })
+
+
+TIP_TEXT_FIELDS = ['title', 'content']
+TIP_LIST_FIELDS = ['search_terms', 'related_tags', 'related_ingredients']
+
+
+@stage('spelling')
+def build_spelling_dictionary(ctx: BuildContext):
+    """Symmetric-delete dictionary over tip and recipe words, for searchTips."""
+    if ctx.tips is None:
+        return
+    spell = SpellDictionary()
+    for tip in ctx.tips:
+        if not isinstance(tip, dict):
+            continue
+        for field in TIP_TEXT_FIELDS:
+            spell.add_text(tip.get(field) or '')
+        for field in TIP_LIST_FIELDS:
+            for value in tip.get(field) or []:
+                spell.add_text(value)
+    for recipe in ctx.recipes:
+        for text in searchable_text(recipe):
+            spell.add_text(text)
+    ctx.output.write_json('spelling', spell.to_json())
+
+
+# =============================================================================
+# Build
+# =============================================================================
+
+def load_recipes(path: Path) -> List[Dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('recipes', []) if isinstance(data, dict) else data
+
+
+def load_tips(path: Path) -> Optional[List[Dict]]:
+    """Tips from tips_master.json, or None if there is no such file."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    return data.get('tips', []) if isinstance(data, dict) else data
+
+
+def run_build(recipes: List[Dict], out_dir: Path = BUILD_DIR, shard_size: int = SHARD_SIZE,
+              clean: bool = True, tips: Optional[List[Dict]] = None) -> BuildContext:
+    ctx = BuildContext(recipes, BuildOutput(out_dir), shard_size, tips)
+    for name, func in STAGES.items():
+        start = time.perf_counter()
+        func(ctx)
+        ctx.timings[name] = time.perf_counter() - start
+    ctx.output.finish(ctx.manifest, clean=clean)
+    return ctx
+
+
+def print_summary(ctx: BuildContext, source_size: int):
+    out = ctx.output
+    print("\n" + "=" * 60)
+    print("SITE DATA BUILD")
+    print("=" * 60)
+    print(f"Recipes:        {len(ctx.recipes)}")
+    print(f"Output:         {out.root}")
+    print(f"Files:          {len(out.files)} ({out.written} written, {out.reused} unchanged)")
+    if ctx.tips is None:
+        print("Tips:           none (no tips file; recipe pages load tips_master.json)")
+    else:
+        links = sum(len(ids) for ids in ctx.tip_links.values())
+        print(f"Tips:           {len(ctx.tips)} ({len(ctx.tip_links)} recipes with tips, {links} links)")
+
+    shards = [name for name in out.files if name.startswith('detail/')]
+    if shards:
+        sizes = [out.sizes[name] for name in shards]
+        print(f"Detail shards:  {len(shards)} (largest {max(sizes) / 1024:.1f} KB)")
+    for name in out.files:
+        if not name.startswith('detail/'):
+            print(f"  {out.files[name]:<40} {out.sizes[name] / 1024:>8.1f} KB")
+    if source_size:
+        print(f"Source:         {source_size / 1024:.1f} KB "
+              f"(summary is {100 * out.sizes.get('summary', 0) / source_size:.0f}% of it)")
+
+    print("\nStage timings:")
+    for name, seconds in ctx.timings.items():
+        print(f"  {name:<14} {seconds * 1000:>8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build sharded, content-hashed site data')
+    parser.add_argument('--input', '-i', type=Path, default=RECIPES_JSON,
+                        help='Recipes JSON file (default: data/recipes.json)')
+    parser.add_argument('--tips', type=Path, default=TIPS_JSON,
+                        help='Tips JSON file (default: data/tips_master.json)')
+    parser.add_argument('--output', '-o', type=Path, default=BUILD_DIR,
+                        help='Build directory (default: data/build)')
+    parser.add_argument('--shard-size', type=int, default=SHARD_SIZE,
+                        help=f'Recipes per detail shard (default: {SHARD_SIZE})')
+    parser.add_argument('--keep-stale', action='store_true',
+                        help='Keep files from earlier builds')
+    args = parser.parse_args()
+
+    if args.shard_size < 1:
+        parser.error('--shard-size must be at least 1')
+
+    try:
+        recipes = load_recipes(args.input)
+        tips = load_tips(args.tips)
+    except FileNotFoundError as e:
+        print(f"Error: File not found: {e.filename}")
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON: {e}")
+        sys.exit(1)
+
+    ctx = run_build(recipes, args.output, args.shard_size, clean=not args.keep_stale, tips=tips)
+    print_summary(ctx, args.input.stat().st_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Recipe Grid Sprite Sheets for Other Family Recipes
+
+Packs a small thumbnail of every recipe's first scan into a few JPEG
+sprite sheets, one per category (split into numbered sheets when a
+category outgrows MAX_SHEET_HEIGHT), so the recipe grid can show an
+image on hundreds of cards with a handful of requests.
+
+Thumbnails are fitted into a THUMB_BOX x THUMB_BOX box (CSS pixels) and
+drawn at DENSITY x resolution for sharp high-DPI screens. The layout is
+a deterministic shelf packing: thumbnails sorted by height (then width,
+then name) fill rows left to right, up to SHEET_WIDTH, and each row
+starts below the tallest thumbnail of the one before. The same inputs
+always give the same sheets, and a scan used by several recipes in a
+category is drawn once.
+
+Output, under data/images/sprites/:
+
+    <category>-<n>.<hash>.jpg   sprite sheets, named by a hash of their
+                                layout and source scans (unchanged
+                                sheets are not redrawn)
+    index.json                  {version, density, sheets, sizes,
+                                recipes: {id: [sheet, x, y, w, h]}}
+                                with sizes and positions in CSS pixels
+
+Usage:
+    python build_sprites.py                 # Update the sprite sheets
+    python build_sprites.py --dry-run       # Show the layout only (no Pillow needed)
+    python build_sprites.py --input all/recipes_master.json --workers 4
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from build_site_data import RECIPES_JSON, load_recipes, shard_key, thumbnail
+from build_utils import content_hash, dump_compact, write_atomic
+from image_utils import DATA_DIR, IMAGES_DIR, PILLOW_AVAILABLE, file_hash, image_size, open_image, site_url
+
+if PILLOW_AVAILABLE:
+    from PIL import Image
+
+SPRITES_DIR = IMAGES_DIR / "sprites"
+INDEX_NAME = "index.json"
+INDEX_VERSION = 1
+
+THUMB_BOX = 120          # Largest thumbnail side, CSS pixels
+DENSITY = 2              # Sheet pixels per CSS pixel
+PADDING = 2              # CSS pixels between thumbnails
+SHEET_WIDTH = 1024       # CSS pixels
+MAX_SHEET_HEIGHT = 1024  # CSS pixels; a fuller category continues on another sheet
+JPEG_QUALITY = 80
+BACKGROUND = (255, 255, 255)
+
+# Changing any of these redraws every sheet
+SETTINGS = {"box": THUMB_BOX, "density": DENSITY, "padding": PADDING, "width": SHEET_WIDTH,
+            "height": MAX_SHEET_HEIGHT, "quality": JPEG_QUALITY}
+
+
+def fit(width: int, height: int, box: int = THUMB_BOX) -> Tuple[int, int]:
+    """Thumbnail size in CSS pixels: the image scaled down to fit in the box."""
+    scale = min(box / width, box / height, 1)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def shelf_pack(items: List[Tuple[str, int, int]], sheet_width: int = SHEET_WIDTH,
+               max_height: int = MAX_SHEET_HEIGHT, padding: int = PADDING) -> List[Dict]:
+    """
+    Place (name, width, height) items on sheets. Returns the sheets as
+    {width, height, places: {name: (x, y, w, h)}}, in CSS pixels.
+    """
+    order = sorted(items, key=lambda item: (-item[2], -item[1], item[0]))
+    sheets = []
+    sheet = None
+    x = y = shelf = 0
+    for name, width, height in order:
+        if sheet is not None and x + width > sheet_width:
+            x, y, shelf = 0, y + shelf + padding, 0
+        if sheet is None or y + height > max_height:
+            sheet = {"width": 0, "height": 0, "places": {}}
+            sheets.append(sheet)
+            x = y = shelf = 0
+        sheet["places"][name] = (x, y, width, height)
+        sheet["width"] = max(sheet["width"], x + width)
+        sheet["height"] = max(sheet["height"], y + height)
+        shelf = max(shelf, height)
+        x += width + padding
+    return sheets
+
+
+def plan_sheets(recipes: List[Dict], data_dir: Path) -> Tuple[List[Dict], Dict[str, Tuple[str, str]], List[str]]:
+    """
+    The sheets to draw, recipe id -> (sheet key, scan name), and the scans
+    that could not be read.
+    """
+    by_category: Dict[str, Dict[str, None]] = defaultdict(dict)
+    recipe_scan = {}
+    for recipe in recipes:
+        ref = thumbnail(recipe) if isinstance(recipe, dict) else None
+        if ref and recipe.get('id'):
+            category = shard_key(recipe.get('category'))
+            by_category[category][ref] = None
+            recipe_scan[str(recipe['id'])] = (category, ref)
+
+    sizes, digests, unreadable = {}, {}, []
+    for ref in sorted({ref for refs in by_category.values() for ref in refs}):
+        path = data_dir / ref
+        try:
+            width, height, _ = image_size(path)
+            digests[ref] = file_hash(path)
+        except (OSError, ValueError):
+            unreadable.append(ref)
+            continue
+        sizes[ref] = fit(width, height)
+
+    sheets, sheet_of = [], {}
+    for category in sorted(by_category):
+        items = [(ref, *sizes[ref]) for ref in by_category[category] if ref in sizes]
+        for n, sheet in enumerate(shelf_pack(items)):
+            sheet["key"] = f"{category}-{n}"
+            sheet["hash"] = content_hash(dump_compact({
+                "settings": SETTINGS,
+                "places": sheet["places"],
+                "sources": {ref: digests[ref] for ref in sheet["places"]},
+            }))
+            sheets.append(sheet)
+            for ref in sheet["places"]:
+                sheet_of[(category, ref)] = sheet["key"]
+
+    recipe_sheet = {rid: (sheet_of[scan], scan[1]) for rid, scan in recipe_scan.items() if scan in sheet_of}
+    return sheets, recipe_sheet, unreadable
+
+
+def draw_sheet(data_dir: str, path: str, width: int, height: int,
+               places: Dict[str, Tuple[int, int, int, int]]) -> int:
+    """Draw and write one sheet (runs in a worker process); returns its byte size."""
+    sheet = Image.new('RGB', (width * DENSITY, height * DENSITY), BACKGROUND)
+    for ref, (x, y, w, h) in places.items():
+        try:
+            img = open_image(Path(data_dir) / ref)
+        except OSError:
+            continue
+        thumb = img.resize((w * DENSITY, h * DENSITY), Image.Resampling.LANCZOS)
+        sheet.paste(thumb, (x * DENSITY, y * DENSITY))
+    out = Path(path)
+    tmp = out.with_name(f".{out.name}.tmp")
+    sheet.save(tmp, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    os.replace(tmp, out)
+    return out.stat().st_size
+
+
+def build_sprites(recipes: List[Dict], data_dir: Path = DATA_DIR, out_dir: Path = SPRITES_DIR,
+                  workers: Optional[int] = None, dry_run: bool = False) -> Dict:
+    sheets, recipe_sheet, unreadable = plan_sheets(recipes, data_dir)
+    for sheet in sheets:
+        sheet["file"] = f"{sheet['key']}.{sheet['hash']}.jpg"
+
+    result = {"sheets": sheets, "recipes": len(recipe_sheet), "unreadable": unreadable,
+              "drawn": 0, "removed": 0}
+    if dry_run:
+        return result
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    todo = [sheet for sheet in sheets if not (out_dir / sheet["file"]).exists()]
+    args = ([str(data_dir)] * len(todo), [str(out_dir / sheet["file"]) for sheet in todo],
+            [sheet["width"] for sheet in todo], [sheet["height"] for sheet in todo],
+            [sheet["places"] for sheet in todo])
+    if len(todo) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(draw_sheet, *args))
+    else:
+        list(map(draw_sheet, *args))
+    result["drawn"] = len(todo)
+
+    files = {sheet["file"] for sheet in sheets}
+    for stale in out_dir.glob('*.jpg'):
+        if stale.name not in files:
+            stale.unlink()
+            result["removed"] += 1
+
+    number = {sheet["key"]: n for n, sheet in enumerate(sheets)}
+    index = {
+        "version": INDEX_VERSION,
+        "density": DENSITY,
+        "sheets": [site_url(out_dir / sheet["file"]) for sheet in sheets],
+        "sizes": [[sheet["width"], sheet["height"]] for sheet in sheets],
+        "recipes": {rid: [number[key], *sheets[number[key]]["places"][ref]]
+                    for rid, (key, ref) in sorted(recipe_sheet.items())},
+    }
+    write_atomic(out_dir / INDEX_NAME, dump_compact(index))
+    return result
+
+
+def print_summary(result: Dict, out_dir: Path, dry_run: bool, elapsed: float):
+    sheets = result["sheets"]
+    print("\n" + "=" * 60)
+    print("SPRITE SHEETS" + (" (dry run)" if dry_run else ""))
+    print("=" * 60)
+    print(f"Recipes:    {result['recipes']} with a thumbnail")
+    print(f"Sheets:     {len(sheets)} ({sum(len(s['places']) for s in sheets)} thumbnails)")
+    if not dry_run:
+        print(f"Drawn:      {result['drawn']} ({len(sheets) - result['drawn']} unchanged)")
+        if result["removed"]:
+            print(f"Removed:    {result['removed']} stale sheets")
+    for sheet in sheets:
+        print(f"  {sheet['file']:<40} {len(sheet['places']):>4} thumbs  "
+              f"{sheet['width'] * DENSITY}x{sheet['height'] * DENSITY}")
+    if result["unreadable"]:
+        print(f"Unreadable: {len(result['unreadable'])}: {', '.join(result['unreadable'][:5])}")
+    if not dry_run:
+        print(f"Output:     {out_dir / INDEX_NAME}")
+    print(f"Time:       {elapsed * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pack recipe thumbnails into per-category sprite sheets')
+    parser.add_argument('--input', '-i', type=Path, default=RECIPES_JSON,
+                        help='Recipes JSON file (default: data/recipes.json)')
+    parser.add_argument('--data', type=Path, default=DATA_DIR,
+                        help='Directory of source scans (default: data/)')
+    parser.add_argument('--output', '-o', type=Path, default=SPRITES_DIR,
+                        help='Output directory (default: data/images/sprites/)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f'Worker processes (default: {os.cpu_count()})')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Compute and show the layout without drawing')
+    args = parser.parse_args()
+
+    if not args.dry_run and not PILLOW_AVAILABLE:
+        print("ERROR: Pillow not installed. Run: pip install Pillow")
+        sys.exit(1)
+
+    try:
+        recipes = load_recipes(args.input)
+    except FileNotFoundError as e:
+        print(f"Error: File not found: {e.filename}")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    result = build_sprites(recipes, args.data, args.output, args.workers, args.dry_run)
+    print_summary(result, args.output, args.dry_run, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main()
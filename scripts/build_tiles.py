@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Deep-Zoom Tiles for Other Family Recipes
+
+Cuts every scan in data/ into a Deep Zoom (DZI) tile pyramid, so a scan
+viewer can zoom into small magazine print by fetching only the 256px
+tiles in view instead of the whole multi-megapixel image.
+
+Level L of a pyramid is the scan scaled to ceil(size / 2^(max - L)),
+from a single pixel at level 0 up to full size at the top level
+(max = ceil(log2(longest side))). Each level is cut into TILE_SIZE
+tiles, with OVERLAP pixels shared between neighbours so tiles join
+without seams. The layout is standard DZI, readable by any Deep Zoom
+viewer (OpenSeadragon and friends).
+
+Output, under data/images/tiles/:
+
+    <scan>.<hash>.dzi             DZI descriptor (size, tile size, overlap)
+    <scan>.<hash>_files/L/C_R.jpg tile at column C, row R of level L
+    index.json                    {version, tile_size, overlap, format,
+                                  images: {ref: {dzi, width, height, levels}}}
+
+Pyramids are named by source hash: only new or changed scans are tiled,
+in parallel across processes, and pyramids of deleted or replaced scans
+are removed.
+
+Usage:
+    python build_tiles.py                   # Tile new and changed scans
+    python build_tiles.py --dry-run         # Count tiles only (no Pillow needed)
+    python build_tiles.py --workers 4
+"""
+
+import argparse
+import math
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from build_utils import dump_compact, write_atomic
+from image_utils import (DATA_DIR, IMAGES_DIR, PILLOW_AVAILABLE, file_hash, find_sources, image_size,
+                         open_image, site_url, slug)
+
+if PILLOW_AVAILABLE:
+    from PIL import Image
+
+TILES_DIR = IMAGES_DIR / "tiles"
+INDEX_NAME = "index.json"
+INDEX_VERSION = 1
+
+TILE_SIZE = 256
+OVERLAP = 1
+TILE_FORMAT = "jpg"
+JPEG_QUALITY = 85
+
+DZI_TEMPLATE = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" Format="{format}" '
+                'Overlap="{overlap}" TileSize="{tile_size}"><Size Width="{width}" Height="{height}"/></Image>\n')
+
+
+def level_sizes(width: int, height: int) -> List[Tuple[int, int]]:
+    """(width, height) of every pyramid level, level 0 (1x1) first."""
+    top = math.ceil(math.log2(max(width, height, 1)))
+    return [(math.ceil(width / 2 ** (top - level)), math.ceil(height / 2 ** (top - level)))
+            for level in range(top + 1)]
+
+
+def tile_grid(width: int, height: int) -> Tuple[int, int]:
+    """(columns, rows) of tiles covering a level."""
+    return math.ceil(width / TILE_SIZE), math.ceil(height / TILE_SIZE)
+
+
+def tile_box(col: int, row: int, width: int, height: int) -> Tuple[int, int, int, int]:
+    """Crop box of a tile, overlap included."""
+    left = col * TILE_SIZE - (OVERLAP if col else 0)
+    top = row * TILE_SIZE - (OVERLAP if row else 0)
+    return left, top, min(width, (col + 1) * TILE_SIZE + OVERLAP), min(height, (row + 1) * TILE_SIZE + OVERLAP)
+
+
+def count_tiles(width: int, height: int) -> int:
+    return sum(cols * rows for cols, rows in (tile_grid(w, h) for w, h in level_sizes(width, height)))
+
+
+def tile_source(source: str, out_dir: str, name: str) -> Optional[int]:
+    """
+    Write the pyramid of one scan (runs in a worker process). Tiles go to a
+    temporary directory that is renamed into place, then the .dzi is
+    written, so a half-finished pyramid is never picked up as done.
+    Returns the number of tiles, or None if the scan cannot be decoded.
+    """
+    try:
+        img = open_image(Path(source))
+    except OSError:
+        return None
+
+    files = Path(out_dir) / f"{name}_files"
+    tmp = Path(out_dir) / f".{name}_files.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+
+    sizes = level_sizes(img.width, img.height)
+    tiles = 0
+    level_img = img
+    for level in range(len(sizes) - 1, -1, -1):
+        width, height = sizes[level]
+        if level_img.size != (width, height):
+            level_img = level_img.resize((width, height), Image.Resampling.LANCZOS)
+        level_dir = tmp / str(level)
+        level_dir.mkdir(parents=True)
+        cols, rows = tile_grid(width, height)
+        for col in range(cols):
+            for row in range(rows):
+                tile = level_img.crop(tile_box(col, row, width, height))
+                tile.save(level_dir / f"{col}_{row}.{TILE_FORMAT}", 'JPEG', quality=JPEG_QUALITY)
+                tiles += 1
+
+    shutil.rmtree(files, ignore_errors=True)
+    os.replace(tmp, files)
+    dzi = DZI_TEMPLATE.format(format=TILE_FORMAT, overlap=OVERLAP, tile_size=TILE_SIZE,
+                              width=img.width, height=img.height)
+    write_atomic(Path(out_dir) / f"{name}.dzi", dzi.encode('utf-8'))
+    return tiles
+
+
+def build_tiles(data_dir: Path = DATA_DIR, out_dir: Path = TILES_DIR, workers: Optional[int] = None,
+                dry_run: bool = False, force: bool = False) -> Dict:
+    images, jobs, errors = {}, [], []
+    tiles = 0
+    for path in find_sources(data_dir):
+        try:
+            width, height, _ = image_size(path)
+            digest = file_hash(path)
+        except (OSError, ValueError) as e:
+            errors.append((path.name, str(e)))
+            continue
+        name = f"{slug(path.name)}.{digest[:8]}"
+        images[path.name] = {"name": name, "width": width, "height": height,
+                             "levels": len(level_sizes(width, height))}
+        tiles += count_tiles(width, height)
+        if force or not (out_dir / f"{name}.dzi").exists() or not (out_dir / f"{name}_files").is_dir():
+            jobs.append((path, name))
+
+    result = {"images": images, "tiles": tiles, "tiled": len(jobs), "removed": 0, "errors": errors}
+    if dry_run:
+        return result
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if jobs:
+        args = ([str(path) for path, _ in jobs], [str(out_dir)] * len(jobs), [name for _, name in jobs])
+        if len(jobs) > 1 and workers != 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                counts = list(pool.map(tile_source, *args))
+        else:
+            counts = list(map(tile_source, *args))
+        for (path, _), count in zip(jobs, counts):
+            if count is None:
+                errors.append((path.name, "Pillow could not decode it"))
+                del images[path.name]
+
+    names = {entry["name"] for entry in images.values()}
+    for stale in out_dir.iterdir():
+        stem = stale.name[:-len('_files')] if stale.name.endswith('_files') else stale.stem
+        if stale.name == INDEX_NAME or stem in names:
+            continue
+        if stale.is_dir():
+            shutil.rmtree(stale)
+        else:
+            stale.unlink()
+            if stale.suffix == '.dzi':
+                result["removed"] += 1
+
+    index = {
+        "version": INDEX_VERSION,
+        "tile_size": TILE_SIZE,
+        "overlap": OVERLAP,
+        "format": TILE_FORMAT,
+        "images": {ref: {"dzi": site_url(out_dir / f"{entry['name']}.dzi"), "width": entry["width"],
+                         "height": entry["height"], "levels": entry["levels"]}
+                   for ref, entry in sorted(images.items())},
+    }
+    write_atomic(out_dir / INDEX_NAME, dump_compact(index))
+    return result
+
+
+def print_summary(result: Dict, out_dir: Path, dry_run: bool, elapsed: float):
+    images = result["images"]
+    print("\n" + "=" * 60)
+    print("DEEP-ZOOM TILES" + (" (dry run)" if dry_run else ""))
+    print("=" * 60)
+    print(f"Scans:      {len(images)}")
+    print(f"Tiles:      {result['tiles']} ({TILE_SIZE}px, overlap {OVERLAP})")
+    label = "To tile:" if dry_run else "Tiled:"
+    print(f"{label:<12}{result['tiled']} ({len(images) - result['tiled']} unchanged)")
+    if result["removed"]:
+        print(f"Removed:    {result['removed']} stale pyramids")
+    if images:
+        largest = max(images.items(), key=lambda item: item[1]["width"] * item[1]["height"])
+        print(f"Largest:    {largest[0]} ({largest[1]['width']}x{largest[1]['height']}, "
+              f"{largest[1]['levels']} levels)")
+    for name, error in result["errors"]:
+        print(f"  Skipped: {name}: {error}")
+    if not dry_run:
+        print(f"Output:     {out_dir / INDEX_NAME}")
+    print(f"Time:       {elapsed * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cut scans into Deep Zoom (DZI) tile pyramids')
+    parser.add_argument('--data', type=Path, default=DATA_DIR,
+                        help='Directory of source scans (default: data/)')
+    parser.add_argument('--output', '-o', type=Path, default=TILES_DIR,
+                        help='Output directory (default: data/images/tiles/)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f'Worker processes (default: {os.cpu_count()})')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-tile every scan')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Count tiles without writing any')
+    args = parser.parse_args()
+
+    if not args.dry_run and not PILLOW_AVAILABLE:
+        print("ERROR: Pillow not installed. Run: pip install Pillow")
+        sys.exit(1)
+    if not args.data.is_dir():
+        print(f"Error: Not a directory: {args.data}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    result = build_tiles(args.data, args.output, args.workers, args.dry_run, args.force)
+    print_summary(result, args.output, args.dry_run, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Build Helpers for Other Family Recipes
+
+Shared by the site build scripts. Every generated file gets a
+content-hashed name (summary.3f9a1c2b7d.json), so it can be cached
+forever; the one unhashed file, manifest.json, maps logical names to the
+current hashed files and is written last, so a client never sees a
+manifest pointing at files that are not there yet.
+
+Also home to search_tokens, the tokenizer the search and spelling
+stages share with script.js.
+
+Usage (as a module):
+    from build_utils import BuildOutput
+    out = BuildOutput(BUILD_DIR)
+    out.write_json('summary', summary)               # -> summary.<hash>.json
+    out.write_json('detail/desserts-0', shard)       # -> detail/desserts-0.<hash>.json
+    out.finish()                                     # manifest.json + stale cleanup
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BUILD_DIR = Path(__file__).parent.parent / "data" / "build"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Hex digits of the SHA-256 content hash kept in filenames
+HASH_LENGTH = 10
+
+
+def content_hash(data: bytes, length: int = HASH_LENGTH) -> str:
+    return hashlib.sha256(data).hexdigest()[:length]
+
+
+def dump_compact(data) -> bytes:
+    """Minimal JSON for the browser: no whitespace, UTF-8, stable key order."""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+
+def search_tokens(text: str) -> List[str]:
+    """
+    Lowercase ASCII word tokens with accents folded. script.js tokenizes
+    queries the same way (searchTokens), so the two must stay in step.
+    """
+    folded = ''.join(c for c in unicodedata.normalize('NFKD', str(text or ''))
+                     if not unicodedata.combining(c))
+    return re.findall(r'[a-z0-9]+', folded.lower())
+
+
+def match_mode(tmp: str, path: Path) -> None:
+    """
+    Give a mkstemp file (always 0600) the mode path already has, or the
+    umask default for a new file, before it is renamed over path.
+    """
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    os.chmod(tmp, mode)
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write bytes to a temp file next to path, then rename it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        match_mode(tmp, path)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class BuildOutput:
+    """Writes content-hashed files into a build directory and tracks them for the manifest."""
+
+    def __init__(self, root: Path = BUILD_DIR):
+        self.root = Path(root)
+        self.files: Dict[str, str] = {}   # logical name -> path relative to root
+        self.sizes: Dict[str, int] = {}
+        self.written = 0
+        self.reused = 0
+
+    def write_bytes(self, name: str, data: bytes, suffix: str) -> str:
+        """Write data as <name>.<hash><suffix>; unchanged content is not rewritten."""
+        relative = f"{name}.{content_hash(data)}{suffix}"
+        path = self.root / relative
+        if path.exists() and path.stat().st_size == len(data):
+            self.reused += 1
+        else:
+            write_atomic(path, data)
+            self.written += 1
+        self.files[name] = relative
+        self.sizes[name] = len(data)
+        return relative
+
+    def write_json(self, name: str, data) -> str:
+        return self.write_bytes(name, dump_compact(data), '.json')
+
+    def url(self, name: str, prefix: str = '') -> str:
+        return prefix + self.files[name]
+
+    def stale_files(self) -> List[Path]:
+        """Files in the build directory that this build did not produce."""
+        keep = {self.root / rel for rel in self.files.values()} | {self.root / MANIFEST_NAME}
+        if not self.root.exists():
+            return []
+        return [p for p in self.root.rglob('*') if p.is_file() and p not in keep]
+
+    def finish(self, extra: Optional[Dict] = None, clean: bool = True) -> Path:
+        """Write manifest.json (last) and remove files from earlier builds."""
+        manifest = {"version": MANIFEST_VERSION, "files": dict(sorted(self.files.items()))}
+        if extra:
+            manifest.update(extra)
+        path = self.root / MANIFEST_NAME
+        write_atomic(path, json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8') + b'\n')
+
+        if clean:
+            for stale in self.stale_files():
+                stale.unlink()
+            for directory in sorted((d for d in self.root.rglob('*') if d.is_dir()), reverse=True):
+                if not any(directory.iterdir()):
+                    directory.rmdir()
+        return path
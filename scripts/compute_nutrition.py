@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Nutrition Engine for Other Family Recipes
+
+Computes nutrition.per_serving for every recipe at once from the local
+nutrient table (data/nutrients.csv, per-100 g values from USDA data):
+
+1. Each ingredient is matched to a table row by its item name (every
+   word must belong to the alias or be a preparation word like 'chopped',
+   so 'garlic salt' is not taken for salt) and its quantity/unit converted
+   to grams (volume via the row's grams_per_cup,
+   counts via grams_per_each, weights directly)
+2. The grams form a recipe x food matrix, divided by servings_yield
+3. That matrix times the food x nutrient matrix gives per-serving values
+   for the whole corpus in one product (NumPy when installed, otherwise a
+   sparse pure-Python product - each recipe only uses a dozen foods)
+
+Anything the engine could not account for goes into missing_inputs, and
+every approximation it made into assumptions. Status is 'complete' when
+every ingredient was converted, 'partial' when some were not, and
+'insufficient_data' without a usable servings_yield or any matched
+ingredient.
+
+Nutrition typed in from magazine clippings is left alone; only recipes
+with no nutrition values, or values this engine computed earlier, are
+(re)computed unless --force is given. Changes go through the changeset
+applier, so nothing is written when nothing changed.
+
+Usage:
+    python compute_nutrition.py                        # Compute and write
+    python compute_nutrition.py --dry-run              # Show diff only
+    python compute_nutrition.py --collection reference # One collection
+    python compute_nutrition.py --changeset out.json   # Write a changeset for review
+    python compute_nutrition.py --input recipes.json --report
+"""
+
+import argparse
+import csv
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from apply_changesets import RECIPES_FILE, apply_to_data
+from quantities import COUNT_UNITS, VOLUME_ML, WEIGHT_G, is_range, normalize_unit, parse_quantity, parse_yield
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+NUTRIENTS_FILE = Path(__file__).parent.parent / "data" / "nutrients.csv"
+
+# Table columns computed into per_serving, with output rounding
+NUTRIENT_COLUMNS = {
+    'calories': 0,
+    'fat_g': 1,
+    'saturated_fat_g': 1,
+    'carbs_g': 1,
+    'protein_g': 1,
+    'sodium_mg': 0,
+    'fiber_g': 1,
+    'sugar_g': 1,
+    'cholesterol_mg': 0,
+}
+
+# First assumption on every computed record; marks nutrition as engine-owned
+ENGINE_MARKER = "Computed by compute_nutrition.py from data/nutrients.csv (per 100 g, USDA)"
+
+CUP_ML = VOLUME_ML['cup']
+
+
+def normalize_item(text: str) -> List[str]:
+    """Lowercase word tokens with simple plural folding ('blueberries' -> 'blueberry')."""
+    text = text.casefold().replace('-', ' ').replace('%', ' percent ')
+    tokens = []
+    for word in re.findall(r'[a-z0-9]+', text):
+        if len(word) > 4 and word.endswith('ies'):
+            word = word[:-3] + 'y'
+        elif len(word) > 3 and word.endswith('oes'):
+            word = word[:-2]
+        elif len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+# Words that say how an ingredient is sized or prepared, not what it is.
+# Any other word beside the matched alias ('garlic salt', 'coconut milk',
+# 'peanut butter chips') names a food the table does not have.
+PREP_WORDS = {
+    'large', 'medium', 'small', 'extra', 'jumbo', 'whole', 'fresh', 'frozen', 'thawed',
+    'ripe', 'chopped', 'finely', 'coarsely', 'roughly', 'diced', 'minced', 'sliced',
+    'thinly', 'grated', 'shredded', 'ground', 'crushed', 'mashed', 'pureed', 'cubed',
+    'halved', 'quartered', 'peeled', 'cored', 'seeded', 'pitted', 'rinsed', 'drained',
+    'melted', 'softened', 'cold', 'chilled', 'warm', 'hot', 'boiling', 'lukewarm',
+    'room', 'temperature', 'beaten', 'lightly', 'well', 'sifted', 'packed', 'firmly',
+    'loosely', 'heaping', 'level', 'divided', 'plus', 'more', 'additional', 'about',
+    'and', 'of', 'the', 'a', 'for', 'to', 'at', 'in', 'into', 'each',
+}
+PREP_TOKENS = {token for word in PREP_WORDS for token in normalize_item(word)}
+
+
+class Food:
+    """One row of the nutrient table."""
+
+    def __init__(self, index: int, name: str, grams_per_cup: Optional[float],
+                 grams_per_each: Optional[float], per_100g: List[float]):
+        self.index = index
+        self.name = name
+        self.grams_per_cup = grams_per_cup
+        self.grams_per_each = grams_per_each
+        self.per_gram = [v / 100.0 for v in per_100g]
+
+
+class NutrientTable:
+    """Foods, their per-gram nutrient rows and an alias index for matching."""
+
+    MAX_ALIAS_WORDS = 5
+
+    def __init__(self, path: Path = NUTRIENTS_FILE):
+        self.path = path
+        self.foods: List[Food] = []
+        self.aliases: Dict[Tuple[str, ...], int] = {}
+
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            rows = csv.DictReader(line for line in f if not line.startswith('#'))
+            for row in rows:
+                food = Food(
+                    len(self.foods),
+                    row['food'],
+                    float(row['grams_per_cup']) if row['grams_per_cup'] else None,
+                    float(row['grams_per_each']) if row['grams_per_each'] else None,
+                    [float(row[col] or 0) for col in NUTRIENT_COLUMNS],
+                )
+                self.foods.append(food)
+                for alias in [row['food']] + row['aliases'].split(';'):
+                    key = tuple(normalize_item(alias))
+                    if key:
+                        self.aliases.setdefault(key, food.index)
+
+    def match(self, item: str) -> Optional[Food]:
+        """
+        Longest alias found as a run of words in the item; ties go to the
+        rightmost, since the head noun comes last ('vanilla yogurt'). None
+        unless every other word is in PREP_TOKENS (or a number).
+        """
+        tokens = normalize_item(item)
+        for length in range(min(self.MAX_ALIAS_WORDS, len(tokens)), 0, -1):
+            for start in range(len(tokens) - length, -1, -1):
+                food = self.aliases.get(tuple(tokens[start:start + length]))
+                if food is not None:
+                    rest = tokens[:start] + tokens[start + length:]
+                    if all(token in PREP_TOKENS or token.isdigit() for token in rest):
+                        return self.foods[food]
+                    return None
+        return None
+
+
+def describe(ingredient: Dict) -> str:
+    parts = [str(ingredient.get(k) or '').strip() for k in ('quantity', 'unit', 'item')]
+    return ' '.join(p for p in parts if p)
+
+
+class NutritionEngine:
+    """Plans each recipe's ingredient grams, then computes the whole corpus in one product."""
+
+    def __init__(self, table: NutrientTable, use_numpy: bool = NUMPY_AVAILABLE):
+        self.table = table
+        self.use_numpy = use_numpy and NUMPY_AVAILABLE
+        self._matches: Dict[str, Tuple[Optional[Food], bool]] = {}
+
+    def match(self, name: str) -> Tuple[Optional[Food], bool]:
+        """(food, used first alternative) for a cleaned ingredient name, memoized."""
+        cached = self._matches.get(name)
+        if cached is None:
+            food, first_option = None, False
+            if ' or ' in name:
+                food = self.table.match(name.split(' or ')[0])
+                first_option = food is not None
+            if food is None:
+                food = self.table.match(name)
+            cached = self._matches[name] = (food, first_option)
+        return cached
+
+    def ingredient_grams(self, ingredient: Dict, missing: List[str], assumptions: set) -> Optional[Tuple[Food, float]]:
+        """Match one ingredient and convert it to grams, noting what was missing or assumed."""
+        item = str(ingredient.get('item') or '').strip()
+        if not item:
+            return None
+
+        lowered = item.casefold()
+        if 'optional' in lowered:
+            assumptions.add("Optional ingredients excluded")
+            return None
+        if 'to taste' in lowered or 'to taste' in str(ingredient.get('quantity') or '').casefold():
+            assumptions.add("'To taste' ingredients excluded")
+            return None
+
+        # Drop parentheticals and prep notes after a comma; prefer the first of 'x or y'
+        name = re.sub(r'\([^)]*\)', ' ', item).split(',')[0]
+        food, first_option = self.match(name)
+        if first_option:
+            assumptions.add("First option used where an ingredient lists alternatives")
+        if food is None:
+            missing.append(f"No nutrient data for '{item}'")
+            return None
+
+        qty = ingredient.get('quantity')
+        amount = parse_quantity(qty)
+        if amount is None:
+            missing.append(f"No usable quantity for '{describe(ingredient) or item}'")
+            return None
+        if is_range(qty):
+            assumptions.add("Quantity ranges use the midpoint")
+
+        raw_unit = ingredient.get('unit')
+        unit = normalize_unit(raw_unit)
+        if unit in WEIGHT_G:
+            return food, amount * WEIGHT_G[unit]
+        if unit in VOLUME_ML:
+            if food.grams_per_cup is None:
+                missing.append(f"No volume weight for '{food.name}' ({describe(ingredient)})")
+                return None
+            if unit in ('pinch', 'dash'):
+                assumptions.add("Pinch = 1/16 tsp, dash = 1/8 tsp")
+            return food, amount * VOLUME_ML[unit] / CUP_ML * food.grams_per_cup
+        if unit in COUNT_UNITS:
+            if food.grams_per_each is None:
+                missing.append(f"No per-item weight for '{food.name}' ({describe(ingredient)})")
+                return None
+            if unit in ('small', 'medium'):
+                assumptions.add("Small/medium items weighed as standard size")
+            return food, amount * food.grams_per_each
+
+        missing.append(f"Unknown unit '{raw_unit}' for '{item}'")
+        return None
+
+    def plan(self, recipe: Dict) -> Tuple[Optional[float], Dict[int, float], List[str], List[str]]:
+        """(servings, {food index: grams}, missing_inputs, assumptions) for one recipe."""
+        missing = []
+        assumptions = set()
+        grams: Dict[int, float] = {}
+
+        ingredients = list(recipe.get('ingredients') or [])
+        frosting = recipe.get('frosting')
+        if isinstance(frosting, dict):
+            ingredients += frosting.get('ingredients') or []
+
+        for ingredient in ingredients:
+            if not isinstance(ingredient, dict):
+                continue
+            result = self.ingredient_grams(ingredient, missing, assumptions)
+            if result:
+                food, amount = result
+                grams[food.index] = grams.get(food.index, 0.0) + amount
+
+        servings = parse_yield(recipe.get('servings_yield'))
+        if servings is None:
+            missing.insert(0, "servings_yield (number of servings)")
+        elif not isinstance(recipe.get('servings_yield'), (int, float)):
+            assumptions.add(f"Yield '{recipe.get('servings_yield')}' taken as {servings:g} servings")
+
+        return servings, grams, missing, [ENGINE_MARKER] + sorted(assumptions)
+
+    def _product(self, rows: List[Dict[int, float]]) -> List[List[float]]:
+        """Per-serving grams (recipes x foods) times per-gram nutrients (foods x nutrients)."""
+        width = len(NUTRIENT_COLUMNS)
+        if self.use_numpy:
+            amounts = np.zeros((len(rows), len(self.table.foods)))
+            for r, row in enumerate(rows):
+                for food, grams in row.items():
+                    amounts[r, food] = grams
+            nutrients = np.array([food.per_gram for food in self.table.foods])
+            return (amounts @ nutrients).tolist()
+
+        foods = self.table.foods
+        results = []
+        for row in rows:
+            totals = [0.0] * width
+            for food, grams in row.items():
+                per_gram = foods[food].per_gram
+                for k in range(width):
+                    totals[k] += grams * per_gram[k]
+            results.append(totals)
+        return results
+
+    def compute_all(self, recipes: List[Dict]) -> List[Dict]:
+        """Nutrition blocks for every recipe, in order."""
+        plans = [self.plan(recipe) for recipe in recipes]
+        rows = [{food: g / servings for food, g in grams.items()} if servings else {}
+                for servings, grams, _, _ in plans]
+        totals = self._product(rows)
+
+        results = []
+        for (servings, grams, missing, assumptions), values in zip(plans, totals):
+            if servings is None or not grams:
+                status = 'insufficient_data'
+                per_serving = {key: None for key in NUTRIENT_COLUMNS}
+            else:
+                status = 'partial' if missing else 'complete'
+                per_serving = {key: round(value, digits) if digits else int(round(value))
+                               for (key, digits), value in zip(NUTRIENT_COLUMNS.items(), values)}
+            results.append({
+                "status": status,
+                "per_serving": per_serving,
+                "missing_inputs": missing,
+                "assumptions": assumptions,
+            })
+        return results
+
+
+def engine_owned(recipe: Dict) -> bool:
+    """True if the recipe has no nutrition values yet, or only values this engine computed."""
+    nutrition = recipe.get('nutrition')
+    if not isinstance(nutrition, dict):
+        return True
+    if ENGINE_MARKER in (nutrition.get('assumptions') or []):
+        return True
+    per_serving = nutrition.get('per_serving') or {}
+    return all(value is None for value in per_serving.values())
+
+
+def build_changeset(recipes: List[Dict], results: List[Dict]) -> Dict:
+    return {
+        "version": 1,
+        "name": "computed-nutrition",
+        "changes": [{"id": recipe.get('id'), "set_fields": {"nutrition": nutrition}}
+                    for recipe, nutrition in zip(recipes, results)],
+    }
+
+
+def print_report(recipes: List[Dict], results: List[Dict], elapsed: float, skipped: int, engine: NutritionEngine):
+    print("\n" + "=" * 60)
+    print("NUTRITION COMPUTATION")
+    print("=" * 60)
+    print(f"Recipes computed: {len(recipes)} ({skipped} with hand-entered nutrition left alone)")
+    print(f"Matrix product:   {'NumPy' if engine.use_numpy else 'pure Python (NumPy not installed)'}")
+    print(f"Time:             {elapsed * 1000:.1f} ms")
+
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    for status in ('complete', 'partial', 'insufficient_data'):
+        print(f"  {status:<18} {counts.get(status, 0)}")
+
+    # Most common gaps, so the nutrient table can be extended where it matters
+    gaps = {}
+    for result in results:
+        for item in result['missing_inputs']:
+            gaps[item] = gaps.get(item, 0) + 1
+    if gaps:
+        print("\nMost common missing inputs:")
+        for item, count in sorted(gaps.items(), key=lambda kv: (-kv[1], kv[0]))[:15]:
+            print(f"  {count:>4}  {item}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compute recipe nutrition from data/nutrients.csv')
+    parser.add_argument('--input', '-i', type=Path, default=RECIPES_FILE,
+                        help='Path to recipes_master.json')
+    parser.add_argument('--table', type=Path, default=NUTRIENTS_FILE,
+                        help='Nutrient table CSV')
+    parser.add_argument('--collection', help='Only recipes in this collection')
+    parser.add_argument('--force', action='store_true',
+                        help='Also recompute hand-entered nutrition')
+    parser.add_argument('--dry-run', '-n', action='store_true',
+                        help='Show a diff without writing')
+    parser.add_argument('--changeset', type=Path,
+                        help='Write the results as a changeset file instead of applying them')
+    parser.add_argument('--report', action='store_true',
+                        help='Only print the computation report')
+    args = parser.parse_args()
+
+    try:
+        table = NutrientTable(args.table)
+        with open(args.input, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError as e:
+        print(f"Error: File not found: {e.filename}")
+        sys.exit(1)
+    except (json.JSONDecodeError, KeyError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    recipes = data.get('recipes', []) if isinstance(data, dict) else data
+    if args.collection:
+        recipes = [r for r in recipes if r.get('collection') == args.collection]
+    selected = [r for r in recipes if args.force or engine_owned(r)]
+
+    engine = NutritionEngine(table)
+    start = time.perf_counter()
+    results = engine.compute_all(selected)
+    elapsed = time.perf_counter() - start
+
+    print_report(selected, results, elapsed, len(recipes) - len(selected), engine)
+
+    if args.report:
+        return
+    changeset = build_changeset(selected, results)
+    if args.changeset:
+        with open(args.changeset, 'w', encoding='utf-8') as f:
+            json.dump(changeset, f, indent=2, ensure_ascii=False)
+        print(f"\n✓ Changeset written to {args.changeset}")
+    elif not isinstance(data, dict):
+        print("\nInput is a bare recipe list; use --changeset or --report.")
+    else:
+        apply_to_data(data, [changeset], args.input, args.dry_run)
+
+
+if __name__ == '__main__':
+    main()
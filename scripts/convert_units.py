@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Metric Conversion Engine for Other Family Recipes
+
+Parses every ingredient quantity and unit once and writes the results
+back as data, so the site never has to re-parse quantity strings:
+
+1. Numeric fields on each ingredient:
+     quantity_value   number (the low end for ranges like "2-3")
+     quantity_max     high end, only for ranges
+     unit_normalized  canonical unit ('cup', 'tbsp', 'g', 'each', ...)
+2. conversions.ingredients_metric with the same fields, in grams or
+   millilitres, plus conversion_assumptions and has_conversions
+
+Conversion runs over the whole corpus at once: all ingredients are
+flattened into columns, one factor is looked up per distinct
+(unit, ingredient) pair, and the columns are multiplied through.
+
+Weights convert directly. Cups and other volume measures of dry
+ingredients become grams using the grams_per_cup density column of
+data/nutrients.csv; liquids, unknown ingredients and spoon measures
+become millilitres. Counts ("2 large eggs") stay as they are.
+
+Hand-entered conversions are left alone unless --force is given. Changes
+go through the changeset applier, so nothing is written when nothing
+changed.
+
+Usage:
+    python convert_units.py                        # Convert and write
+    python convert_units.py --dry-run              # Show diff only
+    python convert_units.py --collection reference # One collection
+    python convert_units.py --changeset out.json   # Write a changeset for review
+    python convert_units.py --input recipes.json --report
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from apply_changesets import RECIPES_FILE, apply_to_data
+from compute_nutrition import NUTRIENTS_FILE, Food, NutrientTable
+from quantities import COUNT_UNITS, VOLUME_ML, WEIGHT_G, normalize_unit, parse_quantity_range
+
+# First assumption on every generated conversion; marks it as engine-owned
+CONVERSION_MARKER = "Generated by convert_units.py (US customary measures, densities from data/nutrients.csv)"
+
+# Foods measured by volume in metric recipes too
+LIQUID_FOODS = {
+    'water', 'whole milk', 'low fat milk', 'skim milk', 'buttermilk', 'heavy cream',
+    'vegetable oil', 'olive oil', 'lemon juice', 'lime juice', 'orange juice',
+    'chicken broth', 'honey', 'molasses', 'maple syrup', 'vanilla extract',
+}
+
+# Small measures stay as spoons-in-ml rather than becoming fractions of a gram
+SPOON_UNITS = {'tsp', 'tbsp', 'pinch', 'dash'}
+
+CUP_ML = VOLUME_ML['cup']
+
+
+def round_metric(value: float, unit: str) -> float:
+    """Round to kitchen-friendly steps for the unit."""
+    if unit in ('kg', 'l'):
+        return round(value, 2)
+    if unit == 'g':
+        step = 0.5 if value < 5 else 1 if value < 100 else 5
+    else:
+        step = 0.25 if value < 5 else 0.5 if value < 20 else 5 if value < 250 else 10
+    return round(float(round(value / step) * step), 2)
+
+
+def metric_amounts(low: float, high: float, unit: str) -> Tuple[float, float, str]:
+    """Rounded (low, high, unit), switching to kg/l for large amounts."""
+    if high >= 1000:
+        unit = 'kg' if unit == 'g' else 'l'
+        low, high = low / 1000, high / 1000
+    return round_metric(low, unit), round_metric(high, unit), unit
+
+
+def format_number(value: float) -> str:
+    return f"{value:g}"
+
+
+class UnitConverter:
+    """Looks up ingredient densities and converts whole corpora of ingredients."""
+
+    def __init__(self, table: NutrientTable):
+        self.table = table
+        self._foods: Dict[str, Optional[Food]] = {}
+
+    def food_for(self, item: str) -> Optional[Food]:
+        key = str(item or '').split(',')[0].split('(')[0].strip()
+        if key not in self._foods:
+            self._foods[key] = self.table.match(key) if key else None
+        return self._foods[key]
+
+    def factor(self, unit: Optional[str], food: Optional[Food]) -> Tuple[Optional[float], Optional[str], Optional[str]]:
+        """
+        (multiplier, metric unit, assumption) converting one `unit` of the
+        ingredient; multiplier None means it is not converted.
+        """
+        if unit in WEIGHT_G:
+            return WEIGHT_G[unit], 'g', None
+        if unit not in VOLUME_ML:
+            return None, None, None
+
+        ml = VOLUME_ML[unit]
+        if unit in SPOON_UNITS:
+            return ml, 'ml', "Spoon measures in ml: 1 tsp = 5 ml, 1 tbsp = 15 ml"
+        if food is None or food.grams_per_cup is None or food.name in LIQUID_FOODS:
+            return ml, 'ml', "1 US cup = 237 ml"
+        grams_per_cup = food.grams_per_cup
+        return ml / CUP_ML * grams_per_cup, 'g', f"1 cup {food.name} = {grams_per_cup:g} g"
+
+    def convert_all(self, recipes: List[Dict]) -> List[Tuple[List[Dict], Dict]]:
+        """(ingredients with numeric fields, conversions block) for every recipe."""
+        # Parse once: flatten every ingredient into columns
+        owners, lows, highs, keys = [], [], [], []
+        parsed = []
+        for r, recipe in enumerate(recipes):
+            ingredients = [dict(i) if isinstance(i, dict) else i for i in recipe.get('ingredients') or []]
+            parsed.append(ingredients)
+            for n, ingredient in enumerate(ingredients):
+                if not isinstance(ingredient, dict):
+                    continue
+                bounds = parse_quantity_range(ingredient.get('quantity'))
+                unit = normalize_unit(ingredient.get('unit'))
+                ingredient.pop('quantity_max', None)
+                ingredient['quantity_value'] = bounds[0] if bounds else None
+                if bounds and bounds[1] != bounds[0]:
+                    ingredient['quantity_max'] = bounds[1]
+                ingredient['unit_normalized'] = unit
+                if bounds:
+                    owners.append((r, n))
+                    lows.append(bounds[0])
+                    highs.append(bounds[1])
+                    keys.append((unit, self.food_for(ingredient.get('item'))))
+
+        # One factor per distinct (unit, food), then column-wise multiply
+        factors = {key: self.factor(*key) for key in set(keys)}
+        columns = [factors[key] for key in keys]
+        metric_low = [low * f[0] if f[0] is not None else None for low, f in zip(lows, columns)]
+        metric_high = [high * f[0] if f[0] is not None else None for high, f in zip(highs, columns)]
+
+        converted: Dict[Tuple[int, int], Tuple[float, float, str, Optional[str]]] = {}
+        for owner, low, high, (factor, unit, note) in zip(owners, metric_low, metric_high, columns):
+            if factor is not None:
+                converted[owner] = (low, high, unit, note)
+
+        results = []
+        for r, ingredients in enumerate(parsed):
+            metric = []
+            assumptions = set()
+            not_converted = []
+            count = 0
+            for n, ingredient in enumerate(ingredients):
+                if not isinstance(ingredient, dict):
+                    continue
+                entry = {'item': ingredient.get('item')}
+                hit = converted.get((r, n))
+                if hit:
+                    low, high, unit, note = hit
+                    low_value, high_value, unit = metric_amounts(low, high, unit)
+                    entry['quantity'] = format_number(low_value)
+                    if high != low:
+                        entry['quantity'] += f"-{format_number(high_value)}"
+                    entry['unit'] = unit
+                    entry['quantity_value'] = low_value
+                    if high != low:
+                        entry['quantity_max'] = high_value
+                    entry['unit_normalized'] = unit
+                    if note:
+                        assumptions.add(note)
+                    count += 1
+                else:
+                    for key in ('quantity', 'unit', 'quantity_value', 'quantity_max', 'unit_normalized'):
+                        if key in ingredient:
+                            entry[key] = ingredient[key]
+                    unit = ingredient.get('unit_normalized')
+                    if unit not in COUNT_UNITS and ingredient.get('quantity'):
+                        not_converted.append(f"{ingredient.get('quantity')} {ingredient.get('unit') or ''}".strip())
+                if ingredient.get('prep_note'):
+                    entry['prep_note'] = ingredient['prep_note']
+                metric.append(entry)
+
+            notes = [CONVERSION_MARKER] + sorted(assumptions)
+            if not_converted:
+                notes.append(f"Not converted (no fixed size): {', '.join(sorted(set(not_converted)))}")
+            conversions = {
+                "has_conversions": count > 0,
+                "ingredients_metric": metric if count else [],
+                "conversion_assumptions": notes,
+            }
+            results.append((ingredients, conversions))
+        return results
+
+
+def engine_owned(recipe: Dict) -> bool:
+    """True if the recipe has no conversions yet, or only ones this engine generated."""
+    conversions = recipe.get('conversions')
+    if not isinstance(conversions, dict):
+        return True
+    if CONVERSION_MARKER in (conversions.get('conversion_assumptions') or []):
+        return True
+    return not conversions.get('ingredients_metric')
+
+
+def build_changeset(recipes: List[Dict], results: List[Tuple[List[Dict], Dict]], force: bool) -> Dict:
+    changes = []
+    for recipe, (ingredients, conversions) in zip(recipes, results):
+        fields = {"ingredients": ingredients}
+        if force or engine_owned(recipe):
+            fields["conversions"] = conversions
+        changes.append({"id": recipe.get('id'), "set_fields": fields})
+    return {"version": 1, "name": "metric-conversions", "changes": changes}
+
+
+def print_report(recipes: List[Dict], results: List[Tuple[List[Dict], Dict]], elapsed: float):
+    print("\n" + "=" * 60)
+    print("METRIC CONVERSION")
+    print("=" * 60)
+
+    ingredients = sum(len(i) for i, _ in results)
+    parsed = sum(1 for i, _ in results for ing in i
+                 if isinstance(ing, dict) and ing.get('quantity_value') is not None)
+    converted = sum(1 for _, c in results for ing in c['ingredients_metric']
+                    if ing.get('unit') in ('g', 'kg', 'ml', 'l'))
+    with_conversions = sum(1 for _, c in results if c['has_conversions'])
+
+    print(f"Recipes:              {len(recipes)} ({with_conversions} with conversions)")
+    print(f"Ingredients:          {ingredients}")
+    print(f"Quantities parsed:    {parsed}")
+    print(f"Converted to metric:  {converted}")
+    print(f"Time:                 {elapsed * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate metric conversions and numeric quantities')
+    parser.add_argument('--input', '-i', type=Path, default=RECIPES_FILE,
+                        help='Path to recipes_master.json')
+    parser.add_argument('--table', type=Path, default=NUTRIENTS_FILE,
+                        help='Nutrient/density table CSV')
+    parser.add_argument('--collection', help='Only recipes in this collection')
+    parser.add_argument('--force', action='store_true',
+                        help='Also replace hand-entered conversions')
+    parser.add_argument('--dry-run', '-n', action='store_true',
+                        help='Show a diff without writing')
+    parser.add_argument('--changeset', type=Path,
+                        help='Write the results as a changeset file instead of applying them')
+    parser.add_argument('--report', action='store_true',
+                        help='Only print the conversion report')
+    args = parser.parse_args()
+
+    try:
+        table = NutrientTable(args.table)
+        with open(args.input, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError as e:
+        print(f"Error: File not found: {e.filename}")
+        sys.exit(1)
+    except (json.JSONDecodeError, KeyError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    recipes = data.get('recipes', []) if isinstance(data, dict) else data
+    if args.collection:
+        recipes = [r for r in recipes if r.get('collection') == args.collection]
+
+    start = time.perf_counter()
+    results = UnitConverter(table).convert_all(recipes)
+    elapsed = time.perf_counter() - start
+
+    print_report(recipes, results, elapsed)
+
+    if args.report:
+        return
+    changeset = build_changeset(recipes, results, args.force)
+    if args.changeset:
+        with open(args.changeset, 'w', encoding='utf-8') as f:
+            json.dump(changeset, f, indent=2, ensure_ascii=False)
+        print(f"\n✓ Changeset written to {args.changeset}")
+    elif not isinstance(data, dict):
+        print("\nInput is a bare recipe list; use --changeset or --report.")
+    else:
+        apply_to_data(data, [changeset], args.input, args.dry_run)
+
+
+if __name__ == '__main__':
+    main()
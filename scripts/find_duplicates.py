@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Recipe Finder for Other Family Recipes
+
+The same recipe often appears several times under slightly different titles
+and ingredient lists. This script finds those near-duplicates without
+comparing every pair:
+
+1. Each recipe is reduced to a set of shingles (character 4-grams of the
+   normalized title plus normalized ingredient items)
+2. A MinHash signature estimates Jaccard similarity between shingle sets
+3. LSH banding buckets signatures so only likely matches become candidates
+4. Candidates are verified with exact Jaccard similarity and grouped
+
+Pairs already linked through variant_of/canonical_id are reported separately
+from new suspects, and each new group gets a suggested variant_of link.
+
+Usage:
+    python scripts/find_duplicates.py
+    python scripts/find_duplicates.py --threshold 0.7
+    python scripts/find_duplicates.py --input ../FamilyRecipeHub/data/recipes.json
+    python scripts/find_duplicates.py --json duplicates.json
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+# Configuration
+DEFAULT_THRESHOLD = 0.6  # Minimum verified Jaccard similarity to report
+NUM_PERM = 64            # MinHash signature length
+BANDS = 16               # LSH bands (rows per band = NUM_PERM / BANDS)
+TITLE_SHINGLE = 4        # Character n-gram size for titles
+SEED = 1                 # Fixed seed so signatures are reproducible
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+CONFIDENCE_RANK = {'high': 3, 'medium': 2, 'low': 1}
+
+# Words that carry no identity in titles or ingredient items
+STOPWORDS = {
+    'a', 'an', 'and', 'the', 'of', 'with', 'in', 'for', 'or', 'to', 'my',
+    'recipe', 'easy', 'best', 'quick', 'homemade', 'classic', 'favorite',
+    'fresh', 'large', 'small', 'medium', 'chopped', 'diced', 'sliced',
+    'minced', 'divided', 'softened', 'melted', 'optional', 'taste',
+}
+
+
+def normalize_text(text: str) -> List[str]:
+    """Lowercase, drop parentheticals/punctuation/digits and stopwords."""
+    text = re.sub(r'\([^)]*\)', ' ', str(text or '').lower())
+    text = re.sub(r"[^a-z\s]", ' ', text.replace("'", ''))
+    return [w for w in text.split() if w not in STOPWORDS]
+
+
+def normalize_item(item: str) -> str:
+    """Normalize an ingredient item: text before the first comma, singularized."""
+    words = normalize_text(str(item or '').split(',')[0])
+    return ' '.join(w[:-1] if len(w) > 3 and w.endswith('s') else w for w in words)
+
+
+def shingles(recipe: Dict) -> Set[str]:
+    """Shingle set for a recipe: title 4-grams plus ingredient items."""
+    result = set()
+
+    title = ' '.join(normalize_text(recipe.get('title', '')))
+    padded = f" {title} "
+    if len(padded) <= TITLE_SHINGLE:
+        result.add('t:' + padded)
+    else:
+        for i in range(len(padded) - TITLE_SHINGLE + 1):
+            result.add('t:' + padded[i:i + TITLE_SHINGLE])
+
+    for ing in recipe.get('ingredients') or []:
+        if isinstance(ing, dict):
+            item = normalize_item(ing.get('item', ''))
+            if item:
+                result.add('i:' + item)
+
+    return result
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """MinHash signatures using universal hashing over a stable 32-bit shingle hash."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = SEED):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.perms = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    @staticmethod
+    def _hash(shingle: str) -> int:
+        return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest(), 'little')
+
+    def signature(self, shingle_set: Set[str]) -> Tuple[int, ...]:
+        if not shingle_set:
+            return tuple([MAX_HASH] * self.num_perm)
+        hashes = [self._hash(s) for s in shingle_set]
+        return tuple(
+            min([((a * h + b) % MERSENNE_PRIME) & MAX_HASH for h in hashes])
+            for a, b in self.perms
+        )
+
+
+def lsh_candidates(signatures: List[Tuple[int, ...]], bands: int) -> Set[Tuple[int, int]]:
+    """Bucket signature bands; any two recipes sharing a bucket become a candidate pair."""
+    num_perm = len(signatures[0]) if signatures else 0
+    if num_perm % bands:
+        raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+    rows = num_perm // bands
+
+    candidates = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        lo = band * rows
+        for idx, sig in enumerate(signatures):
+            buckets[sig[lo:lo + rows]].append(idx)
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    candidates.add((members[i], members[j]))
+    return candidates
+
+
+class UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: int, b: int):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[rb] = ra
+
+
+def linked_group(recipe: Dict) -> str:
+    """The variant group a recipe already belongs to (its canonical ID)."""
+    return recipe.get('canonical_id') or recipe.get('variant_of') or recipe.get('id')
+
+
+def choose_canonical(recipes: List[Dict]) -> Dict:
+    """
+    Pick the recipe others should point at: one that is already referenced
+    as a canonical, else the most complete, highest-confidence version.
+    """
+    ids = {r.get('id') for r in recipes}
+    for r in recipes:
+        if any(o.get('variant_of') == r.get('id') or o.get('canonical_id') == r.get('id')
+               for o in recipes if o is not r):
+            return r
+    for r in recipes:
+        if r.get('variant_of') in ids:
+            return next(o for o in recipes if o.get('id') == r.get('variant_of'))
+
+    def score(r):
+        confidence = CONFIDENCE_RANK.get((r.get('confidence') or {}).get('overall'), 0)
+        return (-confidence, -len(r.get('ingredients') or []), -len(r), str(r.get('id')))
+
+    return sorted(recipes, key=score)[0]
+
+
+def find_duplicates(recipes: List[Dict], threshold: float = DEFAULT_THRESHOLD,
+                    num_perm: int = NUM_PERM, bands: int = BANDS) -> Dict:
+    """Run the MinHash/LSH pipeline and return pairs, groups and suggestions."""
+    timings = {}
+
+    start = time.perf_counter()
+    shingle_sets = [shingles(r) for r in recipes]
+    hasher = MinHasher(num_perm)
+    signatures = [hasher.signature(s) for s in shingle_sets]
+    timings['signatures'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    candidates = lsh_candidates(signatures, bands)
+    timings['lsh'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pairs = []
+    matched = set()
+    uf = UnionFind(len(recipes))
+    for i, j in sorted(candidates):
+        sim = jaccard(shingle_sets[i], shingle_sets[j])
+        if sim < threshold:
+            continue
+        a, b = recipes[i], recipes[j]
+        pairs.append({
+            "a": a.get('id'),
+            "b": b.get('id'),
+            "similarity": round(sim, 3),
+            "already_linked": linked_group(a) == linked_group(b) or
+                              a.get('id') == b.get('id')
+        })
+        uf.union(i, j)
+        matched.update((i, j))
+    timings['verify'] = time.perf_counter() - start
+
+    members = defaultdict(list)
+    for idx in sorted(matched):
+        members[uf.find(idx)].append(idx)
+
+    groups = []
+    suggestions = []
+    for idxs in members.values():
+        group = [recipes[i] for i in idxs]
+        canonical = choose_canonical(group)
+        canonical_id = canonical.get('id')
+        new_links = []
+        for r in group:
+            if r is canonical or linked_group(r) == linked_group(canonical):
+                continue
+            new_links.append(r.get('id'))
+            suggestions.append({
+                "id": r.get('id'),
+                "title": r.get('title'),
+                "variant_of": canonical_id,
+                "canonical_title": canonical.get('title')
+            })
+        groups.append({
+            "canonical": canonical_id,
+            "members": [r.get('id') for r in group],
+            "new_links": new_links
+        })
+
+    groups.sort(key=lambda g: (-len(g["new_links"]), str(g["canonical"])))
+    pairs.sort(key=lambda p: (-p["similarity"], str(p["a"]), str(p["b"])))
+
+    return {
+        "recipes": len(recipes),
+        "threshold": threshold,
+        "num_perm": num_perm,
+        "bands": bands,
+        "candidates": len(candidates),
+        "pairs": pairs,
+        "groups": groups,
+        "suggestions": suggestions,
+        "timings": {k: round(v, 4) for k, v in timings.items()}
+    }
+
+
+def print_report(result: Dict, titles: Dict[str, str], limit: int):
+    """Print a human-readable duplicate report."""
+    print("\n" + "="*60)
+    print("NEAR-DUPLICATE RECIPE REPORT")
+    print("="*60)
+    print(f"Recipes scanned:     {result['recipes']}")
+    print(f"LSH candidate pairs: {result['candidates']}")
+    new_pairs = [p for p in result['pairs'] if not p['already_linked']]
+    print(f"Similar pairs:       {len(result['pairs'])} "
+          f"({len(new_pairs)} not yet linked, threshold {result['threshold']})")
+    t = result['timings']
+    print(f"Time:                signatures {t['signatures']:.2f}s, "
+          f"lsh {t['lsh']:.2f}s, verify {t['verify']:.2f}s")
+
+    if new_pairs:
+        print(f"\nSUSPECTED DUPLICATES:")
+        for p in new_pairs[:limit]:
+            print(f"  {p['similarity']:.2f}  {p['a']}  <->  {p['b']}")
+            print(f"        {titles.get(p['a'], '')}  /  {titles.get(p['b'], '')}")
+        if len(new_pairs) > limit:
+            print(f"  ... and {len(new_pairs) - limit} more")
+
+    if result['suggestions']:
+        print(f"\nSUGGESTED variant_of LINKS:")
+        for s in result['suggestions'][:limit]:
+            print(f"  {s['id']}: \"variant_of\": \"{s['variant_of']}\"")
+        if len(result['suggestions']) > limit:
+            print(f"  ... and {len(result['suggestions']) - limit} more")
+
+    print("="*60)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Find near-duplicate recipes with MinHash/LSH"
+    )
+    parser.add_argument(
+        '--input', '-i',
+        type=Path,
+        default=Path(__file__).parent.parent / 'data' / 'recipes.json',
+        help="Recipes JSON file (default: data/recipes.json)"
+    )
+    parser.add_argument(
+        '--threshold', '-t',
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Minimum Jaccard similarity to report (default: {DEFAULT_THRESHOLD})"
+    )
+    parser.add_argument(
+        '--num-perm',
+        type=int,
+        default=NUM_PERM,
+        help=f"MinHash signature length (default: {NUM_PERM})"
+    )
+    parser.add_argument(
+        '--bands',
+        type=int,
+        default=BANDS,
+        help=f"LSH bands; must divide --num-perm (default: {BANDS})"
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=50,
+        help="Maximum pairs/suggestions to print (default: 50)"
+    )
+    parser.add_argument(
+        '--json',
+        type=Path,
+        help="Write the full result as JSON to this path"
+    )
+
+    args = parser.parse_args()
+
+    if args.num_perm % args.bands:
+        print("ERROR: --bands must divide --num-perm")
+        sys.exit(1)
+
+    if not args.input.exists():
+        print(f"ERROR: Cannot find {args.input}")
+        sys.exit(1)
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    recipes = data.get('recipes', [])
+
+    result = find_duplicates(recipes, args.threshold, args.num_perm, args.bands)
+    titles = {r.get('id'): r.get('title', '') for r in recipes}
+    print_report(result, titles, args.limit)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"\nFull results written to: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
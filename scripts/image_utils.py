@@ -0,0 +1,155 @@
+"""
+Image Helpers for Other Family Recipes
+
+Shared by the image build scripts (build_images.py and friends). Finds
+the source scans in data/, hashes them, and reads their dimensions.
+
+Pillow is optional. Without it, image_size() still reads width and
+height (EXIF orientation applied) straight from the JPEG/PNG headers, so
+the manifest gets exact dimensions even where no derivatives can be made.
+
+Usage (as a module):
+    from image_utils import PILLOW_AVAILABLE, find_sources, image_size
+    for path in find_sources(DATA_DIR):
+        width, height, fmt = image_size(path)
+"""
+
+import hashlib
+import json
+import re
+import struct
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from PIL import Image, ImageFile, ImageOps
+    ImageFile.LOAD_TRUNCATED_IMAGES = True
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+
+ROOT = Path(__file__).parent.parent
+DATA_DIR = ROOT / "data"
+IMAGES_DIR = DATA_DIR / "images"       # Generated copies + manifest.json
+IMAGES_MANIFEST = "manifest.json"
+PROCESSED_FOLDER = "processed"         # Resized copies from process_images.py
+
+SOURCE_PATTERNS = ["*.jpeg", "*.jpg", "*.JPG", "*.png", "*.PNG"]
+
+# JPEG start-of-frame markers (SOF0-SOF15 minus DHT, JPG and DAC)
+_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def find_sources(data_dir: Path = DATA_DIR) -> List[Path]:
+    """Source scans directly under data_dir, sorted by name."""
+    found = set()
+    for pattern in SOURCE_PATTERNS:
+        found.update(p for p in data_dir.glob(pattern) if p.is_file())
+    return sorted(found, key=lambda p: p.name)
+
+
+def load_image_manifest(path: Path = IMAGES_DIR / IMAGES_MANIFEST) -> Dict:
+    """The image manifest from build_images.py, or {} if it has not been built."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def site_url(path: Path) -> str:
+    """URL of a file relative to the site root (the repository root)."""
+    try:
+        return path.resolve().relative_to(ROOT.resolve()).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def file_hash(path: Path, length: int = 16) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:length]
+
+
+def slug(name: str) -> str:
+    """URL-safe file stem for derivatives: 'Grandmas-recipes - 1.jpeg' -> 'grandmas-recipes-1'."""
+    stem = Path(name).stem
+    return re.sub(r'[^a-z0-9]+', '-', stem.lower()).strip('-') or 'image'
+
+
+def _exif_orientation(segment: bytes) -> int:
+    """Orientation tag (1-8) from an APP1 Exif segment, 1 if absent."""
+    if not segment.startswith(b'Exif\x00\x00'):
+        return 1
+    tiff = segment[6:]
+    if tiff[:2] == b'II':
+        order = '<'
+    elif tiff[:2] == b'MM':
+        order = '>'
+    else:
+        return 1
+    try:
+        offset = struct.unpack(order + 'I', tiff[4:8])[0]
+        count = struct.unpack(order + 'H', tiff[offset:offset + 2])[0]
+        for n in range(count):
+            entry = tiff[offset + 2 + 12 * n:offset + 14 + 12 * n]
+            tag, _, _ = struct.unpack(order + 'HHI', entry[:8])
+            if tag == 0x0112:
+                return struct.unpack(order + 'H', entry[8:10])[0]
+    except struct.error:
+        pass
+    return 1
+
+
+def _jpeg_size(f) -> Optional[Tuple[int, int]]:
+    orientation = 1
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in (0x01, *range(0xD0, 0xD8)):
+            continue
+        if marker in (0xD9, 0xDA):      # End of image / start of scan: no frame header found
+            return None
+        length = struct.unpack('>H', f.read(2))[0]
+        if marker in _SOF_MARKERS:
+            height, width = struct.unpack('>HH', f.read(5)[1:5])
+            return (height, width) if orientation >= 5 else (width, height)
+        if marker == 0xE1 and orientation == 1:
+            orientation = _exif_orientation(f.read(length - 2))
+        else:
+            f.seek(length - 2, 1)
+
+
+def image_size(path: Path) -> Tuple[int, int, str]:
+    """
+    (width, height, format) as displayed, i.e. after EXIF rotation. Reads
+    only the file header; raises ValueError for files that are not a
+    readable JPEG or PNG.
+    """
+    with open(path, 'rb') as f:
+        head = f.read(24)
+        if head[:8] == b'\x89PNG\r\n\x1a\n' and head[12:16] == b'IHDR':
+            width, height = struct.unpack('>II', head[16:24])
+            return width, height, 'png'
+        if head[:2] == b'\xff\xd8':
+            try:
+                size = _jpeg_size(f)
+            except struct.error:
+                size = None
+            if size:
+                return size[0], size[1], 'jpeg'
+    raise ValueError(f"{path.name}: not a readable JPEG or PNG")
+
+
+def open_image(path: Path):
+    """Open with Pillow, rotated per EXIF and converted to RGB."""
+    with Image.open(path) as img:
+        img = ImageOps.exif_transpose(img)
+        return img.convert('RGB')
@@ -0,0 +1,365 @@
+"""
+Conservative Minification for Other Family Recipes
+
+Shrinks script.js, styles.css and the HTML pages without changing what
+they do, using only the standard library:
+
+    minify_css    strips comments, collapses whitespace and drops the
+                  spaces around { } ; , and after : (strings untouched)
+    minify_js     strips comments and collapses whitespace, keeping
+                  strings, template literals and regex literals intact
+                  and every line break that automatic semicolon
+                  insertion could depend on
+    minify_html   drops comments and collapses whitespace between and
+                  around tags; <pre>/<textarea> are kept as they are,
+                  inline scripts and styles are minified
+    critical_css  the rules of a stylesheet that apply to a page's
+                  static markup, for inlining into its <head>
+
+None of them renames anything, so the output reads like the input and
+a bad guess costs bytes, never behavior.
+
+Usage (as a module):
+    from minify import minify_css, minify_js, minify_html, critical_css
+    small = minify_js(Path('script.js').read_text())
+"""
+
+import re
+from typing import List, Set, Tuple
+
+# Words after which a / starts a regex literal rather than a division
+_REGEX_AFTER_WORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+                      'throw', 'case', 'do', 'else', 'yield', 'await'}
+
+# Line breaks after these (or before the closing ones) never matter to ASI
+_BREAK_AFTER = set('{([,;')
+_BREAK_BEFORE = set('})],;.')
+
+# Adjacent characters that would form a different token without a space
+_GLUE = {('+', '+'), ('-', '-'), ('/', '/'), ('/', '*'), ('+', '++'), ('-', '--')}
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char in '_$' or ord(char) > 127
+
+
+# =============================================================================
+# CSS
+# =============================================================================
+
+def _css_tokens(css: str):
+    """(kind, text) pairs: 'string', 'comment', 'space' or 'code'."""
+    i, n = 0, len(css)
+    while i < n:
+        char = css[i]
+        if char in '"\'':
+            j = i + 1
+            while j < n and css[j] != char:
+                j += 2 if css[j] == '\\' else 1
+            yield 'string', css[i:j + 1]
+            i = j + 1
+        elif css.startswith('/*', i):
+            j = css.find('*/', i + 2)
+            j = n if j < 0 else j + 2
+            yield 'comment', css[i:j]
+            i = j
+        elif char.isspace():
+            j = i
+            while j < n and css[j].isspace():
+                j += 1
+            yield 'space', ' '
+            i = j
+        else:
+            j = i
+            while j < n and not css[j].isspace() and css[j] not in '"\'' and not css.startswith('/*', j):
+                j += 1
+            yield 'code', css[i:j]
+            i = j
+
+
+def minify_css(css: str) -> str:
+    parts: List[Tuple[str, str]] = []
+    space = False
+    for kind, text in _css_tokens(css):
+        if kind in ('space', 'comment'):
+            # A comment still separates tokens: a/**/b is not ab
+            space = bool(parts)
+            continue
+        if kind == 'code':
+            text = re.sub(r';+}', '}', text)
+            while parts and parts[-1][0] == 'code' and text[0] == '}' and parts[-1][1].endswith(';'):
+                parts[-1] = ('code', parts[-1][1][:-1])
+                if not parts[-1][1]:
+                    parts.pop()
+        if space and parts and parts[-1][1][-1] not in '{};,:' and not (kind == 'code' and text[0] in '{};,'):
+            parts.append(('space', ' '))
+        parts.append((kind, text))
+        space = False
+    return ''.join(text for _, text in parts)
+
+
+# =============================================================================
+# JavaScript
+# =============================================================================
+
+def _skip_string(source: str, i: int) -> int:
+    """Index just past the string literal starting at i."""
+    quote, n = source[i], len(source)
+    j = i + 1
+    while j < n and source[j] != quote:
+        j += 2 if source[j] == '\\' else 1
+    return j + 1
+
+
+def _skip_regex(source: str, i: int) -> int:
+    """Index just past the regex literal (and flags) at i, or -1 if it is not one."""
+    j, n, in_class = i + 1, len(source), False
+    while j < n:
+        char = source[j]
+        if char == '\\':
+            j += 2
+            continue
+        if char == '\n':
+            return -1
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            j += 1
+            while j < n and _is_word_char(source[j]):
+                j += 1
+            return j
+        j += 1
+    return -1
+
+
+def _skip_template(source: str, i: int) -> Tuple[int, bool]:
+    """
+    Scan template literal text from i (just past ` or }). Returns the index
+    past the closing ` (False) or past a ${ that opens an expression (True).
+    """
+    j, n = i, len(source)
+    while j < n:
+        char = source[j]
+        if char == '\\':
+            j += 2
+        elif char == '`':
+            return j + 1, False
+        elif source.startswith('${', j):
+            return j + 2, True
+        else:
+            j += 1
+    return n, False
+
+
+def minify_js(source: str) -> str:
+    out: List[str] = []
+    last = ''           # Last significant token, for regex detection
+    pending = ''        # Whitespace seen since the last token: '', ' ' or '\n'
+    templates: List[int] = []  # Brace depth inside each open ${ } expression
+    i, n = 0, len(source)
+
+    def emit(token: str):
+        nonlocal pending, last
+        if out and pending:
+            before = out[-1][-1]
+            if pending == '\n' and before not in _BREAK_AFTER and token[0] not in _BREAK_BEFORE:
+                out.append('\n')
+            elif ((_is_word_char(before) and _is_word_char(token[0])) or
+                  (before, token[0]) in _GLUE or (before.isdigit() and token[0] == '.')):
+                out.append(' ')
+        out.append(token)
+        pending = ''
+        last = token
+
+    while i < n:
+        char = source[i]
+        if char in ' \t\r\n\f\v ﻿':
+            if char == '\n' or pending == '\n':
+                pending = '\n'
+            elif not pending:
+                pending = ' '
+            i += 1
+        elif source.startswith('//', i):
+            end = source.find('\n', i)
+            i = n if end < 0 else end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            end = n if end < 0 else end + 2
+            if '\n' in source[i:end]:
+                pending = '\n'
+            elif not pending:
+                pending = ' '
+            i = end
+        elif char in '"\'':
+            end = _skip_string(source, i)
+            emit(source[i:end])
+            last = '"'
+            i = end
+        elif char == '`' or (char == '}' and templates and templates[-1] == 0):
+            if char == '}':
+                templates.pop()
+            end, opened = _skip_template(source, i + 1)
+            emit(source[i:end])
+            if opened:
+                templates.append(0)
+                last = '('     # An expression starts here
+            else:
+                last = '"'
+            i = end
+        elif char == '/':
+            regex = not last or last in _REGEX_AFTER_WORDS or (
+                not _is_word_char(last[-1]) and last not in (')', ']', '}', '"'))
+            end = _skip_regex(source, i) if regex else -1
+            if end > 0:
+                emit(source[i:end])
+                last = '"'
+                i = end
+            else:
+                emit(char)
+                i += 1
+        elif _is_word_char(char):
+            j = i
+            while j < n and _is_word_char(source[j]):
+                j += 1
+            emit(source[i:j])
+            i = j
+        else:
+            if templates and char == '{':
+                templates[-1] += 1
+            elif templates and char == '}':
+                templates[-1] -= 1
+            emit(char)
+            i += 1
+    return ''.join(out)
+
+
+# =============================================================================
+# HTML
+# =============================================================================
+
+# A tag, with > allowed inside quoted attribute values
+_TAG = re.compile(r'<(?:!--.*?-->|[^>"\']*(?:(?:"[^"]*"|\'[^\']*\')[^>"\']*)*>)', re.S)
+_RAW = re.compile(r'(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2\s*>)', re.S | re.I)
+_JS_TYPE = re.compile(r'\btype\s*=\s*["\']?(?!(?:text/|application/)?(?:java|ecma)script|module)', re.I)
+
+
+def _collapse(text: str) -> str:
+    return re.sub(r'\s+', lambda m: '\n' if '\n' in m.group() else ' ', text)
+
+
+def _minify_markup(html: str) -> str:
+    parts, pos = [], 0
+    for match in _TAG.finditer(html):
+        parts.append(_collapse(html[pos:match.start()]))
+        tag = match.group()
+        # Conditional comments are markup for old browsers; keep them
+        if not tag.startswith('<!--') or tag.startswith('<!--['):
+            parts.append(tag)
+        pos = match.end()
+    parts.append(_collapse(html[pos:]))
+    return re.sub(r'\n\s*\n', '\n', ''.join(parts))
+
+
+def minify_html(html: str) -> str:
+    parts, pos = [], 0
+    for match in _RAW.finditer(html):
+        parts.append(_minify_markup(html[pos:match.start()]))
+        opening, name, body, closing = match.groups()
+        name = name.lower()
+        if name == 'script' and body.strip() and not _JS_TYPE.search(opening):
+            body = minify_js(body)
+        elif name == 'style':
+            body = minify_css(body)
+        parts.append(opening + body + closing)
+        pos = match.end()
+    parts.append(_minify_markup(html[pos:]))
+    return ''.join(parts).strip() + '\n'
+
+
+# =============================================================================
+# Critical CSS
+# =============================================================================
+
+def _css_blocks(css: str):
+    """Top-level (prelude, body) pairs of minified CSS; body is None for @import and friends."""
+    i, n, start, depth = 0, len(css), 0, 0
+    body_start = 0
+    while i < n:
+        char = css[i]
+        if char in '"\'':
+            i = _skip_string(css, i)
+            continue
+        if char == '{':
+            if depth == 0:
+                prelude, body_start = css[start:i].strip(), i + 1
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                yield prelude, css[body_start:i]
+                start = i + 1
+        elif char == ';' and depth == 0:
+            yield css[start:i].strip(), None
+            start = i + 1
+        i += 1
+
+
+def page_selectors(html: str) -> Tuple[Set[str], Set[str], Set[str]]:
+    """Tag names, classes and ids in a page's static markup (scripts excluded)."""
+    markup = _RAW.sub(lambda m: m.group(1) + m.group(4), html)
+    tags = {m.lower() for m in re.findall(r'<([a-zA-Z][\w-]*)', markup)}
+    classes = {c for value in re.findall(r'\bclass\s*=\s*["\']([^"\']*)', markup) for c in value.split()}
+    ids = set(re.findall(r'\bid\s*=\s*["\']([^"\']+)', markup))
+    return tags, classes, ids
+
+
+def _split_selectors(prelude: str) -> List[str]:
+    selectors, depth, start = [], 0, 0
+    for i, char in enumerate(prelude):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            selectors.append(prelude[start:i])
+            start = i + 1
+    selectors.append(prelude[start:])
+    return selectors
+
+
+def _selector_matches(selector: str, tags: Set[str], classes: Set[str], ids: Set[str]) -> bool:
+    # Pseudo-classes (with their arguments) and attribute tests do not narrow the match
+    bare = re.sub(r'::?[\w-]+(\((?:[^()]|\([^()]*\))*\))?', '', selector)
+    bare = re.sub(r'\[[^\]]*\]', '', bare)
+    needed_tags = {t.lower() for t in re.findall(r'(?:^|[\s>+~])([a-zA-Z][\w-]*)', bare)}
+    return (needed_tags <= tags and set(re.findall(r'\.([\w-]+)', bare)) <= classes and
+            set(re.findall(r'#([\w-]+)', bare)) <= ids)
+
+
+def critical_css(css: str, html: str) -> str:
+    """
+    The rules of minified css whose selectors can match elements in the
+    page's markup, inside their @media/@supports blocks. @import,
+    @font-face and @keyframes are left to the full stylesheet.
+    """
+    tags, classes, ids = page_selectors(html)
+
+    def select(css_text: str) -> str:
+        kept = []
+        for prelude, body in _css_blocks(css_text):
+            if body is None:
+                continue
+            if prelude.startswith('@'):
+                if re.match(r'@(media|supports)\b', prelude):
+                    inner = select(body)
+                    if inner:
+                        kept.append(f"{prelude}{{{inner}}}")
+                continue
+            selectors = [s for s in _split_selectors(prelude) if _selector_matches(s, tags, classes, ids)]
+            if selectors:
+                kept.append(f"{','.join(selectors)}{{{body}}}")
+        return ''.join(kept)
+
+    return select(css)
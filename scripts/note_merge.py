@@ -0,0 +1,100 @@
+"""
+Note Merge Engine for Other Family Recipes
+
+Shared by the tip-merge scripts to add tips to a recipe's notes without
+duplicating what is already there. Each recipe gets a NoteSet holding:
+
+1. A set of normalized fingerprints (casefolded, whitespace and punctuation
+   stripped) for exact duplicates like "Chill well." vs "chill  well"
+2. A k-gram index over the fingerprints for near-duplicates where one note
+   contains the other ("Serve warm." inside "Serve warm. Keeps 3 days.")
+
+Containment is only checked for fingerprints of at least CONTAINMENT_MIN
+characters and only against notes sharing a k-gram, so merging hundreds of
+tips into a heavily annotated recipe stays linear in the text size.
+
+Usage (as a module):
+    from note_merge import merge_notes
+    added = merge_notes(recipe, ["Tip one.", "Tip two."])
+"""
+
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+# Fingerprints shorter than this are only deduped exactly; short notes
+# like "Enjoy!" would otherwise match inside almost anything.
+CONTAINMENT_MIN = 16
+
+
+def fingerprint(text: str) -> str:
+    """Casefolded text with accents, whitespace and punctuation removed."""
+    text = unicodedata.normalize('NFKD', str(text or '')).casefold()
+    return ''.join(c for c in text if c.isalnum())
+
+
+class NoteSet:
+    """A recipe's notes plus the indexes used to dedupe new ones."""
+
+    def __init__(self, notes: List[str]):
+        self.notes = notes
+        self.fingerprints = set()
+        self.prints = []
+        # First k-gram of each long fingerprint -> note ordinals
+        self.heads = defaultdict(list)
+        # Every k-gram of every long fingerprint -> note ordinals
+        self.grams = defaultdict(set)
+        for note in notes:
+            if note:
+                self._index(fingerprint(note))
+
+    def _index(self, fp: str):
+        ordinal = len(self.prints)
+        self.prints.append(fp)
+        self.fingerprints.add(fp)
+        if len(fp) >= CONTAINMENT_MIN:
+            self.heads[fp[:CONTAINMENT_MIN]].append(ordinal)
+            for i in range(len(fp) - CONTAINMENT_MIN + 1):
+                self.grams[fp[i:i + CONTAINMENT_MIN]].add(ordinal)
+
+    def contains(self, text: str) -> bool:
+        """True if text is an exact or containment duplicate of an existing note."""
+        fp = fingerprint(text)
+        if fp in self.fingerprints:
+            return True
+        if len(fp) < CONTAINMENT_MIN:
+            return False
+
+        # New note inside an existing one: its first k-gram must be indexed
+        for ordinal in self.grams.get(fp[:CONTAINMENT_MIN], ()):
+            if fp in self.prints[ordinal]:
+                return True
+
+        # Existing note inside the new one: some k-gram of the new note
+        # starts an existing fingerprint
+        for i in range(len(fp) - CONTAINMENT_MIN + 1):
+            for ordinal in self.heads.get(fp[i:i + CONTAINMENT_MIN], ()):
+                if self.prints[ordinal] in fp:
+                    return True
+        return False
+
+    def add(self, text: str) -> bool:
+        """Append text unless it duplicates an existing note."""
+        if not text or self.contains(text):
+            return False
+        self.notes.append(text)
+        self._index(fingerprint(text))
+        return True
+
+
+def merge_notes(recipe: Dict, tips: Iterable[str]) -> int:
+    """Merge tips into recipe['notes'], returning how many were added."""
+    notes = recipe.get('notes')
+    if not isinstance(notes, list):
+        notes = []
+
+    note_set = NoteSet(notes)
+    added = sum(1 for tip in tips if note_set.add(tip))
+    if added:
+        recipe['notes'] = notes
+    return added
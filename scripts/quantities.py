@@ -0,0 +1,223 @@
+"""
+Quantity and Unit Parsing for Other Family Recipes
+
+Shared by the nutrition and conversion scripts. Turns the free-text
+'quantity' / 'unit' fields of recipe ingredients into numbers and
+canonical units:
+
+    parse_quantity("1 1/2")  -> 1.5
+    parse_quantity("2-3")    -> 2.5   (ranges use the midpoint)
+    parse_quantity("½")      -> 0.5
+    parse_quantity_range("2-3") -> (2.0, 3.0)
+    normalize_unit("Tbsp.")  -> 'tbsp'
+    parse_yield("12 muffins") -> 12.0
+    parse_yield("2 dozen")    -> 24.0
+    parse_minutes("1 hour 10 minutes") -> (70.0, 70.0)
+    parse_minutes("20-25 min")         -> (20.0, 25.0)
+
+Canonical units fall in three groups: volume (VOLUME_ML), weight
+(WEIGHT_G) and count (COUNT_UNITS). Anything else ('large box',
+'package', 'can') is unknown and has no fixed size.
+
+Usage (as a module):
+    from quantities import parse_quantity, normalize_unit, VOLUME_ML, WEIGHT_G
+"""
+
+import re
+from typing import Optional, Tuple
+
+UNICODE_FRACTIONS = {
+    '½': '1/2', '⅓': '1/3', '⅔': '2/3', '¼': '1/4', '¾': '3/4',
+    '⅕': '1/5', '⅖': '2/5', '⅗': '3/5', '⅘': '4/5', '⅙': '1/6',
+    '⅚': '5/6', '⅛': '1/8', '⅜': '3/8', '⅝': '5/8', '⅞': '7/8',
+}
+
+# Millilitres per canonical volume unit (US customary)
+VOLUME_ML = {
+    'cup': 236.588,
+    'tbsp': 14.787,
+    'tsp': 4.929,
+    'fl oz': 29.574,
+    'pint': 473.176,
+    'quart': 946.353,
+    'gallon': 3785.41,
+    'ml': 1.0,
+    'l': 1000.0,
+    'pinch': 0.308,  # 1/16 tsp
+    'dash': 0.616,   # 1/8 tsp
+}
+
+# Grams per canonical weight unit
+WEIGHT_G = {
+    'g': 1.0,
+    'kg': 1000.0,
+    'oz': 28.3495,
+    'lb': 453.592,
+    'stick': 113.4,  # butter/margarine
+}
+
+# Units that mean "this many of the item"
+COUNT_UNITS = {'each', 'large', 'medium', 'small', 'whole', 'clove', 'slice'}
+
+UNIT_ALIASES = {
+    'cup': 'cup', 'cups': 'cup', 'c': 'cup',
+    'tablespoon': 'tbsp', 'tablespoons': 'tbsp', 'tbsp': 'tbsp', 'tbs': 'tbsp',
+    'tbl': 'tbsp', 'T': 'tbsp',
+    'teaspoon': 'tsp', 'teaspoons': 'tsp', 'tsp': 'tsp', 't': 'tsp',
+    'fluid ounce': 'fl oz', 'fluid ounces': 'fl oz', 'fl oz': 'fl oz', 'fl. oz': 'fl oz',
+    'pint': 'pint', 'pints': 'pint', 'pt': 'pint',
+    'quart': 'quart', 'quarts': 'quart', 'qt': 'quart',
+    'gallon': 'gallon', 'gallons': 'gallon', 'gal': 'gallon',
+    'milliliter': 'ml', 'milliliters': 'ml', 'millilitre': 'ml', 'millilitres': 'ml', 'ml': 'ml',
+    'liter': 'l', 'liters': 'l', 'litre': 'l', 'litres': 'l', 'l': 'l',
+    'pinch': 'pinch', 'pinches': 'pinch',
+    'dash': 'dash', 'dashes': 'dash',
+    'gram': 'g', 'grams': 'g', 'g': 'g',
+    'kilogram': 'kg', 'kilograms': 'kg', 'kg': 'kg',
+    'ounce': 'oz', 'ounces': 'oz', 'oz': 'oz',
+    'pound': 'lb', 'pounds': 'lb', 'lb': 'lb', 'lbs': 'lb',
+    'stick': 'stick', 'sticks': 'stick',
+    '': 'each', 'each': 'each', 'ea': 'each', 'whole': 'whole',
+    'large': 'large', 'lg': 'large', 'medium': 'medium', 'med': 'medium',
+    'small': 'small', 'sm': 'small',
+    'clove': 'clove', 'cloves': 'clove', 'slice': 'slice', 'slices': 'slice',
+}
+
+_RANGE = re.compile(r'^(.+?)\s*(?:-|–|to)\s*(.+)$')
+_NUMBER = re.compile(r'(\d+\s+\d+/\d+|\d+/\d+|\d+(?:\.\d+)?)')
+_HYPHEN_MIXED = re.compile(r'^(\d+)-(\d+/\d+)$')  # '1-1/2' means 1 1/2, not a range
+
+
+def _parse_number(text: str) -> Optional[float]:
+    """'2', '0.5', '3/4' or '2 3/4' -> float."""
+    parts = text.split()
+    try:
+        if len(parts) == 2 and '/' in parts[1]:
+            num, den = parts[1].split('/')
+            return float(parts[0]) + float(num) / float(den)
+        if len(parts) == 1:
+            if '/' in parts[0]:
+                num, den = parts[0].split('/')
+                return float(num) / float(den)
+            return float(parts[0])
+    except (ValueError, ZeroDivisionError):
+        return None
+    return None
+
+
+_FRACTION_CHARS = re.compile(r'(\d?)([' + ''.join(UNICODE_FRACTIONS) + r'])')
+
+
+def _expand_fractions(text: str) -> str:
+    """'1½' -> '1 1/2', '¾' -> '3/4'."""
+    if text.isascii():
+        return text
+    return _FRACTION_CHARS.sub(
+        lambda m: (m.group(1) + ' ' if m.group(1) else '') + UNICODE_FRACTIONS[m.group(2)], text)
+
+
+def is_range(qty) -> bool:
+    text = _expand_fractions(str(qty or '')).strip()
+    return bool(_RANGE.match(text)) and not _HYPHEN_MIXED.match(text)
+
+
+def parse_quantity_range(qty) -> Optional[Tuple[float, float]]:
+    """Parse an ingredient quantity to (low, high); equal for single values, None if unparseable."""
+    if qty is None or isinstance(qty, bool):
+        return None
+    if isinstance(qty, (int, float)):
+        return float(qty), float(qty)
+
+    text = _expand_fractions(str(qty)).strip()
+    if not text or '[UNCLEAR]' in text:
+        return None
+    text = _HYPHEN_MIXED.sub(r'\1 \2', text)
+
+    value = _parse_number(text)
+    if value is not None:
+        return value, value
+
+    match = _RANGE.match(text)
+    if match:
+        low, high = _parse_number(match.group(1)), _parse_number(match.group(2))
+        if low is not None and high is not None:
+            return low, high
+    return None
+
+
+def parse_quantity(qty) -> Optional[float]:
+    """Parse an ingredient quantity to a float. Ranges give their midpoint; None if unparseable."""
+    bounds = parse_quantity_range(qty)
+    if bounds is None:
+        return None
+    return (bounds[0] + bounds[1]) / 2
+
+
+def normalize_unit(unit) -> Optional[str]:
+    """Canonical unit name, or None if the unit has no fixed size."""
+    text = str(unit or '').strip().rstrip('.')
+    if text in UNIT_ALIASES:  # case-sensitive 'T' / 't'
+        return UNIT_ALIASES[text]
+    return UNIT_ALIASES.get(' '.join(text.casefold().split()))
+
+
+_DURATION_UNITS = [
+    (re.compile(r'^(?:hours?|hrs?|h)\b'), 60.0),
+    (re.compile(r'^(?:minutes?|mins?|m)\b'), 1.0),
+    (re.compile(r'^(?:seconds?|secs?|s)\b'), 1 / 60),
+]
+_DURATION_PART = re.compile(
+    r'(\d+(?:\.\d+)?(?:\s+\d+/\d+|/\d+)?)(?:\s*(?:-|–|to)\s*(\d+(?:\.\d+)?(?:\s+\d+/\d+|/\d+)?))?\s*([a-z]*)')
+
+
+def parse_minutes(text) -> Optional[Tuple[float, float]]:
+    """
+    (low, high) minutes from a time string ('45 minutes', '1 hour 10 min',
+    '1-2 hours', '1½ hrs'); equal for single values, None if unparseable.
+    A number without a unit counts as minutes.
+    """
+    if text is None or isinstance(text, bool):
+        return None
+    if isinstance(text, (int, float)):
+        return float(text), float(text)
+
+    text = _expand_fractions(str(text)).casefold()
+    low = high = 0.0
+    found = False
+    for match in _DURATION_PART.finditer(text):
+        first = _parse_number(match.group(1))
+        second = _parse_number(match.group(2)) if match.group(2) else first
+        if first is None or second is None:
+            continue
+        scale = 1.0
+        for pattern, minutes in _DURATION_UNITS:
+            if pattern.match(match.group(3)):
+                scale = minutes
+                break
+        low += first * scale
+        high += second * scale
+        found = True
+    return (low, high) if found else None
+
+
+def parse_yield(servings) -> Optional[float]:
+    """Number of servings from servings_yield ('12 muffins', '6-8', '2 dozen', 12)."""
+    if servings is None or isinstance(servings, bool):
+        return None
+    if isinstance(servings, (int, float)):
+        return float(servings) if servings > 0 else None
+
+    text = _expand_fractions(str(servings)).casefold()
+    numbers = [_parse_number(n) for n in _NUMBER.findall(text)]
+    numbers = [n for n in numbers if n]
+    if not numbers:
+        return 12.0 if re.search(r'\bdozen\b', text) else None
+
+    if len(numbers) >= 2 and re.search(r'\d\s*(?:-|–|to)\s*\d', text):
+        value = (numbers[0] + numbers[1]) / 2
+    else:
+        value = numbers[0]
+
+    if re.search(r'\bdozen\b', text):
+        value *= 12
+    return value
@@ -0,0 +1,367 @@
+"""
+Recipe HTML Rendering for Other Family Recipes
+
+Python counterparts of the recipe-page renderers in script.js
+(renderRecipeDetail, renderIngredientsList, renderNutrition, ...), for
+pages generated ahead of time. The markup and escaping follow script.js
+so a pre-rendered page looks exactly like one rendered in the browser:
+
+    escape_html   like escapeHtml: &, <, > (and U+00A0 as &nbsp;)
+    escape_attr   like escapeAttr: &, ", ', <, >
+    sanitize_url  like sanitizeUrl: relative paths and http(s) only
+    encode_path   like encodePath: every path segment percent-encoded
+
+Values are stringified the way JavaScript would (12.0 -> "12",
+True -> "true", lists joined with commas). Keep this file in step with
+script.js when the recipe page markup changes.
+
+Usage (as a module):
+    from recipe_html import render_recipe
+    html = render_recipe(recipe, variants=[...], tips=[...])
+"""
+
+import math
+import re
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+TIP_CATEGORY_LABELS = {
+    'selection': 'Selecting',
+    'storage': 'Storage',
+    'preparation': 'Prep Tips',
+    'cooking': 'Cooking',
+    'substitution': 'Substitutions',
+    'technique': 'Technique',
+    'equipment': 'Equipment',
+    'safety': 'Safety',
+    'serving': 'Serving',
+}
+
+NUTRITION_ITEMS = [
+    ('calories', '', 'Calories'),
+    ('fat_g', 'g', 'Fat'),
+    ('carbs_g', 'g', 'Carbs'),
+    ('protein_g', 'g', 'Protein'),
+    ('sodium_mg', 'mg', 'Sodium'),
+    ('fiber_g', 'g', 'Fiber'),
+    ('sugar_g', 'g', 'Sugar'),
+]
+
+# Box the original scan thumbnails are fitted into (SCAN_THUMB_WIDTH/HEIGHT in script.js)
+SCAN_THUMB_WIDTH = 200
+SCAN_THUMB_HEIGHT = 150
+
+_MISSING = object()
+
+
+def js_str(value) -> str:
+    """String(value) as JavaScript would produce it."""
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, float):
+        if value == int(value) and abs(value) < 1e21:
+            return str(int(value))
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return ','.join('' if v is None else js_str(v) for v in value)
+    if isinstance(value, dict):
+        return '[object Object]'
+    return str(value)
+
+
+def escape_html(text) -> str:
+    if text is None:
+        return ''
+    return (js_str(text).replace('&', '&amp;').replace('<', '&lt;')
+            .replace('>', '&gt;').replace('\u00a0', '&nbsp;'))
+
+
+def escape_attr(value) -> str:
+    if value is None:
+        return ''
+    return (js_str(value).replace('&', '&amp;').replace('"', '&quot;')
+            .replace("'", '&#x27;').replace('<', '&lt;').replace('>', '&gt;'))
+
+
+def sanitize_url(url) -> str:
+    if not url:
+        return '#'
+    trimmed = str(url).strip()
+    if trimmed.startswith(('/', './', '../', 'http://', 'https://')):
+        return trimmed
+    if re.fullmatch(r'[a-zA-Z0-9_\-./%]+', trimmed) and ':' not in trimmed:
+        return trimmed
+    return '#'
+
+
+def capitalize_first(text) -> str:
+    if not text:
+        return ''
+    text = js_str(text)
+    return text[:1].upper() + text[1:]
+
+
+def page_name(recipe_id) -> str:
+    """File name (without .html) of a recipe's page; pageName() in script.js."""
+    return re.sub(r'[^A-Za-z0-9_-]', '-', str(recipe_id)) or 'recipe'
+
+
+# =============================================================================
+# Sections (same order and markup as script.js)
+# =============================================================================
+
+def render_ingredients_list(ingredients: List[Dict]) -> str:
+    items = []
+    for ing in ingredients:
+        prep = (f'<span class="ingredient-prep">, {escape_html(ing.get("prep_note"))}</span>'
+                if ing.get('prep_note') else '')
+        items.append(
+            f'<li><span class="ingredient-quantity">{escape_html(ing.get("quantity"))} '
+            f'{escape_html(ing.get("unit"))}</span>'
+            f'<span class="ingredient-item">{escape_html(ing.get("item"))}{prep}</span></li>')
+    return f'<ul class="ingredients-list">{"".join(items)}</ul>'
+
+
+def render_nutrition(nutrition: Optional[Dict], servings) -> str:
+    if not nutrition or nutrition.get('status') == 'insufficient_data':
+        missing = (nutrition or {}).get('missing_inputs') or []
+        if missing:
+            return ('<section class="nutrition-section nutrition-incomplete"><h3>Nutrition Information</h3>'
+                    f'<p class="text-muted">Nutrition data incomplete. Missing: {escape_html(", ".join(map(js_str, missing)))}</p>'
+                    '</section>')
+        return ''
+
+    n = nutrition.get('per_serving')
+    if not n:
+        return ''
+
+    items = []
+    for key, unit, label in NUTRITION_ITEMS:
+        value = n.get(key, _MISSING)
+        if value is None:
+            continue
+        shown = '' if value is _MISSING else escape_html(value)
+        items.append(f'<div class="nutrition-item"><span class="nutrition-value">{shown}{unit}</span>'
+                     f'<span class="nutrition-label">{label}</span></div>')
+
+    per_serving = ' <span class="text-muted">(per serving)</span>' if servings else ''
+    assumptions = nutrition.get('assumptions') or []
+    notes = (f'<p class="nutrition-assumptions text-muted"><small>Assumptions: '
+             f'{escape_html("; ".join(map(js_str, assumptions)))}</small></p>') if assumptions else ''
+    return (f'<section class="nutrition-section"><h3>Nutrition Information{per_serving}</h3>'
+            f'<div class="nutrition-grid">{"".join(items)}</div>{notes}</section>')
+
+
+def render_quick_facts(recipe: Dict) -> str:
+    facts = [(label, recipe.get(field)) for label, field in
+             (('Yield', 'servings_yield'), ('Prep', 'prep_time'), ('Cook', 'cook_time'),
+              ('Total', 'total_time'), ('Temp', 'temperature')) if recipe.get(field)]
+    if not facts:
+        return ''
+    return '<div class="recipe-quick-facts">' + ''.join(
+        f'<div class="quick-fact"><span class="quick-fact-label">{escape_html(label)}</span>'
+        f'<span class="quick-fact-value">{escape_html(value)}</span></div>'
+        for label, value in facts) + '</div>'
+
+
+def render_instructions(instructions: List[Dict]) -> str:
+    items = []
+    for inst in instructions or []:
+        text = js_str(inst.get('text') if isinstance(inst, dict) else inst)
+        inferred = '[INFERRED]' in text
+        text = text.replace('[INFERRED] ', '', 1)
+        items.append(f'<li class="{"inferred" if inferred else ""}">{escape_html(text)}</li>')
+    return f'<ol class="instructions-list">{"".join(items)}</ol>'
+
+
+def render_oven_directions(directions: List[Dict]) -> str:
+    return ('<section class="sub-recipe"><h3>Oven Directions (Alternative)</h3><ol class="instructions-list">'
+            + ''.join(f'<li>{escape_html(d.get("text"))}</li>' for d in directions)
+            + '</ol></section>')
+
+
+def render_frosting(frosting: Dict) -> str:
+    ingredients = ''.join(
+        f'<li><span class="ingredient-quantity">{escape_html(ing.get("quantity"))} {escape_html(ing.get("unit"))}</span>'
+        f'<span class="ingredient-item">{escape_html(ing.get("item"))}</span></li>'
+        for ing in frosting.get('ingredients') or [])
+    return (f'<section class="sub-recipe"><h3>{escape_html(frosting.get("name"))}</h3>'
+            f'<h4>Ingredients:</h4><ul class="ingredients-list">{ingredients}</ul>'
+            f'<h4>Instructions:</h4><p>{escape_html(frosting.get("instructions"))}</p></section>')
+
+
+def render_notes(notes: List[str]) -> str:
+    return ('<section class="notes-section"><h3>Notes</h3><ul>'
+            + ''.join(f'<li>{escape_html(note)}</li>' for note in notes) + '</ul></section>')
+
+
+def render_tags(tags: Optional[List[str]]) -> str:
+    if not tags:
+        return ''
+    return ('<div class="recipe-tags">'
+            + ''.join(f'<span class="recipe-tag">{escape_html(tag)}</span>' for tag in tags) + '</div>')
+
+
+def render_related_tips(tips: List[Dict]) -> str:
+    if not tips:
+        return ''
+    cards = []
+    for tip in tips:
+        related = tip.get('related_ingredients') or []
+        related_html = (f'<div class="tip-ingredients"><small>Related: '
+                        f'{", ".join(escape_html(i) for i in related)}</small></div>') if related else ''
+        label = TIP_CATEGORY_LABELS.get(tip.get('category'), tip.get('category'))
+        cards.append(
+            f'<div class="tip-card" data-tip-id="{escape_attr(tip.get("id"))}">'
+            f'<div class="tip-header"><span class="tip-category">{escape_html(label)}</span>'
+            f'<h4 class="tip-title">{escape_html(tip.get("title"))}</h4></div>'
+            f'<p class="tip-content">{escape_html(tip.get("content"))}</p>{related_html}</div>')
+    return f'<section class="tips-section"><h3>Related Tips</h3><div class="tips-list">{"".join(cards)}</div></section>'
+
+
+def render_confidence_flags(flags: Optional[List[Dict]]) -> str:
+    if not flags:
+        return ''
+    items = []
+    for flag in flags:
+        candidates = flag.get('candidates') or []
+        possible = (f'<br><em>Possible values: {escape_html(", ".join(map(js_str, candidates)))}</em>'
+                    if candidates else '')
+        items.append(f'<li><strong>{escape_html(flag.get("field"))}:</strong> {escape_html(flag.get("issue"))}{possible}</li>')
+    return ('<section class="notes-section" style="border-left-color: #f0ad4e;"><h3>Transcription Notes</h3>'
+            f'<ul>{"".join(items)}</ul></section>')
+
+
+def encode_path(path) -> str:
+    """encodePath() in script.js: percent-encode every segment, including !'()*~."""
+    return '/'.join(quote(part, safe='').replace('~', '%7E') for part in js_str(path).split('/'))
+
+
+def srcset_for(variants: List[Dict]) -> str:
+    return ', '.join(f"{sanitize_url(encode_path(v['url']))} {js_str(v['width'])}w" for v in variants)
+
+
+def js_round(value: float) -> int:
+    """Math.round: halves round up."""
+    return math.floor(value + 0.5)
+
+
+def render_responsive_scan(src: str, entry: Dict) -> str:
+    """renderResponsiveScan() in script.js."""
+    scale = min(SCAN_THUMB_WIDTH / entry['width'], SCAN_THUMB_HEIGHT / entry['height'], 1)
+    width = max(1, js_round(entry['width'] * scale))
+    height = max(1, js_round(entry['height'] * scale))
+    variants = entry.get('variants') or {}
+    webp = variants.get('webp') if entry.get('format') != 'webp' else None
+    own = variants.get(entry.get('format')) or []
+    placeholder = entry.get('placeholder')
+    if not (placeholder and re.fullmatch(r'#[0-9a-f]{6}', str(placeholder.get('color')))):
+        placeholder = None
+    source = (f'<source type="image/webp" srcset="{escape_attr(srcset_for(webp))}" sizes="{width}px">'
+              if webp else '')
+    blur = f'data-blurhash="{escape_attr(placeholder["blurhash"])}" ' if placeholder else ''
+    background = (f' background-color: {placeholder["color"]}; background-size: 100% 100%;'
+                  if placeholder else '')
+    return (f'<picture>{source}<img src="{escape_attr(src)}" srcset="{escape_attr(srcset_for(own))}" '
+            f'sizes="{width}px" width="{width}" height="{height}" loading="lazy" decoding="async" '
+            f'alt="Original recipe scan" class="scan-thumbnail" {blur}'
+            f'style="max-width: 200px; max-height: 150px; object-fit: cover;{background}"></picture>')
+
+
+def render_original_scan(image_refs: Optional[List[str]], base_path: str = 'data/',
+                         images: Optional[Dict[str, Dict]] = None) -> str:
+    """The scan thumbnails; images maps ref -> image manifest entry (build_images.py)."""
+    if not image_refs:
+        return ''
+    links = []
+    for ref in image_refs:
+        src = sanitize_url(encode_path(base_path + js_str(ref)))
+        entry = (images or {}).get(ref) if isinstance(ref, str) else None
+        if entry:
+            img = render_responsive_scan(src, entry)
+        else:
+            img = (f'<img src="{escape_attr(src)}" alt="Original recipe scan" class="scan-thumbnail" '
+                   f'style="max-width: 200px; max-height: 150px; object-fit: cover;">')
+        links.append(f'<a href="{escape_attr(src)}" target="_blank">{img}</a>')
+    return f'<section class="original-scan"><h3>Original Scan</h3>{"".join(links)}</section>'
+
+
+def format_minutes(minutes: float) -> str:
+    """formatMinutes() in script.js: '45 min', '1 hr 10 min'."""
+    hours, rest = int(minutes // 60), int(round(minutes % 60))
+    if hours == 0:
+        return f"{rest} min"
+    return f"{hours} hr {rest} min" if rest else f"{hours} hr"
+
+
+def variant_time_ranges(group: Optional[Dict]) -> str:
+    """variantTimeRanges() in script.js: 'Prep 10-15 min · Cook 1 hr'."""
+    if not group:
+        return ''
+    parts = []
+    for key, label in (('prep_minutes', 'Prep'), ('cook_minutes', 'Cook'), ('total_minutes', 'Total')):
+        if not group.get(key):
+            continue
+        low, high = group[key]
+        if low == high:
+            shown = format_minutes(low)
+        elif high < 60:
+            shown = f"{round(low)}-{round(high)} min"
+        else:
+            shown = f"{format_minutes(low)}-{format_minutes(high)}"
+        parts.append(f"{label} {shown}")
+    return ' · '.join(parts)
+
+
+def render_variants_dropdown(recipe: Dict, variants: List[Dict], times: str = '') -> str:
+    options = ''.join(
+        f'<option value="{escape_attr(v.get("id"))}">{escape_html(v.get("source_note") or v.get("title"))}'
+        f'{" - " + escape_html(js_str(v["variant_notes"])[:50]) + "..." if v.get("variant_notes") else ""}</option>'
+        for v in variants)
+    times_html = f'<small class="text-muted">{escape_html(times)}</small>' if times else ''
+    return ('<div class="variants-dropdown"><label for="variant-select">Variants:</label>'
+            '<select id="variant-select" class="variant-select">'
+            f'<option value="{escape_attr(recipe.get("id"))}" selected>'
+            f'{escape_html(recipe.get("source_note") or "Current version")}</option>{options}</select>{times_html}</div>')
+
+
+def render_recipe(recipe: Dict, variants: Optional[List[Dict]] = None, tips: Optional[List[Dict]] = None,
+                  variant_times: str = '', images: Optional[Dict[str, Dict]] = None) -> str:
+    """The <article> renderRecipeDetail puts in #recipe-content (US units)."""
+    confidence = (recipe.get('confidence') or {}).get('overall') or 'high'
+    conversions = recipe.get('conversions') or {}
+
+    header = [f'<h1>{escape_html(recipe.get("title"))}</h1>']
+    if recipe.get('attribution'):
+        header.append(f'<p class="recipe-attribution">From: {escape_html(recipe["attribution"])}</p>')
+    if recipe.get('source_note'):
+        header.append(f'<p class="recipe-source">{escape_html(recipe["source_note"])}</p>')
+    if recipe.get('description'):
+        header.append(f'<p>{escape_html(recipe["description"])}</p>')
+    header.append(
+        f'<div class="header-controls"><div class="confidence-indicator confidence-{escape_attr(confidence)}">'
+        f'Confidence: {escape_html(capitalize_first(confidence))}</div>'
+        f'{render_variants_dropdown(recipe, variants, variant_times) if variants else ""}</div>')
+    metric_button = ('<button id="metric-toggle" class="btn btn-secondary">Show Metric</button>'
+                     if conversions.get('has_conversions') else '')
+    header.append('<div class="action-buttons" style="margin-top: 1rem; display: flex; gap: 0.5rem; flex-wrap: wrap;">'
+                  f'<button id="print-btn" class="btn btn-secondary btn-print">Print Recipe</button>{metric_button}</div>')
+
+    ingredients = [i for i in recipe.get('ingredients') or [] if isinstance(i, dict)]
+    parts = [
+        f'<header class="recipe-header">{"".join(header)}</header>',
+        render_quick_facts(recipe),
+        f'<section class="ingredients-section"><h2>Ingredients</h2>{render_ingredients_list(ingredients)}</section>',
+        f'<section class="instructions-section"><h2>Instructions</h2>{render_instructions(recipe.get("instructions"))}</section>',
+        render_oven_directions(recipe['oven_directions']) if recipe.get('oven_directions') else '',
+        render_frosting(recipe['frosting']) if recipe.get('frosting') else '',
+        render_nutrition(recipe['nutrition'], recipe.get('servings_yield')) if recipe.get('nutrition') else '',
+        render_notes(recipe['notes']) if recipe.get('notes') else '',
+        render_tags(recipe.get('tags')),
+        render_related_tips(tips or []),
+        render_confidence_flags((recipe.get('confidence') or {}).get('flags')),
+        render_original_scan(recipe.get('image_refs'), images=images),
+    ]
+    return f'<article class="recipe-detail">{"".join(parts)}</article>'
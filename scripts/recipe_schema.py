@@ -0,0 +1,351 @@
+"""
+Recipe Schema Compiler for Other Family Recipes
+
+Loads the declarative recipe schema (recipe_schema.json, a JSON Schema
+subset) and compiles it once into specialized Python functions. Every
+object and array node is generated as straight-line Python source - one
+dict lookup and class-set test per declared field, list items of object
+type inlined into the loop - with its allowed classes, enum sets, regexes
+and messages bound as constants. Validating a recipe does no schema
+interpretation, and paths like 'ingredients[2].item' are only formatted
+when a finding is reported.
+
+Supported keywords:
+    type, properties, required, additionalProperties, items, enum,
+    pattern, $ref (to #/definitions/...)
+    x-severity          severity for violations at that node (default error)
+    x-unknown-severity  severity for unknown fields (root-level default)
+
+'required' means present and non-empty (a missing, null, empty string
+or empty list field is reported as missing).
+
+Usage (as a module):
+    from recipe_schema import load_validator
+    validate = load_validator()
+    for severity, message in validate(recipe):
+        ...
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+SCHEMA_FILE = Path(__file__).parent / 'recipe_schema.json'
+
+ERROR = 'error'
+WARNING = 'warning'
+
+# Exact classes produced by json.load for each schema type. Matching on
+# value.__class__ keeps bool out of integer/number without extra checks.
+TYPE_CLASSES = {
+    'string': (str,),
+    'number': (int, float),
+    'integer': (int,),
+    'boolean': (bool,),
+    'array': (list,),
+    'object': (dict,),
+    'null': (type(None),),
+}
+
+TYPE_NAMES = {
+    'string': 'a string',
+    'number': 'a number',
+    'integer': 'an integer',
+    'boolean': 'true/false',
+    'array': 'a list',
+    'object': 'an object',
+    'null': 'null',
+}
+
+Finding = Tuple[str, str]
+
+
+class SchemaError(ValueError):
+    """Raised when the schema file itself is malformed."""
+
+
+class _Missing:
+    """Sentinel for absent fields. Falsy, so required checks are one test."""
+
+    def __bool__(self):
+        return False
+
+
+_MISSING = _Missing()
+
+
+def format_path(loc) -> str:
+    """
+    Build a readable path like 'ingredients[2].item'. Locations are () for
+    the root or (parent_location, key), so nothing is formatted unless a
+    finding is reported.
+    """
+    keys = []
+    while loc:
+        loc, key = loc
+        keys.append(key)
+
+    path = ''
+    for key in reversed(keys):
+        if isinstance(key, int):
+            path += f"[{key}]"
+        else:
+            path = f"{path}.{key}" if path else key
+    return path or 'value'
+
+
+class Node:
+    """
+    A compiled schema node.
+
+    classes: allowed value classes (None = any), checked by whoever holds
+    the value (parent object, list loop or root). func: name of the
+    generated function for everything else (enum, pattern, fields, items),
+    or None when the class check is all there is.
+    """
+
+    def __init__(self, spec: Dict, severity: str):
+        self.spec = spec
+        self.severity = severity
+        self.classes = None
+        self.expected = None
+        self.func = None
+        self.fields = None  # object nodes: {name: Node}
+        self.items = None   # array nodes: item Node
+
+
+class SchemaCompiler:
+    """Generates checker source for each schema node and execs it once."""
+
+    def __init__(self, schema: Dict):
+        self.schema = schema
+        self.definitions = schema.get('definitions', {})
+        self.unknown_severity = schema.get('x-unknown-severity', WARNING)
+        self.env = {'MISSING': _MISSING, 'format_path': format_path}
+        self.sources = {}
+        self._refs = {}
+        self._counter = 0
+
+    def _const(self, value) -> str:
+        """Bind a constant into the generated code's namespace."""
+        self._counter += 1
+        name = f"C{self._counter}"
+        self.env[name] = value
+        return name
+
+    def _source(self, signature: str, lines: List[str]) -> str:
+        """
+        Function source with every constant, helper and nested checker it
+        references bound as a default argument, so lookups are fast locals
+        instead of globals.
+        """
+        body = "\n".join(lines)
+        names = sorted(set(re.findall(r'\b(C\d+|check_\d+|MISSING|format_path)\b', body)))
+        params = signature + ''.join(f", {n}={n}" for n in names)
+        return f"def {params}):\n{body}\n"
+
+    def _define(self, lines: List[str]) -> str:
+        """Compile one generated function and return its name."""
+        self._counter += 1
+        name = f"check_{self._counter}"
+        source = self._source(f"{name}(value, loc, out", lines)
+        exec(compile(source, f'<recipe_schema:{name}>', 'exec'), self.env)
+        self.sources[name] = source
+        return name
+
+    def compile(self) -> Callable[[object], List[Finding]]:
+        root = self.node(self.schema)
+        lines = ["    out = []"]
+        lines += self._value_lines(root, 'value', '()', '    ')
+        lines.append("    return out")
+        source = self._source("validate(value", lines)
+        exec(compile(source, '<recipe_schema:validate>', 'exec'), self.env)
+        self.sources['validate'] = source
+        return self.env['validate']
+
+    def resolve(self, ref: str) -> Node:
+        if ref in self._refs:
+            node = self._refs[ref]
+            if node is None:
+                raise SchemaError(f"Recursive $ref is not supported: {ref}")
+            return node
+
+        prefix = '#/definitions/'
+        name = ref[len(prefix):]
+        if not ref.startswith(prefix) or name not in self.definitions:
+            raise SchemaError(f"Unresolvable $ref: {ref}")
+
+        self._refs[ref] = None
+        node = self.node(self.definitions[name])
+        self._refs[ref] = node
+        return node
+
+    def node(self, spec: Dict) -> Node:
+        if '$ref' in spec:
+            return self.resolve(spec['$ref'])
+
+        node = Node(spec, spec.get('x-severity', ERROR))
+
+        types = spec.get('type')
+        if types is not None:
+            names = types if isinstance(types, list) else [types]
+            unknown = [n for n in names if n not in TYPE_CLASSES]
+            if unknown:
+                raise SchemaError(f"Unknown type(s): {', '.join(unknown)}")
+            node.classes = frozenset(c for n in names for c in TYPE_CLASSES[n])
+            node.expected = ' or '.join(TYPE_NAMES[n] for n in names)
+
+        if 'properties' in spec or 'required' in spec or 'additionalProperties' in spec:
+            node.fields = {name: self.node(sub) for name, sub in spec.get('properties', {}).items()}
+        if 'items' in spec:
+            node.items = self.node(spec['items'])
+
+        lines = []
+        if 'enum' in spec:
+            lines += self._enum_lines(node)
+        if 'pattern' in spec:
+            lines += self._pattern_lines(node)
+        if node.fields is not None:
+            lines += ["    if value.__class__ is dict:"]
+            lines += self._object_lines(node, 'value', 'loc', '        ')
+        if node.items is not None:
+            item_lines = self._value_lines(node.items, 'item', '(loc, i)', '            ')
+            if item_lines:
+                lines += ["    if value.__class__ is list:",
+                          "        for i, item in enumerate(value):"] + item_lines
+
+        if lines:
+            node.func = self._define(lines)
+        return node
+
+    def _enum_lines(self, node: Node) -> List[str]:
+        allowed = self._const(frozenset(node.spec['enum']))
+        sev = self._const(node.severity)
+        return [
+            "    try:",
+            f"        ok = value in {allowed}",
+            "    except TypeError:  # unhashable value",
+            "        ok = False",
+            "    if not ok:",
+            f"        out.append(({sev}, 'Unknown ' + format_path(loc) + ': ' + str(value)))",
+        ]
+
+    def _pattern_lines(self, node: Node) -> List[str]:
+        pattern = node.spec['pattern']
+        match = self._const(re.compile(pattern).match)
+        sev = self._const(node.severity)
+        suffix = self._const(f" format (must match {pattern}): ")
+        return [
+            f"    if value.__class__ is str and not {match}(value):",
+            f"        out.append(({sev}, 'Invalid ' + format_path(loc) + {suffix} + value))",
+        ]
+
+    def _value_lines(self, node: Node, var: str, loc: str, ind: str) -> List[str]:
+        """
+        Check a value held by a list loop or the root: class check, then
+        either the object body inlined or a call to the node's function.
+        """
+        lines = []
+        inline = node.fields is not None and node.func is not None and \
+            'enum' not in node.spec and 'pattern' not in node.spec and node.items is None
+
+        if node.classes is not None:
+            classes = self._const(node.classes)
+            sev = self._const(node.severity)
+            msg = self._const(f" must be {node.expected}")
+            lines += [
+                f"{ind}if {var}.__class__ not in {classes}:",
+                f"{ind}    out.append(({sev}, format_path({loc}) + {msg}))",
+            ]
+            if inline and node.classes == frozenset([dict]):
+                lines += [f"{ind}else:"] + self._object_lines(node, var, loc, ind + '    ')
+            elif node.func:
+                lines += [f"{ind}else:", f"{ind}    {node.func}({var}, {loc}, out)"]
+        elif inline:
+            lines += [f"{ind}if {var}.__class__ is dict:"] + self._object_lines(node, var, loc, ind + '    ')
+        elif node.func:
+            lines += [f"{ind}{node.func}({var}, {loc}, out)"]
+        return lines
+
+    def _object_lines(self, node: Node, var: str, loc: str, ind: str) -> List[str]:
+        """Straight-line body checking the fields of the dict in `var`."""
+        spec = node.spec
+        required = set(spec.get('required', ()))
+        allow_unknown = spec.get('additionalProperties', True) is not False
+        sev = self._const(node.severity)
+
+        lines = [f"{ind}get = {var}.get"]
+
+        # Required fields without a declared schema still need their check
+        for field in spec.get('required', ()):
+            if field not in node.fields:
+                lines += [
+                    f"{ind}if not get({field!r}):",
+                    f"{ind}    out.append(({sev}, 'Missing required field: ' + format_path(({loc}, {field!r}))))",
+                ]
+
+        for field, sub in node.fields.items():
+            is_required = field in required
+            if sub.classes is None and sub.func is None and not is_required:
+                continue  # any value is fine
+
+            field_loc = f"({loc}, {field!r})"
+            lines.append(f"{ind}v = get({field!r}, MISSING)")
+            branches = []
+            if is_required:
+                branches.append(("if not v:",
+                                 f"out.append(({sev}, 'Missing required field: ' + format_path({field_loc})))"))
+
+            if sub.classes is not None:
+                field_sev = self._const(sub.severity)
+                msg = self._const(f" must be {sub.expected}")
+                error = f"out.append(({field_sev}, format_path({field_loc}) + {msg}))"
+                if sub.func is None:
+                    # Missing optional fields pass the same class-set test
+                    classes = self._const(sub.classes if is_required else sub.classes | {_Missing})
+                    branches.append((f"if v.__class__ not in {classes}:", error))
+                else:
+                    classes = self._const(sub.classes)
+                    branches.append((f"if v.__class__ in {classes}:", f"{sub.func}(v, {field_loc}, out)"))
+                    branches.append(("if v is not MISSING:", error))
+            elif sub.func is not None:
+                branches.append(("if v is not MISSING:", f"{sub.func}(v, {field_loc}, out)"))
+
+            for n, (test, action) in enumerate(branches):
+                keyword = test if n == 0 else 'el' + test
+                lines += [f"{ind}{keyword}", f"{ind}    {action}"]
+
+        if not allow_unknown:
+            known = self._const(frozenset(node.fields))
+            unknown_sev = self._const(spec.get('x-unknown-severity', self.unknown_severity))
+            lines += [
+                f"{ind}if not {var}.keys() <= {known}:",
+                f"{ind}    for field in {var}:",
+                f"{ind}        if field not in {known}:",
+                f"{ind}            out.append(({unknown_sev}, 'Unknown field: ' + format_path(({loc}, field))))",
+            ]
+        return lines
+
+
+def compile_schema(schema: Dict) -> Callable[[object], List[Finding]]:
+    """Compile a schema dict into validate(value) -> [(severity, message), ...]."""
+    return SchemaCompiler(schema).compile()
+
+
+def load_schema(path: Path = SCHEMA_FILE) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_validator(path: Path = SCHEMA_FILE) -> Callable[[object], List[Finding]]:
+    """Load and compile the recipe schema file."""
+    return compile_schema(load_schema(path))
+
+
+if __name__ == '__main__':
+    # Print the generated source for inspection
+    compiler = SchemaCompiler(load_schema())
+    compiler.compile()
+    for source in compiler.sources.values():
+        print(source)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Static Recipe Pages for Other Family Recipes
+
+Renders one HTML page per recipe into recipes/<id>.html, using recipe.html
+as the template and recipe_html.py (the Python twin of the script.js
+renderers) for the content. A phone opening a recipe gets the finished
+page on first paint, with no JSON download or client-side rendering;
+script.js only hydrates the buttons.
+
+Rebuilds are incremental: each page's inputs (the recipe, its variants,
+related tips and scan images, the template and the renderer) are hashed,
+and only pages whose hash changed since the last run are rendered again.
+Those are rendered in parallel across processes. Pages for deleted
+recipes are removed.
+
+recipes/pages.json lists the IDs that have a page; the recipe grid links
+to those pages instead of recipe.html#<id>.
+
+Usage:
+    python render_pages.py                       # Render changed pages
+    python render_pages.py --force               # Render every page
+    python render_pages.py --input all/recipes_master.json --workers 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from build_site_data import RECIPES_JSON, TIPS_JSON, group_time_ranges, load_recipes, load_tips, variant_groups
+from build_utils import content_hash, dump_compact, write_atomic
+from image_utils import IMAGES_DIR, IMAGES_MANIFEST, load_image_manifest
+from recipe_html import escape_attr, escape_html, page_name, render_recipe, variant_time_ranges
+from tip_links import TipLinker
+
+ROOT = Path(__file__).parent.parent
+PAGES_DIR = ROOT / "recipes"
+TEMPLATE = ROOT / "recipe.html"
+CACHE_NAME = ".render-cache.json"
+PAGES_INDEX = "pages.json"
+
+# Bump when recipe_html.py output changes, to re-render every page
+RENDERER_VERSION = 2
+
+# Pages per worker task
+CHUNK_SIZE = 50
+
+_PLACEHOLDER = re.compile(
+    r'<div id="recipe-content">\s*<div class="text-center"[^>]*>\s*<p>Loading recipe\.\.\.</p>\s*</div>\s*</div>')
+_TITLE = re.compile(r'<title>.*?</title>', re.S)
+_CHARSET = re.compile(r'(<meta charset="[^"]*">)')
+
+
+def check_template(template: str) -> None:
+    if not _PLACEHOLDER.search(template):
+        raise ValueError("recipe.html has no '#recipe-content' loading placeholder to replace")
+
+
+def fill_template(template: str, recipe: Dict, article: str) -> str:
+    """recipe.html with the rendered article, the recipe's title and a base URL of the site root."""
+    title = f"<title>{escape_html(recipe.get('title'))} - Other Family Recipes</title>"
+    content = f'<div id="recipe-content" data-recipe-id="{escape_attr(recipe.get("id"))}">{article}</div>'
+    page = _TITLE.sub(lambda m: title, template, count=1)
+    page = _CHARSET.sub(lambda m: m.group(1) + '\n  <base href="../">', page, count=1)
+    return _PLACEHOLDER.sub(lambda m: content, page, count=1)
+
+
+def render_chunk(template: str, out_dir: str, jobs: List[Tuple[str, Dict]]) -> int:
+    """Render and write a batch of pages (runs in a worker process)."""
+    for name, inputs in jobs:
+        article = render_recipe(inputs['recipe'], inputs['variants'], inputs['tips'], inputs['times'],
+                                inputs['images'])
+        page = fill_template(template, inputs['recipe'], article)
+        write_atomic(Path(out_dir) / f"{name}.html", page.encode('utf-8'))
+    return len(jobs)
+
+
+def page_inputs(recipes: List[Dict], tips: Optional[List[Dict]],
+                images: Optional[Dict[str, Dict]] = None) -> Tuple[Dict[str, Dict], List[str]]:
+    """
+    Page name -> everything its HTML depends on, plus the IDs left without
+    a page because their file name would clash with an earlier recipe's.
+    """
+    groups = variant_groups(recipes)
+    group_of = {}
+    for members in groups.values():
+        for n in members:
+            group_of[n] = members
+
+    linker = TipLinker(tips or [])
+    tips_by_id = {tip['id']: tip for tip in linker.tips}
+
+    inputs = {}
+    clashes = []
+    for n, recipe in enumerate(recipes):
+        if not recipe.get('id'):
+            continue
+        if page_name(recipe['id']) in inputs:
+            clashes.append(str(recipe['id']))
+            continue
+        members = group_of.get(n, [])
+        variants = [{k: recipes[m].get(k) for k in ('id', 'title', 'source_note', 'variant_notes')}
+                    for m in members if m != n]
+        inputs[page_name(recipe['id'])] = {
+            'recipe': recipe,
+            'variants': variants,
+            'tips': [tips_by_id[t] for t in linker.tips_for(recipe)],
+            'times': variant_time_ranges(group_time_ranges(recipes, members)) if members else '',
+            'images': {ref: scan_entry(images[ref]) for ref in recipe.get('image_refs') or []
+                       if isinstance(ref, str) and ref in (images or {})},
+        }
+    return inputs, clashes
+
+
+def scan_entry(entry: Dict) -> Dict:
+    """The parts of an image manifest entry a page uses (not its build cache bookkeeping)."""
+    return {key: entry[key] for key in ('width', 'height', 'format', 'variants', 'placeholder') if key in entry}
+
+
+def load_cache(path: Path) -> Dict[str, str]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def render_pages(recipes: List[Dict], tips: Optional[List[Dict]], out_dir: Path = PAGES_DIR,
+                 template_path: Path = TEMPLATE, workers: Optional[int] = None, force: bool = False,
+                 images: Optional[Dict[str, Dict]] = None) -> Dict:
+    template = template_path.read_text(encoding='utf-8')
+    check_template(template)
+    salt = f"{RENDERER_VERSION}:{hashlib.sha256(template.encode('utf-8')).hexdigest()}"
+
+    inputs, clashes = page_inputs(recipes, tips, images)
+    hashes = {name: content_hash(salt.encode('utf-8') + dump_compact(data)) for name, data in inputs.items()}
+
+    cache_path = out_dir / CACHE_NAME
+    cache = {} if force else load_cache(cache_path)
+    changed = [name for name in inputs
+               if cache.get(name) != hashes[name] or not (out_dir / f"{name}.html").exists()]
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    chunks = [[(name, inputs[name]) for name in changed[i:i + CHUNK_SIZE]]
+              for i in range(0, len(changed), CHUNK_SIZE)]
+    if len(chunks) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(render_chunk, [template] * len(chunks), [str(out_dir)] * len(chunks), chunks))
+    else:
+        for chunk in chunks:
+            render_chunk(template, str(out_dir), chunk)
+
+    removed = 0
+    for page in out_dir.glob('*.html'):
+        if page.stem not in inputs:
+            page.unlink()
+            removed += 1
+
+    ids = sorted(inputs[name]['recipe']['id'] for name in inputs)
+    write_atomic(out_dir / PAGES_INDEX, dump_compact({"version": 1, "pages": ids}))
+    write_atomic(cache_path, json.dumps(hashes, indent=0, sort_keys=True).encode('utf-8'))
+    return {"pages": len(inputs), "rendered": len(changed), "removed": removed, "clashes": clashes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render static HTML pages for every recipe')
+    parser.add_argument('--input', '-i', type=Path, default=RECIPES_JSON,
+                        help='Recipes JSON file (default: data/recipes.json)')
+    parser.add_argument('--tips', type=Path, default=TIPS_JSON,
+                        help='Tips JSON file (default: data/tips_master.json)')
+    parser.add_argument('--output', '-o', type=Path, default=PAGES_DIR,
+                        help='Output directory (default: recipes/)')
+    parser.add_argument('--template', type=Path, default=TEMPLATE,
+                        help='Page template (default: recipe.html)')
+    parser.add_argument('--images', type=Path, default=IMAGES_DIR / IMAGES_MANIFEST,
+                        help='Image manifest from build_images.py (default: data/images/manifest.json)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f'Worker processes (default: {os.cpu_count()})')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-render every page')
+    args = parser.parse_args()
+
+    try:
+        recipes = load_recipes(args.input)
+        tips = load_tips(args.tips)
+        start = time.perf_counter()
+        images = load_image_manifest(args.images).get('images')
+        result = render_pages(recipes, tips, args.output, args.template, args.workers, args.force, images)
+    except FileNotFoundError as e:
+        print(f"Error: File not found: {e.filename}")
+        sys.exit(1)
+    except (json.JSONDecodeError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    print("\n" + "=" * 60)
+    print("STATIC RECIPE PAGES")
+    print("=" * 60)
+    print(f"Pages:      {result['pages']}")
+    print(f"Rendered:   {result['rendered']} ({result['pages'] - result['rendered']} unchanged)")
+    if result['removed']:
+        print(f"Removed:    {result['removed']}")
+    if result['clashes']:
+        print(f"No page:    {len(result['clashes'])} (file name taken by another ID; "
+              f"they stay on recipe.html): {', '.join(result['clashes'][:5])}")
+    print(f"Output:     {args.output}")
+    print(f"Time:       {elapsed * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
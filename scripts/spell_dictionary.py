@@ -0,0 +1,126 @@
+"""
+Spelling Dictionary for Other Family Recipes
+
+Builds a symmetric-delete (SymSpell-style) dictionary over the words used
+in tips and recipes, so the tips page can match misspelled queries
+("cinamon", "buttermlik") with a few hash lookups instead of running an
+edit-distance matrix against every word of every tip.
+
+Each term is stored with its frequency. Every string reachable by
+deleting up to MAX_DISTANCE characters from the first PREFIX_LENGTH
+characters of a term maps back to that term. At query time the same
+deletes are generated for the query word; any term sharing one is a
+candidate, and only those few candidates get a real distance check.
+
+Words shorter than MIN_TERM_LENGTH are left out: the site allows no typos
+in them (30% of 3 letters rounds down to 0), so they only need exact and
+prefix matches.
+
+Usage (as a module):
+    from spell_dictionary import SpellDictionary
+    spell = SpellDictionary()
+    spell.add_text("Toss blueberries in flour")
+    spell.lookup("bluberries")   # -> [('blueberries', 1, 1)]
+    data = spell.to_json()
+"""
+
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+from build_utils import search_tokens
+
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+MIN_TERM_LENGTH = 4
+
+# Allowed typos as a fraction of word length (matches the old fuzzyScore)
+TOLERANCE = 0.3
+
+
+def deletes(word: str, max_distance: int = MAX_DISTANCE, prefix_length: int = PREFIX_LENGTH) -> Set[str]:
+    """The word's prefix plus every string made by deleting up to max_distance characters from it."""
+    key = word[:prefix_length]
+    found = {key}
+    frontier = {key}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier if len(w) > 1 for i in range(len(w))} - found
+        found |= frontier
+    return found
+
+
+def allowed_distance(a: str, b: str) -> int:
+    return min(MAX_DISTANCE, int(max(len(a), len(b)) * TOLERANCE))
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, or limit + 1 once it is known to exceed limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class SpellDictionary:
+    """Term frequencies plus the delete index over them."""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+
+    def add_words(self, words: Iterable[str]):
+        self.counts.update(w for w in words if len(w) >= MIN_TERM_LENGTH and not w.isdigit())
+
+    def add_text(self, text: str):
+        self.add_words(search_tokens(text))
+
+    def terms(self) -> List[str]:
+        return sorted(self.counts)
+
+    def delete_index(self, terms: List[str]) -> Dict[str, List[int]]:
+        index = defaultdict(list)
+        for n, term in enumerate(terms):
+            for key in deletes(term):
+                index[key].append(n)
+        return dict(sorted(index.items()))
+
+    def lookup(self, word: str) -> List[Tuple[str, int, int]]:
+        """(term, distance, count) for terms within the allowed distance, best first."""
+        terms = self.terms()
+        index = self.delete_index(terms)
+        return lookup(word, terms, [self.counts[t] for t in terms], index)
+
+    def to_json(self) -> Dict:
+        terms = self.terms()
+        return {
+            "version": 1,
+            "max_distance": MAX_DISTANCE,
+            "prefix_length": PREFIX_LENGTH,
+            "min_length": MIN_TERM_LENGTH,
+            "terms": terms,
+            "counts": [self.counts[t] for t in terms],
+            "deletes": self.delete_index(terms),
+        }
+
+
+def lookup(word: str, terms: List[str], counts: List[int],
+           index: Dict[str, List[int]]) -> List[Tuple[str, int, int]]:
+    """Query a delete index; the same algorithm as spellingSuggestions() in script.js."""
+    candidates = set()
+    for key in deletes(word):
+        candidates.update(index.get(key, ()))
+
+    results = []
+    for n in candidates:
+        term = terms[n]
+        limit = allowed_distance(word, term)
+        distance = edit_distance(word, term, limit)
+        if distance <= limit:
+            results.append((term, distance, counts[n]))
+    results.sort(key=lambda r: (r[1], -r[2], r[0]))
+    return results
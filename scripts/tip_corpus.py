@@ -0,0 +1,135 @@
+"""
+Tip Corpus Reader for Other Family Recipes
+
+Recovered tips from the image audits live in versioned JSON Lines files
+under data/tips/ rather than in Python dict literals. The first line is a
+header, every following line is one recipe's updates:
+
+    {"format": "tip-corpus", "version": 1, "name": "img-tips", "description": "..."}
+    {"batch": "4695-4750", "batch_note": "Skillet Dinners cookbook", "title": "Cheesy Pasta Skillet", "tips": ["..."]}
+
+Record fields:
+    title        recipe title to match (required)
+    batch        audit batch the record came from, e.g. "4951-5063"
+    batch_note   optional description of the batch
+    tips         tips to add to the recipe's notes
+    attribution  attribution to set if the recipe has none
+    nutrition    per-serving nutrition values to merge
+
+read_corpus() streams records one line at a time, so filtering by batch
+never materializes the whole file. Adding the next audit batch means
+appending lines to a data file.
+
+Usage (as a module):
+    from tip_corpus import read_corpus, corpus_changeset
+    for record in read_corpus(TIPS_DIR / 'img_tips.jsonl', batch='BATCH 4951-5063'):
+        ...
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+TIPS_DIR = Path(__file__).parent.parent / "data" / "tips"
+
+CORPUS_FORMAT = 'tip-corpus'
+CORPUS_VERSION = 1
+
+# Record field -> changeset operation
+RECORD_OPERATIONS = {
+    'tips': 'add_notes',
+    'attribution': 'set_attribution',
+    'nutrition': 'merge_nutrition',
+}
+
+
+class CorpusError(ValueError):
+    """Raised for malformed tip corpus files."""
+
+
+def normalize_batch(batch: str) -> str:
+    """'BATCH 4951-5063' / 'batch 4951 - 5063' -> '4951-5063'."""
+    text = str(batch).strip().casefold()
+    if text.startswith('batch'):
+        text = text[len('batch'):]
+    return ''.join(text.split())
+
+
+def batch_matches(record_batch: Optional[str], wanted: str) -> bool:
+    """Match a batch name exactly, or a page number falling inside a batch range."""
+    if record_batch is None:
+        return False
+    record_batch = normalize_batch(record_batch)
+    if record_batch == wanted:
+        return True
+
+    if wanted.isdigit() and '-' in record_batch:
+        low, _, high = record_batch.partition('-')
+        if low.isdigit() and high.isdigit():
+            return int(low) <= int(wanted) <= int(high)
+    return False
+
+
+def read_header(path: Path) -> Dict:
+    """Read and check just the header line of a corpus file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return _parse_header(path, f.readline())
+
+
+def _parse_header(path: Path, line: str) -> Dict:
+    try:
+        header = json.loads(line) if line.strip() else None
+    except json.JSONDecodeError as e:
+        raise CorpusError(f"{path}:1: invalid header: {e}")
+    if not isinstance(header, dict) or header.get('format') != CORPUS_FORMAT:
+        raise CorpusError(f"{path}:1: not a {CORPUS_FORMAT} file")
+    if header.get('version') != CORPUS_VERSION:
+        raise CorpusError(f"{path}: unsupported corpus version {header.get('version')}")
+    return header
+
+
+def read_corpus(path: Path, batch: Optional[str] = None) -> Iterator[Dict]:
+    """Yield one record at a time, optionally only those from one batch."""
+    wanted = normalize_batch(batch) if batch else None
+
+    with open(path, 'r', encoding='utf-8') as f:
+        _parse_header(path, f.readline())
+
+        for line_no, line in enumerate(f, start=2):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise CorpusError(f"{path}:{line_no}: {e}")
+            if not isinstance(record, dict) or not record.get('title'):
+                raise CorpusError(f"{path}:{line_no}: record needs a 'title'")
+
+            if wanted and not batch_matches(record.get('batch'), wanted):
+                continue
+            yield record
+
+
+def record_to_change(record: Dict) -> Dict:
+    """Turn a corpus record into a title-keyed changeset entry."""
+    change = {"title": record['title']}
+    for field, op in RECORD_OPERATIONS.items():
+        if field in record:
+            change[op] = record[field]
+    return change
+
+
+def corpus_changeset(path: Path, batch: Optional[str] = None) -> Dict:
+    """
+    A changeset whose changes are streamed from the corpus file. 'changes'
+    is a generator, so it can be applied once.
+    """
+    header = read_header(path)
+    name = header.get('name', Path(path).stem)
+    if batch:
+        name = f"{name} (batch {normalize_batch(batch)})"
+    return {
+        "version": 1,
+        "name": name,
+        "changes": (record_to_change(r) for r in read_corpus(path, batch)),
+    }
@@ -0,0 +1,85 @@
+"""
+Tip-to-Recipe Links for Other Family Recipes
+
+Works out once, at build time, which kitchen tips belong on which recipe
+page, so the browser no longer compares every tip against every
+ingredient on each render.
+
+A tip is related to a recipe when:
+
+1. One of its related_ingredients appears as whole words in an ingredient
+   item ("banana" in "bananas, mashed"), or
+2. The ingredient's name (the part before any comma) appears as whole
+   words in a related_ingredient ("sugar" in "brown sugar"), or
+3. One of its related_tags equals one of the recipe's tags.
+
+Words are compared after normalize_item (lowercase, plurals folded), so
+"Blueberries" matches "blueberry" but "pea" no longer matches "peanut".
+Every phrase is indexed by its words, so a lookup costs one dict probe per
+n-gram of the ingredient rather than one per tip.
+
+Usage (as a module):
+    from tip_links import TipLinker
+    linker = TipLinker(tips)
+    tip_ids = linker.tips_for(recipe)
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+from compute_nutrition import normalize_item
+
+
+class TipLinker:
+    """Indexes tips by ingredient phrase and tag."""
+
+    def __init__(self, tips: List[Dict]):
+        self.tips = [tip for tip in tips if isinstance(tip, dict) and tip.get('id')]
+        self.by_phrase: Dict[Tuple[str, ...], Set[int]] = defaultdict(set)   # whole phrase
+        self.by_part: Dict[Tuple[str, ...], Set[int]] = defaultdict(set)     # any n-gram of a phrase
+        self.by_tag: Dict[str, Set[int]] = defaultdict(set)
+        self.longest = 0
+
+        for n, tip in enumerate(self.tips):
+            for phrase in tip.get('related_ingredients') or []:
+                words = tuple(normalize_item(str(phrase)))
+                if not words:
+                    continue
+                self.by_phrase[words].add(n)
+                self.longest = max(self.longest, len(words))
+                for i in range(len(words)):
+                    for j in range(i + 1, len(words) + 1):
+                        self.by_part[words[i:j]].add(n)
+            for tag in tip.get('related_tags') or []:
+                self.by_tag[str(tag).strip().lower()].add(n)
+
+    def _ingredient_matches(self, item: str) -> Set[int]:
+        found = set()
+        words = normalize_item(item)
+        for i in range(len(words)):
+            for j in range(i + 1, min(len(words), i + self.longest) + 1):
+                found |= self.by_phrase.get(tuple(words[i:j]), set())
+
+        name = tuple(normalize_item(item.split(',')[0]))
+        if name:
+            found |= self.by_part.get(name, set())
+        return found
+
+    def tips_for(self, recipe: Dict) -> List[str]:
+        """IDs of the tips related to a recipe, in tip-file order."""
+        found = set()
+        for ingredient in recipe.get('ingredients') or []:
+            if isinstance(ingredient, dict) and ingredient.get('item'):
+                found |= self._ingredient_matches(str(ingredient['item']))
+        for tag in recipe.get('tags') or []:
+            found |= self.by_tag.get(str(tag).strip().lower(), set())
+        return [self.tips[n]['id'] for n in sorted(found)]
+
+    def link_all(self, recipes: List[Dict]) -> Dict[str, List[str]]:
+        """Recipe ID -> related tip IDs, for recipes with at least one tip."""
+        links = {}
+        for recipe in recipes:
+            tip_ids = self.tips_for(recipe)
+            if tip_ids:
+                links[recipe.get('id')] = tip_ids
+        return links
@@ -0,0 +1,182 @@
+"""
+Recipe Title Index for Other Family Recipes
+
+Shared title lookup for the tip-merge scripts. Built once per run:
+
+1. An exact map from normalized title to recipe
+2. A token inverted index and a character-trigram inverted index for
+   partial matches, so a lookup only scores recipes that share words (or,
+   for typos, trigrams) with the query
+
+Partial matches are ranked by score instead of "first substring hit in
+list order wins", and a match that is too close to the runner-up is
+reported as ambiguous rather than silently picked. So is an exact title
+shared by several recipes.
+
+Usage (as a module):
+    from title_index import TitleIndex
+    index = TitleIndex(recipes)
+    match = index.find("Mint Patty Cakes")
+    if match.recipe: ...
+"""
+
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+# Minimum score for a partial match to be accepted
+MIN_PARTIAL_SCORE = 0.6
+# Best partial match must beat the runner-up by this much
+MIN_MARGIN = 0.05
+# Number of ranked candidates kept for reporting
+MAX_CANDIDATES = 5
+
+# Tokens too common in titles to identify a recipe on their own
+COMMON_TOKENS = {'and', 'the', 'with', 'of', 'a', 'in', 'for', 'n'}
+
+
+def normalize_title(title: str) -> str:
+    """Casefold, strip accents/punctuation and collapse whitespace."""
+    text = unicodedata.normalize('NFKD', str(title or ''))
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    text = text.casefold().replace("'", '').replace('’', '').replace('&', ' and ')
+    text = re.sub(r'[^a-z0-9]+', ' ', text)
+    return ' '.join(text.split())
+
+
+def title_tokens(normalized: str) -> List[str]:
+    return [t for t in normalized.split() if t not in COMMON_TOKENS]
+
+
+def trigrams(normalized: str) -> set:
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleMatch:
+    """Result of a title lookup."""
+
+    def __init__(self, query: str, recipe: Optional[Dict], kind: str,
+                 score: float = 0.0, candidates: Optional[List[Tuple[float, Dict]]] = None):
+        self.query = query
+        self.recipe = recipe
+        self.kind = kind  # 'exact', 'partial', 'ambiguous' or 'none'
+        self.score = score
+        self.candidates = candidates or []
+
+    def describe_candidates(self) -> List[str]:
+        return [f"{score:.2f}  {r.get('title', '')}" for score, r in self.candidates]
+
+
+class TitleIndex:
+    """Exact and partial title lookup over a recipe list."""
+
+    def __init__(self, recipes: List[Dict]):
+        self.recipes = recipes
+        self.exact_map = {}
+        self.duplicates = defaultdict(list)  # Normalized title -> the other recipes with it
+        self.normalized = []
+        self.token_sets = []
+        self.trigram_sets = []
+        self.token_postings = defaultdict(set)
+        self.trigram_postings = defaultdict(set)
+
+        for ordinal, recipe in enumerate(recipes):
+            norm = normalize_title(recipe.get('title', ''))
+            tokens = set(title_tokens(norm))
+            grams = trigrams(norm)
+
+            self.normalized.append(norm)
+            self.token_sets.append(tokens)
+            self.trigram_sets.append(grams)
+
+            if norm in self.exact_map:
+                self.duplicates[norm].append(recipe)
+            else:
+                self.exact_map[norm] = recipe
+            for token in tokens:
+                self.token_postings[token].add(ordinal)
+            for gram in grams:
+                self.trigram_postings[gram].add(ordinal)
+
+    def exact(self, title: str) -> Optional[Dict]:
+        return self.exact_map.get(normalize_title(title))
+
+    def _score(self, norm: str, tokens: set, grams: set, ordinal: int, shared_grams: int) -> float:
+        """Blend trigram Dice similarity with token overlap; whole-phrase containment counts fully."""
+        other_grams = self.trigram_sets[ordinal]
+        dice = 2 * shared_grams / (len(grams) + len(other_grams)) if grams or other_grams else 0.0
+
+        other_tokens = self.token_sets[ordinal]
+        if tokens and other_tokens:
+            overlap = len(tokens & other_tokens) / min(len(tokens), len(other_tokens))
+        else:
+            overlap = 0.0
+
+        other = self.normalized[ordinal]
+        if norm and other and (f" {norm} " in f" {other} " or f" {other} " in f" {norm} "):
+            overlap = 1.0
+
+        return 0.5 * dice + 0.5 * overlap
+
+    def candidates(self, title: str, limit: int = MAX_CANDIDATES) -> List[Tuple[float, Dict]]:
+        """Ranked (score, recipe) partial matches for a title."""
+        norm = normalize_title(title)
+        tokens = set(title_tokens(norm))
+        grams = trigrams(norm)
+
+        # Candidates: recipes sharing a title word; fall back to trigrams for typos
+        pool = set()
+        for token in tokens:
+            pool |= self.token_postings.get(token, set())
+        if not pool:
+            for gram in grams:
+                pool |= self.trigram_postings.get(gram, set())
+        if not pool:
+            return []
+
+        shared = Counter()
+        for gram in grams:
+            for ordinal in self.trigram_postings.get(gram, ()):
+                if ordinal in pool:
+                    shared[ordinal] += 1
+
+        scored = sorted(
+            ((self._score(norm, tokens, grams, o, shared[o]), o) for o in pool),
+            key=lambda pair: (-pair[0], pair[1])
+        )
+        return [(round(score, 3), self.recipes[o]) for score, o in scored[:limit]]
+
+    def find(self, title: str, min_score: float = MIN_PARTIAL_SCORE,
+             min_margin: float = MIN_MARGIN) -> TitleMatch:
+        """Exact match first, then the best partial match if it is good and unambiguous."""
+        norm = normalize_title(title)
+        recipe = self.exact_map.get(norm)
+        if recipe is not None:
+            if norm in self.duplicates:
+                same = [(1.0, r) for r in [recipe] + self.duplicates[norm]]
+                return TitleMatch(title, None, 'ambiguous', 1.0, same[:MAX_CANDIDATES])
+            return TitleMatch(title, recipe, 'exact', 1.0)
+
+        ranked = self.candidates(title)
+        if not ranked or ranked[0][0] < min_score:
+            return TitleMatch(title, None, 'none', ranked[0][0] if ranked else 0.0, ranked)
+
+        best_score, best = ranked[0]
+        if len(ranked) > 1 and best_score - ranked[1][0] < min_margin:
+            return TitleMatch(title, None, 'ambiguous', best_score, ranked)
+
+        return TitleMatch(title, best, 'partial', best_score, ranked)
+
+
+def print_unmatched(matches: List[TitleMatch], heading: str):
+    """Print unmatched/ambiguous lookups with their ranked candidates."""
+    if not matches:
+        return
+    print(f"\n⚠ {heading.format(count=len(matches))}")
+    for match in matches:
+        label = 'ambiguous' if match.kind == 'ambiguous' else 'no match'
+        print(f"  - {match.query} ({label})")
+        for line in match.describe_candidates()[:3]:
+            print(f"      {line}")
@@ -3,28 +3,37 @@
 Recipe Validation Script for Other Family Recipes
 Validates recipes.json for schema compliance and common issues.
 
+Checks are registered as rules, each with an ID and a default severity,
+so they can be selected individually and timed across the run. Structure,
+field types, enums and unknown fields are checked by the declarative
+schema in recipe_schema.json (the 'schema' rule), the single source of
+truth for which fields a recipe may have.
+
 Usage:
     python scripts/validate-recipes.py
     python scripts/validate-recipes.py --strict  # Fail on warnings too
+    python scripts/validate-recipes.py --list-rules
+    python scripts/validate-recipes.py --rules schema,duplicate-ids
+    python scripts/validate-recipes.py --skip-rules image-refs --timings
+    python scripts/validate-recipes.py --report report.json
+    python scripts/validate-recipes.py --report report.sarif --format sarif
+    python scripts/validate-recipes.py --watch  # Revalidate on every save
+    python scripts/validate-recipes.py --benchmark 20
 """
 
+import argparse
 import json
+import os
 import sys
 import re
+import time
+from collections import defaultdict
+from datetime import datetime
 from pathlib import Path
 
-# Configuration
-REQUIRED_FIELDS = ['id', 'title', 'ingredients', 'instructions', 'category']
-OPTIONAL_FIELDS = ['attribution', 'source_note', 'description', 'servings_yield',
-                   'prep_time', 'cook_time', 'total_time', 'temperature', 'pan_size',
-                   'notes', 'tags', 'confidence', 'image_refs', 'page_continuation',
-                   'conversions', 'nutrition', 'variant_of', 'variant_notes', 'canonical_id',
-                   'frosting', 'oven_directions']
-
-VALID_CATEGORIES = ['appetizers', 'beverages', 'breads', 'breakfast', 'desserts',
-                    'mains', 'salads', 'sides', 'soups', 'snacks']
+from recipe_schema import load_validator
 
-VALID_CONFIDENCE = ['high', 'medium', 'low']
+# Configuration
 
 # Measurement sanity checks (flag if exceeded)
 SANITY_LIMITS = {
@@ -40,177 +49,342 @@ SANITY_LIMITS = {
 TEMP_MIN = 200
 TEMP_MAX = 550
 
+DATA_DIR = Path(__file__).parent.parent / 'data'
+
+
+class ImageIndex:
+    """
+    One-shot snapshot of every file under data/ (including processed/ and
+    any other subfolders), so image_refs checks are set lookups instead of
+    a stat() call per reference.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.paths = set()
+        self.by_casefold = {}
+        self.dir_mtimes = {}
+        self._scan()
+
+    def _scan(self):
+        seen_dirs = set()
+        stack = [(self.root, '')]
+        while stack:
+            dir_path, prefix = stack.pop()
+            try:
+                st = os.stat(dir_path)
+            except OSError:
+                continue
+            # Guard against symlink loops
+            if (st.st_dev, st.st_ino) in seen_dirs:
+                continue
+            seen_dirs.add((st.st_dev, st.st_ino))
+            self.dir_mtimes[str(dir_path)] = st.st_mtime_ns
 
-class RecipeValidator:
-    def __init__(self, strict=False):
-        self.strict = strict
-        self.errors = []
-        self.warnings = []
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
 
-    def error(self, recipe_id, message):
-        self.errors.append(f"ERROR [{recipe_id}]: {message}")
+            for entry in entries:
+                rel = prefix + entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    stack.append((entry.path, rel + '/'))
+                else:
+                    self.paths.add(rel)
+                    self.by_casefold.setdefault(rel.casefold(), []).append(rel)
 
-    def warn(self, recipe_id, message):
-        self.warnings.append(f"WARNING [{recipe_id}]: {message}")
+    @staticmethod
+    def _normalize(ref):
+        ref = str(ref).replace('\\', '/')
+        while ref.startswith('./'):
+            ref = ref[2:]
+        return ref
 
-    def validate_recipe(self, recipe):
-        """Validate a single recipe."""
-        recipe_id = recipe.get('id', 'UNKNOWN')
+    def exists(self, ref):
+        return self._normalize(ref) in self.paths
 
-        # Check required fields
-        for field in REQUIRED_FIELDS:
-            if field not in recipe or not recipe[field]:
-                self.error(recipe_id, f"Missing required field: {field}")
-
-        # Validate ID format (slug-like)
-        if 'id' in recipe:
-            if not re.match(r'^[a-z0-9-]+$', recipe['id']):
-                self.error(recipe_id, f"Invalid ID format (should be lowercase slug): {recipe['id']}")
-
-        # Validate category
-        if 'category' in recipe:
-            if recipe['category'] not in VALID_CATEGORIES:
-                self.warn(recipe_id, f"Unknown category: {recipe['category']}")
-
-        # Validate confidence
-        if 'confidence' in recipe and recipe['confidence']:
-            overall = recipe['confidence'].get('overall')
-            if overall and overall not in VALID_CONFIDENCE:
-                self.error(recipe_id, f"Invalid confidence level: {overall}")
-
-        # Validate ingredients
-        if 'ingredients' in recipe:
-            self.validate_ingredients(recipe_id, recipe['ingredients'])
-
-        # Validate instructions
-        if 'instructions' in recipe:
-            self.validate_instructions(recipe_id, recipe['instructions'])
-
-        # Validate temperature
-        if 'temperature' in recipe and recipe['temperature']:
-            self.validate_temperature(recipe_id, recipe['temperature'])
-
-        # Validate image_refs exist
-        if 'image_refs' in recipe:
-            self.validate_image_refs(recipe_id, recipe['image_refs'])
-
-        # Check for nutrition status consistency
-        if 'nutrition' in recipe and recipe['nutrition']:
-            self.validate_nutrition(recipe_id, recipe['nutrition'])
-
-        # Check conversions if present
-        if 'conversions' in recipe and recipe['conversions']:
-            self.validate_conversions(recipe_id, recipe['conversions'])
-
-    def validate_ingredients(self, recipe_id, ingredients):
-        """Validate ingredients list."""
-        if not isinstance(ingredients, list):
-            self.error(recipe_id, "Ingredients must be a list")
-            return
+    def is_stale(self):
+        """True if any scanned directory has changed since the snapshot."""
+        for dir_path, mtime in self.dir_mtimes.items():
+            try:
+                if os.stat(dir_path).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
 
-        for i, ing in enumerate(ingredients):
-            if not isinstance(ing, dict):
-                self.error(recipe_id, f"Ingredient {i} must be an object")
-                continue
+    def suggest(self, ref):
+        """Return files whose path differs from ref only by case (e.g. .PNG vs .png)."""
+        return sorted(self.by_casefold.get(self._normalize(ref).casefold(), []))
 
-            if 'item' not in ing:
-                self.error(recipe_id, f"Ingredient {i} missing 'item' field")
 
-            # Sanity check quantities
-            item = ing.get('item', '').lower()
-            qty = ing.get('quantity', '')
-            unit = ing.get('unit', '').lower()
+SEVERITY_ERROR = 'error'
+SEVERITY_WARNING = 'warning'
 
-            self.check_quantity_sanity(recipe_id, item, qty, unit)
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
 
-    def check_quantity_sanity(self, recipe_id, item, qty, unit):
-        """Check if quantity seems reasonable."""
-        if not qty or qty == '' or '[UNCLEAR]' in str(qty):
-            return
 
-        try:
-            # Handle fractions
-            if '/' in str(qty):
-                parts = str(qty).split()
-                if len(parts) == 2:  # e.g., "2 3/4"
-                    whole = float(parts[0])
-                    frac_parts = parts[1].split('/')
-                    qty_float = whole + float(frac_parts[0]) / float(frac_parts[1])
-                else:  # e.g., "3/4"
-                    frac_parts = str(qty).split('/')
-                    qty_float = float(frac_parts[0]) / float(frac_parts[1])
-            else:
-                qty_float = float(qty.replace('-', '.').split()[0])
-        except (ValueError, IndexError):
-            return  # Can't parse, skip check
+class Rule:
+    """A single registered validation check."""
+
+    def __init__(self, rule_id, severity, description, func, scope='recipe', default=True):
+        self.id = rule_id
+        self.severity = severity
+        self.description = description
+        self.func = func
+        self.scope = scope  # 'recipe' (called per recipe) or 'corpus' (called once)
+        self.default = default  # run when --rules is not given
+
+
+# Registry of all rules, in registration order
+RULES = {}
+
+
+def rule(rule_id, severity, description, scope='recipe', default=True):
+    """Register a check function as a validation rule."""
+    def decorator(func):
+        if rule_id in RULES:
+            raise ValueError(f"Duplicate rule ID: {rule_id}")
+        RULES[rule_id] = Rule(rule_id, severity, description, func, scope, default)
+        return func
+    return decorator
+
+
+_schema_validator = None
+
+
+def get_schema_validator():
+    """The compiled recipe schema, built once per process."""
+    global _schema_validator
+    if _schema_validator is None:
+        _schema_validator = load_validator()
+    return _schema_validator
+
+
+def parse_quantity(qty):
+    """Parse a quantity string like '2', '3/4' or '2 3/4' into a float (None if unparseable)."""
+    if not qty or '[UNCLEAR]' in str(qty):
+        return None
+
+    try:
+        # Handle fractions
+        if '/' in str(qty):
+            parts = str(qty).split()
+            if len(parts) == 2:  # e.g., "2 3/4"
+                whole = float(parts[0])
+                frac_parts = parts[1].split('/')
+                return whole + float(frac_parts[0]) / float(frac_parts[1])
+            # e.g., "3/4"
+            frac_parts = str(qty).split('/')
+            return float(frac_parts[0]) / float(frac_parts[1])
+        return float(str(qty).replace('-', '.').split()[0])
+    except (ValueError, IndexError, ZeroDivisionError):
+        return None
+
+
+# =============================================================================
+# Per-recipe rules
+# =============================================================================
+
+@rule('schema', SEVERITY_ERROR, "Structure, types, enums and unknown fields (recipe_schema.json)")
+def check_schema(v, recipe_id, recipe):
+    for severity, message in get_schema_validator()(recipe):
+        v.flag(recipe_id, message, severity=severity)
+
+
+@rule('quantity-sanity', SEVERITY_WARNING, "Ingredient quantities are within SANITY_LIMITS")
+def check_quantity_sanity(v, recipe_id, recipe):
+    ingredients = recipe.get('ingredients')
+    if not isinstance(ingredients, list):
+        return
+
+    for ing in ingredients:
+        if not isinstance(ing, dict):
+            continue
+        item = ing.get('item', '').lower()
+        qty = ing.get('quantity', '')
+        unit = ing.get('unit', '').lower()
+
+        qty_float = parse_quantity(qty)
+        if qty_float is None:
+            continue  # Can't parse, skip check
 
         for check_item, limits in SANITY_LIMITS.items():
             if check_item in item:
                 if 'cup' in unit and 'max_cups' in limits:
                     if qty_float > limits['max_cups']:
-                        self.warn(recipe_id, f"Suspicious: {qty} {unit} {item} (max expected: {limits['max_cups']} cups)")
+                        v.flag(recipe_id, f"Suspicious: {qty} {unit} {item} (max expected: {limits['max_cups']} cups)")
                 if 'tbsp' in unit and 'max_tbsp' in limits:
                     if qty_float > limits['max_tbsp']:
-                        self.warn(recipe_id, f"Suspicious: {qty} {unit} {item} (max expected: {limits['max_tbsp']} tbsp)")
+                        v.flag(recipe_id, f"Suspicious: {qty} {unit} {item} (max expected: {limits['max_tbsp']} tbsp)")
                 if 'tsp' in unit and 'max_tsp' in limits:
                     if qty_float > limits['max_tsp']:
-                        self.warn(recipe_id, f"Suspicious: {qty} {unit} {item} (max expected: {limits['max_tsp']} tsp)")
+                        v.flag(recipe_id, f"Suspicious: {qty} {unit} {item} (max expected: {limits['max_tsp']} tsp)")
+
+
+@rule('temperature-range', SEVERITY_WARNING, f"Oven temperature is within {TEMP_MIN}-{TEMP_MAX}°F")
+def check_temperature(v, recipe_id, recipe):
+    temp = recipe.get('temperature')
+    if not temp:
+        return
+    # Extract Fahrenheit number
+    match = re.search(r'(\d+)\s*°?F', str(temp))
+    if match:
+        temp_f = int(match.group(1))
+        if temp_f < TEMP_MIN or temp_f > TEMP_MAX:
+            v.flag(recipe_id, f"Temperature {temp_f}°F outside typical range ({TEMP_MIN}-{TEMP_MAX}°F)")
+
+
+@rule('image-refs', SEVERITY_WARNING, "Referenced images exist under data/")
+def check_image_refs(v, recipe_id, recipe):
+    if 'image_refs' not in recipe:
+        return
+    image_refs = recipe['image_refs']
+    if not isinstance(image_refs, list):
+        v.flag(recipe_id, "image_refs must be a list", severity=SEVERITY_ERROR)
+        return
+
+    index = v.image_index
+    for ref in image_refs:
+        if index.exists(ref):
+            continue
+        near = index.suggest(ref)
+        if near:
+            v.flag(recipe_id, f"Referenced image not found: {ref} (did you mean: {', '.join(near)}?)")
+        else:
+            v.flag(recipe_id, f"Referenced image not found: {ref}")
+
+
+@rule('nutrition-status', SEVERITY_WARNING, "Nutrition status agrees with the values provided")
+def check_nutrition(v, recipe_id, recipe):
+    nutrition = recipe.get('nutrition')
+    if not nutrition:
+        return
+    status = nutrition.get('status')
+    if status == 'insufficient_data':
+        if not nutrition.get('missing_inputs'):
+            v.flag(recipe_id, "Nutrition status is 'insufficient_data' but missing_inputs is empty")
+    elif status in ['complete', 'partial']:
+        per_serving = nutrition.get('per_serving', {})
+        if not per_serving or all(val is None for val in per_serving.values()):
+            v.flag(recipe_id, f"Nutrition status is '{status}' but no nutrition values provided")
+
+
+@rule('conversions', SEVERITY_WARNING, "has_conversions recipes carry ingredients_metric")
+def check_conversions(v, recipe_id, recipe):
+    conversions = recipe.get('conversions')
+    if not conversions:
+        return
+    if conversions.get('has_conversions'):
+        if not conversions.get('ingredients_metric'):
+            v.flag(recipe_id, "has_conversions is true but ingredients_metric is empty")
+
+
+# =============================================================================
+# Corpus-wide rules
+# =============================================================================
+
+@rule('duplicate-ids', SEVERITY_ERROR, "Recipe IDs are unique", scope='corpus')
+def check_duplicate_ids(v, recipes):
+    ids_seen = set()
+    for recipe in recipes:
+        recipe_id = recipe.get('id', 'UNKNOWN')
+        if recipe_id in ids_seen:
+            v.flag(recipe_id, "Duplicate recipe ID")
+        ids_seen.add(recipe_id)
 
-    def validate_instructions(self, recipe_id, instructions):
-        """Validate instructions list."""
-        if not isinstance(instructions, list):
-            self.error(recipe_id, "Instructions must be a list")
-            return
 
-        if len(instructions) == 0:
-            self.error(recipe_id, "Instructions list is empty")
-            return
+@rule('variant-refs', SEVERITY_ERROR, "variant_of points at an existing recipe", scope='corpus')
+def check_variant_refs(v, recipes):
+    ids_seen = {recipe.get('id', 'UNKNOWN') for recipe in recipes}
+    for recipe in recipes:
+        variant_of = recipe.get('variant_of')
+        if variant_of and variant_of not in ids_seen:
+            v.flag(recipe.get('id'), f"variant_of references non-existent recipe: {variant_of}")
 
-        for i, inst in enumerate(instructions):
-            if not isinstance(inst, dict):
-                self.error(recipe_id, f"Instruction {i} must be an object")
-                continue
 
-            if 'text' not in inst:
-                self.error(recipe_id, f"Instruction {i} missing 'text' field")
-
-    def validate_temperature(self, recipe_id, temp):
-        """Validate temperature is reasonable."""
-        # Extract Fahrenheit number
-        match = re.search(r'(\d+)\s*°?F', temp)
-        if match:
-            temp_f = int(match.group(1))
-            if temp_f < TEMP_MIN or temp_f > TEMP_MAX:
-                self.warn(recipe_id, f"Temperature {temp_f}°F outside typical range ({TEMP_MIN}-{TEMP_MAX}°F)")
-
-    def validate_image_refs(self, recipe_id, image_refs):
-        """Check that referenced images exist."""
-        if not isinstance(image_refs, list):
-            self.error(recipe_id, "image_refs must be a list")
-            return
+def select_rules(only=None, skip=None):
+    """
+    Resolve --rules/--skip-rules into a list of Rule objects.
+
+    Raises ValueError for unknown rule IDs so typos don't silently
+    disable checks.
+    """
+    only = list(only or [])
+    skip = list(skip or [])
+    unknown = [r for r in only + skip if r not in RULES]
+    if unknown:
+        raise ValueError(f"Unknown rule(s): {', '.join(unknown)}")
+
+    selected = only if only else [r.id for r in RULES.values() if r.default]
+    return [RULES[r] for r in selected if r not in skip]
+
+
+class RecipeValidator:
+    def __init__(self, strict=False, data_dir=DATA_DIR, rules=None, image_index=None):
+        self.strict = strict
+        self.data_dir = Path(data_dir)
+        self._image_index = image_index
+        self.rules = select_rules() if rules is None else list(rules)
+        self.findings = []
+        self.errors = []
+        self.warnings = []
+        self.timings = defaultdict(float)
+        self.calls = defaultdict(int)
+        self._current_rule = None
+
+    @property
+    def image_index(self):
+        """Directory snapshot of data/, built on first use."""
+        if self._image_index is None:
+            self._image_index = ImageIndex(self.data_dir)
+        return self._image_index
+
+    def flag(self, recipe_id, message, severity=None):
+        """Record a finding for the rule currently running."""
+        current = self._current_rule
+        rule_id = current.id if current else 'core'
+        severity = severity or (current.severity if current else SEVERITY_ERROR)
+
+        self.findings.append({
+            "rule": rule_id,
+            "severity": severity,
+            "recipe_id": recipe_id,
+            "message": message
+        })
+        if severity == SEVERITY_ERROR:
+            self.errors.append(f"ERROR [{recipe_id}]: {message}")
+        else:
+            self.warnings.append(f"WARNING [{recipe_id}]: {message}")
 
-        data_dir = Path(__file__).parent.parent / 'data'
-        for ref in image_refs:
-            img_path = data_dir / ref
-            if not img_path.exists():
-                self.warn(recipe_id, f"Referenced image not found: {ref}")
-
-    def validate_nutrition(self, recipe_id, nutrition):
-        """Validate nutrition data consistency."""
-        status = nutrition.get('status')
-        if status == 'insufficient_data':
-            if not nutrition.get('missing_inputs'):
-                self.warn(recipe_id, "Nutrition status is 'insufficient_data' but missing_inputs is empty")
-        elif status in ['complete', 'partial']:
-            per_serving = nutrition.get('per_serving', {})
-            if not per_serving or all(v is None for v in per_serving.values()):
-                self.warn(recipe_id, f"Nutrition status is '{status}' but no nutrition values provided")
-
-    def validate_conversions(self, recipe_id, conversions):
-        """Validate conversions data."""
-        if conversions.get('has_conversions'):
-            if not conversions.get('ingredients_metric'):
-                self.warn(recipe_id, "has_conversions is true but ingredients_metric is empty")
+    def error(self, recipe_id, message):
+        self.flag(recipe_id, message, severity=SEVERITY_ERROR)
+
+    def warn(self, recipe_id, message):
+        self.flag(recipe_id, message, severity=SEVERITY_WARNING)
+
+    def _run(self, rule_obj, *args):
+        self._current_rule = rule_obj
+        start = time.perf_counter()
+        try:
+            rule_obj.func(self, *args)
+        finally:
+            self.timings[rule_obj.id] += time.perf_counter() - start
+            self.calls[rule_obj.id] += 1
+            self._current_rule = None
+
+    def validate_recipe(self, recipe):
+        """Run every enabled per-recipe rule against a single recipe."""
+        recipe_id = recipe.get('id', 'UNKNOWN')
+        for rule_obj in self.rules:
+            if rule_obj.scope == 'recipe':
+                self._run(rule_obj, recipe_id, recipe)
 
     def validate_all(self, recipes_data):
         """Validate all recipes."""
@@ -219,25 +393,15 @@ class RecipeValidator:
             return
 
         recipes = recipes_data['recipes']
-        ids_seen = set()
 
         for recipe in recipes:
-            recipe_id = recipe.get('id', 'UNKNOWN')
-
-            # Check for duplicate IDs
-            if recipe_id in ids_seen:
-                self.error(recipe_id, "Duplicate recipe ID")
-            ids_seen.add(recipe_id)
-
             self.validate_recipe(recipe)
 
-        # Check variant references
-        for recipe in recipes:
-            variant_of = recipe.get('variant_of')
-            if variant_of and variant_of not in ids_seen:
-                self.error(recipe.get('id'), f"variant_of references non-existent recipe: {variant_of}")
+        for rule_obj in self.rules:
+            if rule_obj.scope == 'corpus':
+                self._run(rule_obj, recipes)
 
-    def report(self):
+    def report(self, show_timings=False):
         """Print validation report."""
         print("\n" + "="*60)
         print("RECIPE VALIDATION REPORT")
@@ -257,6 +421,9 @@ class RecipeValidator:
         else:
             print("\nNo warnings.")
 
+        if show_timings:
+            self.print_timings()
+
         print("\n" + "="*60)
 
         if self.errors:
@@ -265,18 +432,386 @@ class RecipeValidator:
             return 1
         return 0
 
+    def print_timings(self):
+        """Print per-rule timings, slowest first."""
+        print("\nRULE TIMINGS:")
+        for rule_id, seconds in sorted(self.timings.items(), key=lambda kv: -kv[1]):
+            print(f"  {rule_id:<20} {seconds * 1000:9.2f} ms  ({self.calls[rule_id]} calls)")
+
+    def rule_summary(self):
+        """Per-rule metadata, timings and finding counts for machine-readable reports."""
+        counts = defaultdict(int)
+        for finding in self.findings:
+            counts[finding["rule"]] += 1
+
+        return {
+            r.id: {
+                "severity": r.severity,
+                "scope": r.scope,
+                "description": r.description,
+                "calls": self.calls[r.id],
+                "seconds": round(self.timings[r.id], 6),
+                "findings": counts[r.id]
+            }
+            for r in self.rules
+        }
+
+    def to_json(self, source):
+        """Build a JSON report with per-recipe findings and per-rule timings."""
+        by_recipe = defaultdict(list)
+        for finding in self.findings:
+            by_recipe[str(finding["recipe_id"])].append({
+                "rule": finding["rule"],
+                "severity": finding["severity"],
+                "message": finding["message"]
+            })
+
+        return {
+            "source": str(source),
+            "generated": datetime.now().isoformat(),
+            "summary": {
+                "errors": len(self.errors),
+                "warnings": len(self.warnings),
+                "recipes_with_findings": len(by_recipe)
+            },
+            "rules": self.rule_summary(),
+            "recipes": dict(by_recipe)
+        }
+
+    def to_sarif(self, source):
+        """Build a SARIF 2.1.0 log (one run, recipe IDs as logical locations)."""
+        rules_meta = [
+            {
+                "id": r.id,
+                "shortDescription": {"text": r.description},
+                "defaultConfiguration": {"level": r.severity}
+            }
+            for r in self.rules
+        ]
+        results = [
+            {
+                "ruleId": f["rule"],
+                "level": f["severity"],
+                "message": {"text": f["message"]},
+                "locations": [{
+                    "physicalLocation": {"artifactLocation": {"uri": Path(source).as_posix()}},
+                    "logicalLocations": [{"name": str(f["recipe_id"]), "kind": "object"}]
+                }]
+            }
+            for f in self.findings
+        ]
+
+        return {
+            "$schema": SARIF_SCHEMA,
+            "version": "2.1.0",
+            "runs": [{
+                "tool": {"driver": {"name": "validate-recipes", "rules": rules_meta}},
+                "results": results,
+                "properties": {"ruleTimings": self.rule_summary()}
+            }]
+        }
+
+    def write_report(self, path, fmt, source):
+        """Write a JSON or SARIF report to path."""
+        report = self.to_sarif(source) if fmt == 'sarif' else self.to_json(source)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nReport written to: {path}")
+
+
+def recipe_keys(recipes):
+    """
+    Key each recipe by ID for diffing. Repeated IDs get an occurrence
+    suffix so duplicates are still tracked individually.
+    """
+    counts = defaultdict(int)
+    keyed = {}
+    for recipe in recipes:
+        recipe_id = str(recipe.get('id', 'UNKNOWN'))
+        n = counts[recipe_id]
+        counts[recipe_id] += 1
+        keyed[recipe_id if n == 0 else f"{recipe_id}#{n + 1}"] = recipe
+    return keyed
+
+
+class WatchSession:
+    """
+    In-memory recipe model for --watch mode.
+
+    Keeps the last good parse keyed by recipe ID along with each recipe's
+    findings. On every change only added or modified recipes go through the
+    per-recipe rules; corpus rules (duplicate IDs, variant links) are cheap
+    and re-run over the whole set.
+    """
+
+    def __init__(self, recipes_file, rules, strict=False, data_dir=DATA_DIR):
+        self.recipes_file = Path(recipes_file)
+        self.rules = rules
+        self.recipe_rules = [r for r in rules if r.scope == 'recipe']
+        self.corpus_rules = [r for r in rules if r.scope == 'corpus']
+        self.strict = strict
+        self.data_dir = Path(data_dir)
+        self.image_index = None
+        self.recipes = {}
+        self.findings = {}
+        self.corpus_findings = []
+        self.signature = None
+
+    def _file_signature(self):
+        try:
+            st = self.recipes_file.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _validator(self, rules):
+        if self.image_index is None or self.image_index.is_stale():
+            self.image_index = ImageIndex(self.data_dir)
+            # Image set changed: cached image-refs results may be wrong
+            stale = True
+        else:
+            stale = False
+        return RecipeValidator(self.strict, self.data_dir, rules, self.image_index), stale
+
+    def reload(self):
+        """
+        Re-parse the recipes file and revalidate what changed.
+
+        Returns a dict describing the change, or None if the file could not
+        be parsed (the previous model is kept).
+        """
+        start = time.perf_counter()
+        self.signature = self._file_signature()
+        try:
+            with open(self.recipes_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"ERROR: Cannot parse {self.recipes_file.name} - {e} (keeping last good version)")
+            return None
+        parse_time = time.perf_counter() - start
+
+        recipes = data.get('recipes', []) if isinstance(data, dict) else []
+        new_model = recipe_keys(recipes)
+
+        validator, images_changed = self._validator(self.recipe_rules)
+        added = [k for k in new_model if k not in self.recipes]
+        removed = [k for k in self.recipes if k not in new_model]
+        changed = [k for k in new_model
+                   if k in self.recipes and new_model[k] != self.recipes[k]]
+        to_check = list(new_model) if images_changed and self.recipes else added + changed
+
+        for key in removed:
+            self.findings.pop(key, None)
+        for key in to_check:
+            validator.findings = []
+            validator.validate_recipe(new_model[key])
+            self.findings[key] = validator.findings
+
+        corpus_validator, _ = self._validator(self.corpus_rules)
+        if 'recipes' not in data:
+            corpus_validator.error('GLOBAL', "Missing 'recipes' array in JSON")
+        for rule_obj in self.corpus_rules:
+            corpus_validator._run(rule_obj, recipes)
+        self.corpus_findings = corpus_validator.findings
+
+        self.recipes = new_model
+        return {
+            "added": added,
+            "removed": removed,
+            "changed": changed,
+            "checked": len(to_check),
+            "parse_seconds": parse_time,
+            "total_seconds": time.perf_counter() - start
+        }
+
+    def all_findings(self):
+        for findings in self.findings.values():
+            yield from findings
+        yield from self.corpus_findings
+
+    def print_update(self, delta, first=False):
+        """Print findings for the recipes touched by this change, then totals."""
+        stamp = datetime.now().strftime('%H:%M:%S')
+        if first:
+            print(f"[{stamp}] Loaded {len(self.recipes)} recipes")
+        else:
+            print(f"[{stamp}] {len(delta['added'])} added, {len(delta['changed'])} changed, "
+                  f"{len(delta['removed'])} removed")
+            for key in delta['added'] + delta['changed']:
+                findings = self.findings.get(key, [])
+                if not findings:
+                    print(f"  OK       [{key}]")
+                for f in findings:
+                    print(f"  {f['severity'].upper():<8} [{f['recipe_id']}] ({f['rule']}) {f['message']}")
+            for key in delta['removed']:
+                print(f"  REMOVED  [{key}]")
+            for f in self.corpus_findings:
+                print(f"  {f['severity'].upper():<8} [{f['recipe_id']}] ({f['rule']}) {f['message']}")
+
+        errors = sum(1 for f in self.all_findings() if f['severity'] == SEVERITY_ERROR)
+        warnings = sum(1 for f in self.all_findings() if f['severity'] != SEVERITY_ERROR)
+        print(f"  -> {errors} error(s), {warnings} warning(s) total; "
+              f"checked {delta['checked']} recipe(s) in {delta['total_seconds'] * 1000:.0f} ms "
+              f"(parse {delta['parse_seconds'] * 1000:.0f} ms)")
+
+    def run(self, interval=0.25):
+        """Poll the recipes file and revalidate on every save until interrupted."""
+        print(f"Watching: {self.recipes_file} (Ctrl+C to stop)")
+        delta = self.reload()
+        if delta:
+            self.print_update(delta, first=True)
+
+        try:
+            while True:
+                time.sleep(interval)
+                signature = self._file_signature()
+                if signature is None or signature == self.signature:
+                    continue
+                delta = self.reload()
+                if delta:
+                    self.print_update(delta)
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
+
+
+def benchmark_rules(recipes, rules, iterations=10):
+    """
+    Time each per-recipe rule over the same recipes (best of N runs) and
+    print its cost per recipe and its share of the total, so the price of
+    the 'schema' rule can be read against the other default checks.
+    """
+    per_recipe = [r for r in rules if r.scope == 'recipe']
+    image_index = ImageIndex(DATA_DIR)  # Snapshot outside the timed loop
+    get_schema_validator()              # Compile outside the timed loop
+
+    results = {}
+    for rule_obj in per_recipe:
+        best = None
+        findings = 0
+        for _ in range(iterations):
+            validator = RecipeValidator(rules=[rule_obj], image_index=image_index)
+            start = time.perf_counter()
+            for recipe in recipes:
+                validator.validate_recipe(recipe)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+            findings = len(validator.findings)
+        results[rule_obj.id] = (best, findings)
+
+    total = sum(best for best, _ in results.values())
+    print("\n" + "="*60)
+    print("RULE BENCHMARK")
+    print("="*60)
+    print(f"Recipes: {len(recipes)}, best of {iterations} runs")
+    for rule_id, (best, findings) in results.items():
+        us = best / len(recipes) * 1e6 if recipes else 0
+        share = 100 * best / total if total else 0
+        print(f"  {rule_id:<18} {us:6.1f} us/recipe  {share:5.1f}%  ({findings} findings)")
+    if recipes:
+        print(f"  {'total':<18} {total / len(recipes) * 1e6:6.1f} us/recipe")
+    print("="*60)
+    return results
+
+
+def split_ids(value):
+    """Parse a comma-separated list of rule IDs."""
+    return [part.strip() for part in value.split(',') if part.strip()] if value else []
+
 
 def main():
-    strict = '--strict' in sys.argv
+    parser = argparse.ArgumentParser(
+        description="Validate recipes.json for schema compliance and common issues"
+    )
+    parser.add_argument(
+        '--strict',
+        action='store_true',
+        help="Fail on warnings too"
+    )
+    parser.add_argument(
+        '--input', '-i',
+        type=Path,
+        default=Path(__file__).parent.parent / 'data' / 'recipes.json',
+        help="Recipes JSON file (default: data/recipes.json)"
+    )
+    parser.add_argument(
+        '--watch', '-w',
+        action='store_true',
+        help="Keep running and revalidate changed recipes on every save"
+    )
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=0.25,
+        help="Polling interval in seconds for --watch (default: 0.25)"
+    )
+    parser.add_argument(
+        '--rules',
+        help="Comma-separated rule IDs to run (default: every rule enabled by default; see --list-rules)"
+    )
+    parser.add_argument(
+        '--skip-rules',
+        help="Comma-separated rule IDs to skip"
+    )
+    parser.add_argument(
+        '--list-rules',
+        action='store_true',
+        help="List available rules and exit"
+    )
+    parser.add_argument(
+        '--timings',
+        action='store_true',
+        help="Print per-rule timings"
+    )
+    parser.add_argument(
+        '--report',
+        help="Write a machine-readable report to this path"
+    )
+    parser.add_argument(
+        '--benchmark',
+        type=int,
+        metavar='N',
+        help="Time each selected per-recipe rule (best of N runs) and exit"
+    )
+    parser.add_argument(
+        '--format',
+        choices=['json', 'sarif'],
+        help="Report format (default: inferred from --report extension, else json)"
+    )
+
+    args = parser.parse_args()
+
+    if args.list_rules:
+        for r in RULES.values():
+            state = 'on' if r.default else 'off'
+            print(f"{r.id:<20} {r.severity:<8} {r.scope:<7} {state:<4} {r.description}")
+        return
 
-    # Find recipes file
-    script_dir = Path(__file__).parent
-    recipes_file = script_dir.parent / 'data' / 'recipes.json'
+    try:
+        rules = select_rules(split_ids(args.rules), split_ids(args.skip_rules))
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(2)
+
+    recipes_file = args.input
 
     if not recipes_file.exists():
         print(f"ERROR: Cannot find {recipes_file}")
         sys.exit(1)
 
+    if args.benchmark:
+        try:
+            with open(recipes_file, 'r', encoding='utf-8') as f:
+                recipes = json.load(f).get('recipes', [])
+        except json.JSONDecodeError as e:
+            print(f"ERROR: Invalid JSON - {e}")
+            sys.exit(1)
+        benchmark_rules(recipes, rules, args.benchmark)
+        return
+
+    if args.watch:
+        WatchSession(recipes_file, rules, strict=args.strict).run(args.interval)
+        return
+
     # Load and validate
     print(f"Validating: {recipes_file}")
 
@@ -287,9 +822,13 @@ def main():
         print(f"ERROR: Invalid JSON - {e}")
         sys.exit(1)
 
-    validator = RecipeValidator(strict=strict)
+    validator = RecipeValidator(strict=args.strict, rules=rules)
     validator.validate_all(data)
-    exit_code = validator.report()
+    exit_code = validator.report(show_timings=args.timings)
+
+    if args.report:
+        fmt = args.format or ('sarif' if args.report.endswith('.sarif') else 'json')
+        validator.write_report(args.report, fmt, recipes_file)
 
     print(f"\nTotal recipes: {len(data.get('recipes', []))}")
     sys.exit(exit_code)
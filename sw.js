@@ -0,0 +1,200 @@
+/**
+ * Other Family Recipes - Service Worker
+ * Keeps the archive usable offline (kitchens with bad Wi-Fi)
+ *
+ * precache.json (written by scripts/build_assets.py) lists the files to
+ * keep, in tiers: the app shell is stored when the worker installs; the
+ * recipe data and grid thumbnails when a page asks for them (script.js
+ * does, unless the reader has data saving on). Full scans are cached only
+ * once they have been viewed. Every entry carries a content hash, so an
+ * update downloads only the entries whose hash changed.
+ */
+
+const PRECACHE = 'family-recipes-precache';
+const SCANS = 'family-recipes-scans';
+const PRECACHE_MANIFEST = 'precache.json';
+const STATE_KEY = 'precache-state.json';  // {build, hashes: {url: hash}} of what is cached
+const SHELL_TIER = 'shell';
+const MAX_SCANS = 200;                    // Viewed scans kept offline
+// A content hash in a file or directory name (see HASHED_NAME in build_assets.py)
+const HASHED_NAME = /\.[0-9a-f]{8,}(?=[._\-/]|$)/;
+
+let precacheRun = null;  // Pending background precache, so it runs once at a time
+
+// =============================================================================
+// Precache
+// =============================================================================
+
+async function loadPrecacheManifest() {
+  try {
+    const response = await fetch(PRECACHE_MANIFEST, { cache: 'no-cache' });
+    return response.ok ? await response.json() : null;
+  } catch (error) {
+    return null;  // Not built (plain checkout) or offline
+  }
+}
+
+async function loadState(cache) {
+  const response = await cache.match(STATE_KEY);
+  const state = response ? await response.json() : null;
+  return state && state.hashes ? state : { build: null, hashes: {} };
+}
+
+function saveState(cache, state) {
+  return cache.put(STATE_KEY, new Response(JSON.stringify(state),
+    { headers: { 'Content-Type': 'application/json' } }));
+}
+
+function tierEntries(manifest, tierNames) {
+  return manifest.tiers
+    .filter(tier => tierNames.includes(tier.name))
+    .flatMap(tier => tier.entries);
+}
+
+/**
+ * The entries of the given tiers that are not cached at their current hash.
+ * When the cache holds exactly the previous build, the build's own diff
+ * names them and no hashes are compared; otherwise they are compared one
+ * by one.
+ */
+function staleEntries(manifest, state, tierNames) {
+  if (manifest.diff && state.build && state.build === manifest.diff.from) {
+    const changed = new Set([...manifest.diff.added, ...manifest.diff.changed]);
+    return tierEntries(manifest, tierNames).filter(([url]) => changed.has(url));
+  }
+  return tierEntries(manifest, tierNames).filter(([url, hash]) => state.hashes[url] !== hash);
+}
+
+/**
+ * Bring the given tiers up to date: fetch stale entries, then drop cached
+ * URLs that are no longer in the manifest. Returns false if a fetch failed.
+ */
+async function precacheTiers(manifest, tierNames) {
+  const cache = await caches.open(PRECACHE);
+  const state = await loadState(cache);
+  let complete = true;
+
+  for (const [url, hash] of staleEntries(manifest, state, tierNames)) {
+    try {
+      const response = await fetch(url, { cache: 'no-cache' });
+      if (!response.ok) throw new Error(`${response.status} ${url}`);
+      await cache.put(url, response);
+      state.hashes[url] = hash;
+    } catch (error) {
+      complete = false;
+    }
+  }
+
+  const listed = new Set(manifest.tiers.flatMap(tier => tier.entries.map(([url]) => url)));
+  for (const url of Object.keys(state.hashes)) {
+    if (!listed.has(url)) {
+      await cache.delete(url);
+      delete state.hashes[url];
+    }
+  }
+
+  // state.build still names the old build here, so compare the hashes
+  const allTiers = manifest.tiers.map(tier => tier.name);
+  const everything = complete &&
+    tierEntries(manifest, allTiers).every(([url, hash]) => state.hashes[url] === hash);
+  state.build = everything ? manifest.build : null;
+  await saveState(cache, state);
+  return complete;
+}
+
+// =============================================================================
+// Lifecycle
+// =============================================================================
+
+self.addEventListener('install', (event) => {
+  event.waitUntil((async () => {
+    const manifest = await loadPrecacheManifest();
+    if (manifest) await precacheTiers(manifest, [SHELL_TIER]);
+    await self.skipWaiting();
+  })());
+});
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil(self.clients.claim());
+});
+
+// A page asks for the remaining tiers once it has loaded
+self.addEventListener('message', (event) => {
+  if (event.data?.type !== 'precache') return;
+  if (!precacheRun) {
+    precacheRun = loadPrecacheManifest()
+      .then(manifest => manifest && precacheTiers(
+        manifest, manifest.tiers.map(tier => tier.name)))
+      .finally(() => { precacheRun = null; });
+  }
+  event.waitUntil(precacheRun);
+});
+
+// =============================================================================
+// Requests
+// =============================================================================
+
+// Sprite sheets and deep-zoom tiles are generated images, not scans
+function isScan(path) {
+  return /\/data\/.*\.(jpe?g|png|webp)$/i.test(path) &&
+    !path.includes('/data/images/sprites/') && !path.includes('/data/images/tiles/');
+}
+
+async function trimScans(cache) {
+  const keys = await cache.keys();
+  for (const request of keys.slice(0, Math.max(0, keys.length - MAX_SCANS))) {
+    await cache.delete(request);
+  }
+}
+
+// Full scans: from the cache once viewed, fetched (and kept) otherwise
+async function scanResponse(request) {
+  const cache = await caches.open(SCANS);
+  const cached = await cache.match(request);
+  if (cached) return cached;
+  const response = await fetch(request);
+  if (response.ok) {
+    await cache.put(request, response.clone());
+    await trimScans(cache);
+  }
+  return response;
+}
+
+// Content-hashed files never change: any cached copy is current
+async function cacheFirst(request) {
+  const cached = await caches.match(request);
+  return cached || fetch(request);
+}
+
+// Pages and unhashed data: the network when reachable, the cache offline
+async function networkFirst(request) {
+  try {
+    return await fetch(request);
+  } catch (error) {
+    const cached = await caches.match(request, { ignoreSearch: true });
+    if (cached) return cached;
+    if (request.mode !== 'navigate') throw error;
+
+    // A recipe page that was never cached: the client-side renderer can show it
+    const page = new URL(request.url).pathname.match(/\/recipes\/([^/]+)\.html$/);
+    if (page) return Response.redirect(new URL(`../recipe.html#${page[1]}`, request.url).href, 302);
+    const home = await caches.match(new URL('index.html', self.registration.scope).href);
+    if (home) return home;
+    throw error;
+  }
+}
+
+self.addEventListener('fetch', (event) => {
+  const request = event.request;
+  const url = new URL(request.url);
+  if (request.method !== 'GET' || url.origin !== self.location.origin) return;
+
+  if (isScan(url.pathname)) {
+    event.respondWith((async () => {
+      const precached = await caches.match(request, { cacheName: PRECACHE });
+      return precached || scanResponse(request);
+    })());
+    return;
+  }
+  event.respondWith(HASHED_NAME.test(url.pathname) ? cacheFirst(request) : networkFirst(request));
+});
@@ -0,0 +1,126 @@
+"""
+Regression tests for scripts/minify.py and the critical-CSS step of
+scripts/build_assets.py.
+
+minify_js rewrites script.js and every inline <script> on each deploy,
+so a tokenizer mistake breaks the whole site. The cases below pin the
+constructs it must keep intact; the real scripts are minified and parsed
+with `node --check` when Node is installed.
+
+Usage:
+    python -m pytest tests
+    python -m unittest discover tests
+"""
+
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from build_assets import PAGES, inline_critical_css  # noqa: E402
+from minify import critical_css, minify_css, minify_html, minify_js  # noqa: E402
+
+NODE = shutil.which("node")
+
+
+def node_check(source: str, suffix: str = ".js") -> str:
+    """Syntax errors node reports for source ('' if it parses)."""
+    with tempfile.NamedTemporaryFile("w", suffix=suffix, delete=False, encoding="utf-8") as f:
+        f.write(source)
+    try:
+        result = subprocess.run([NODE, "--check", f.name], capture_output=True, text=True)
+    finally:
+        Path(f.name).unlink()
+    return result.stderr if result.returncode else ""
+
+
+class MinifyJsTest(unittest.TestCase):
+
+    def test_asi_line_breaks_are_kept(self):
+        self.assertEqual(minify_js("a\n++b"), "a\n++b")
+        self.assertEqual(minify_js("x = y\n(z)"), "x=y\n(z)")
+        self.assertEqual(minify_js("let q = x\n/re/g.exec(s)"), "let q=x\n/re/g.exec(s)")
+
+    def test_regex_after_return_and_paren(self):
+        self.assertEqual(minify_js("function f(s) {\n  return /a\\/b[/]c/g.test(s);\n}"),
+                         "function f(s){return/a\\/b[/]c/g.test(s);}")
+        self.assertEqual(minify_js("s = s.replace(/ +/g, ' ');"), "s=s.replace(/ +/g,' ');")
+
+    def test_slash_inside_regex_class(self):
+        self.assertEqual(minify_js("if (/[/]+/.test(p)) {}"), "if(/[/]+/.test(p)){}")
+        self.assertEqual(minify_js("p.split(/[/\\\\]/) // path parts"), "p.split(/[/\\\\]/)")
+
+    def test_division_is_not_a_regex(self):
+        self.assertEqual(minify_js("z = b / c / d;"), "z=b/c/d;")
+        self.assertEqual(minify_js("z = (a) / 2 / (b);"), "z=(a)/2/(b);")
+
+    def test_nested_templates(self):
+        self.assertEqual(minify_js("const t = `a ${ `b ${c} d` } e ${ {k: 1}.k }`;"),
+                         "const t=`a ${`b ${c} d`} e ${{k:1}.k}`;")
+        self.assertEqual(minify_js("`  keep   ${x}  spaces  `"), "`  keep   ${x}  spaces  `")
+
+    def test_unary_operators_stay_apart(self):
+        self.assertEqual(minify_js("y = a - -b;"), "y=a- -b;")
+        self.assertEqual(minify_js("y = a + +b;"), "y=a+ +b;")
+        self.assertEqual(minify_js("y = a - --b;"), "y=a- --b;")
+
+    def test_comments_and_strings(self):
+        self.assertEqual(minify_js("u = 'http://x'; // c\nv = \"/* no */\";"), "u='http://x';v=\"/* no */\";")
+
+
+@unittest.skipUnless(NODE, "node is not installed")
+class MinifiedSourcesParseTest(unittest.TestCase):
+
+    def test_scripts_parse(self):
+        for name in ("script.js", "sw.js"):
+            with self.subTest(name=name):
+                minified = minify_js((ROOT / name).read_text(encoding="utf-8"))
+                self.assertEqual(node_check(minified), "")
+
+    def test_inline_scripts_parse(self):
+        for name in PAGES:
+            html = minify_html((ROOT / name).read_text(encoding="utf-8"))
+            for n, body in enumerate(re.findall(r"<script>(.*?)</script>", html, re.S)):
+                with self.subTest(page=name, script=n):
+                    self.assertEqual(node_check(body), "")
+
+
+class CriticalCssTest(unittest.TestCase):
+
+    CSS = minify_css("""
+        body { margin: 0 }
+        .card, .unused { color: red }
+        #grid > .card:hover { color: blue }
+        .absent { color: green }
+        @media (max-width: 600px) { .card { padding: 0 } .absent { padding: 1px } }
+        @font-face { font-family: X; src: url(x.woff2) }
+    """)
+    HTML = '<body><div id="grid"><div class="card">x</div></div></body>'
+
+    def test_keeps_matching_rules_only(self):
+        self.assertEqual(critical_css(self.CSS, self.HTML),
+                         "body{margin:0}.card{color:red}#grid > .card:hover{color:blue}"
+                         "@media (max-width:600px){.card{padding:0}}")
+
+    def test_inlined_before_the_linked_stylesheet(self):
+        page = ('<head><link rel="stylesheet" href="https://hub.example/styles.css">'
+                '<link rel="stylesheet" href="assets/styles.0123456789.css"></head>' + self.HTML)
+        html, size = inline_critical_css(page, self.CSS, "assets/styles.0123456789.css")
+        self.assertGreater(size, 0)
+        self.assertIn('<link rel="stylesheet" href="https://hub.example/styles.css"><style>', html)
+        self.assertIn('<link rel="preload" as="style"', html)
+        self.assertIn('<noscript><link rel="stylesheet" href="assets/styles.0123456789.css"></noscript>', html)
+
+    def test_page_without_the_stylesheet_is_unchanged(self):
+        page = '<head><link rel="stylesheet" href="https://hub.example/styles.css"></head>' + self.HTML
+        self.assertEqual(inline_critical_css(page, self.CSS, "assets/styles.0123456789.css"), (page, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()